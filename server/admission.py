@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Fit Fusion AI Coach - Admission control
+Per-client and global token buckets, plus a concurrency limit with a bounded, deadline-aware
+wait queue, in front of the chat endpoints. Requests that can't be served in time get a fast
+429 with Retry-After instead of tying up a worker for the length of an upstream call.
+Limits apply per server process. Off unless ADMISSION_ENABLED=true.
+
+Clients are told apart by address. Behind a reverse proxy, list it in ADMISSION_TRUSTED_PROXIES
+so the client address is taken from its X-Forwarded-For; the header is ignored from anyone else.
+"""
+
+import ipaddress
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from flask import g, jsonify, request
+
+ADMISSION_ENABLED = os.getenv('ADMISSION_ENABLED', 'false').lower() == 'true'
+# Generous per address: one address can be a whole carrier NAT
+ADMISSION_CLIENT_RATE = float(os.getenv('ADMISSION_CLIENT_RATE', 2))
+ADMISSION_CLIENT_BURST = float(os.getenv('ADMISSION_CLIENT_BURST', 30))
+ADMISSION_GLOBAL_RATE = float(os.getenv('ADMISSION_GLOBAL_RATE', 50))
+ADMISSION_GLOBAL_BURST = float(os.getenv('ADMISSION_GLOBAL_BURST', 100))
+ADMISSION_MAX_CONCURRENT = int(os.getenv('ADMISSION_MAX_CONCURRENT', 64))
+ADMISSION_QUEUE_SIZE = int(os.getenv('ADMISSION_QUEUE_SIZE', 64))
+ADMISSION_QUEUE_TIMEOUT = float(os.getenv('ADMISSION_QUEUE_TIMEOUT', 10))
+ADMISSION_MAX_CLIENTS = int(os.getenv('ADMISSION_MAX_CLIENTS', 10000))
+# Reverse proxies whose X-Forwarded-For is believed: addresses or CIDR ranges, comma separated
+ADMISSION_TRUSTED_PROXIES = os.getenv('ADMISSION_TRUSTED_PROXIES', '')
+
+# Endpoints that start upstream calls
+GUARDED_ENDPOINTS = {'chat', 'chat_stream', 'chat_image', 'submit_job'}
+
+
+class Rejected(Exception):
+    """Request not admitted; `retry_after` is the suggested wait in seconds"""
+
+    def __init__(self, reason, retry_after):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+def parse_networks(spec):
+    """'10.0.0.0/8, 127.0.0.1' -> tuple of ip_network"""
+    return tuple(ipaddress.ip_network(part.strip(), strict=False) for part in spec.split(',') if part.strip())
+
+
+def _in_networks(address, networks):
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in networks)
+
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens per second, holding at most `burst`"""
+
+    __slots__ = ('rate', 'burst', 'tokens', 'updated')
+
+    def __init__(self, rate, burst, now=None):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic() if now is None else now
+
+    def take(self, now):
+        """0.0 if a token was taken, otherwise seconds until one is available"""
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate if self.rate > 0 else math.inf
+
+    def refund(self):
+        self.tokens = min(self.burst, self.tokens + 1)
+
+
+class AdmissionController:
+    """Rate limits then a concurrency limit; acquire() returns once a slot is held"""
+
+    def __init__(self, client_rate=ADMISSION_CLIENT_RATE, client_burst=ADMISSION_CLIENT_BURST,
+                 global_rate=ADMISSION_GLOBAL_RATE, global_burst=ADMISSION_GLOBAL_BURST,
+                 max_concurrent=ADMISSION_MAX_CONCURRENT, queue_size=ADMISSION_QUEUE_SIZE,
+                 queue_timeout=ADMISSION_QUEUE_TIMEOUT, max_clients=ADMISSION_MAX_CLIENTS,
+                 trusted_proxies=ADMISSION_TRUSTED_PROXIES, enabled=ADMISSION_ENABLED):
+        self.client_rate = client_rate
+        self.client_burst = client_burst
+        self.global_bucket = TokenBucket(global_rate, global_burst)
+        self.max_concurrent = max_concurrent
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.max_clients = max_clients
+        self.trusted_proxies = parse_networks(trusted_proxies)
+        self.enabled = enabled
+
+        self._clients = OrderedDict()
+        self._lock = threading.Lock()
+        self._slot_freed = threading.Condition(self._lock)
+        self._active = 0
+        self._queued = 0
+        # EWMA of how long an admitted request holds its slot, for queue wait estimates
+        self._service_time = None
+
+        self.admitted = 0
+        self.rejected = {}
+        self.queue_waits = 0
+        self.queue_wait_total = 0.0
+
+    def _reject(self, reason, retry_after):
+        self.rejected[reason] = self.rejected.get(reason, 0) + 1
+        return Rejected(reason, retry_after)
+
+    def _client_bucket(self, client_id, now):
+        bucket = self._clients.get(client_id)
+        if bucket is None:
+            bucket = self._clients[client_id] = TokenBucket(self.client_rate, self.client_burst, now)
+            while len(self._clients) > self.max_clients:
+                self._clients.popitem(last=False)
+        else:
+            self._clients.move_to_end(client_id)
+        return bucket
+
+    def estimated_wait(self):
+        """Expected queueing delay for a request joining the back of the queue now"""
+        if self._service_time is None:
+            return 0.0
+        return (self._queued + 1) * self._service_time / self.max_concurrent
+
+    def acquire(self, client_id, timeout=None):
+        """
+        Hold a slot for one request, waiting in the queue up to `timeout` seconds
+        (default ADMISSION_QUEUE_TIMEOUT). Raises Rejected when the request should be shed.
+        """
+        # The timeout comes from a client header: NaN would disable shedding and spin in wait_for
+        if timeout is None or not math.isfinite(timeout) or timeout < 0:
+            timeout = self.queue_timeout
+        timeout = min(timeout, self.queue_timeout)
+        with self._lock:
+            now = time.monotonic()
+            client_bucket = self._client_bucket(client_id, now)
+            wait = client_bucket.take(now)
+            if wait:
+                raise self._reject('client', wait)
+            wait = self.global_bucket.take(now)
+            if wait:
+                client_bucket.refund()
+                raise self._reject('global', wait)
+
+            if self._active < self.max_concurrent and not self._queued:
+                self._active += 1
+                self.admitted += 1
+                return time.monotonic()
+
+            # Shed now rather than let the request time out in the queue
+            expected = self.estimated_wait()
+            if self._queued >= self.queue_size or expected > timeout:
+                client_bucket.refund()
+                self.global_bucket.refund()
+                raise self._reject('queue_full' if self._queued >= self.queue_size else 'deadline',
+                                   max(expected, 1.0))
+
+            self._queued += 1
+            started = time.monotonic()
+            try:
+                admitted = self._slot_freed.wait_for(lambda: self._active < self.max_concurrent, timeout)
+            finally:
+                self._queued -= 1
+            waited = time.monotonic() - started
+            self.queue_waits += 1
+            self.queue_wait_total += waited
+            if not admitted:
+                client_bucket.refund()
+                self.global_bucket.refund()
+                raise self._reject('deadline', max(self.estimated_wait(), 1.0))
+            self._active += 1
+            self.admitted += 1
+            return time.monotonic()
+
+    def release(self, acquired_at):
+        held = time.monotonic() - acquired_at
+        with self._lock:
+            self._active -= 1
+            if self._service_time is None:
+                self._service_time = held
+            else:
+                self._service_time += 0.1 * (held - self._service_time)
+            self._slot_freed.notify()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'active': self._active,
+                'queued': self._queued,
+                'maxConcurrent': self.max_concurrent,
+                'admitted': self.admitted,
+                'rejected': dict(self.rejected),
+                'avgQueueWaitMs': round(self.queue_wait_total / self.queue_waits * 1000, 1)
+                if self.queue_waits else 0.0,
+                'serviceTimeMs': round(self._service_time * 1000, 1) if self._service_time is not None else None,
+                'trackedClients': len(self._clients)
+            }
+
+
+def client_id(trusted_proxies=()):
+    """
+    Caller address. X-Forwarded-For only counts on requests from a trusted proxy, and is read
+    from the right: the nearest hop that isn't a trusted proxy is the client. Anything a client
+    writes into the header itself sits further left, so it can't pick its own bucket.
+    """
+    address = request.remote_addr or 'unknown'
+    if not _in_networks(address, trusted_proxies):
+        return address
+    for hop in reversed(request.headers.get('X-Forwarded-For', '').split(',')):
+        hop = hop.strip()
+        if hop:
+            address = hop
+            if not _in_networks(hop, trusted_proxies):
+                break
+    return address
+
+
+def install(app, controller, endpoints=GUARDED_ENDPOINTS):
+    """Run admission control before the given endpoints of a Flask app"""
+    if not controller.enabled:
+        return
+
+    @app.before_request
+    def admit():
+        if request.endpoint not in endpoints:
+            return None
+        # Clients may ask for a shorter queue wait than the server default
+        timeout = request.headers.get('X-Request-Timeout', type=float)
+        try:
+            g.admission_slot = controller.acquire(client_id(controller.trusted_proxies), timeout)
+        except Rejected as e:
+            retry_after = max(1, math.ceil(e.retry_after))
+            response = jsonify({
+                'success': False,
+                'error': 'Too many requests, please retry shortly',
+                'reason': e.reason,
+                'retryAfter': retry_after
+            })
+            response.status_code = 429
+            response.headers['Retry-After'] = str(retry_after)
+            return response
+        return None
+
+    @app.teardown_request
+    def release(exc):
+        acquired_at = g.pop('admission_slot', None)
+        if acquired_at is not None:
+            controller.release(acquired_at)
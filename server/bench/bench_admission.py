@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Admission control load test
+Open-loop load (requests arrive at a fixed rate whether or not earlier ones finished) against the
+OpenAI server backed by bench/fake_openai.py, with the upstream limited to a fixed number of
+concurrent calls. Runs each offered rate with admission control off and on and reports goodput:
+successful responses per second that finished within the latency SLO.
+
+Usage:
+    python bench/bench_admission.py --rates 25 50 100 200 --duration 10 --capacity 16
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import time
+
+import aiohttp
+
+from load_test import BENCH_DIR, SERVER_DIR, percentile, wait_until_up
+
+
+async def offer(url, rate, duration, slo):
+    """Send `rate` requests/sec for `duration` seconds; returns (status counts, admitted latencies, goodput)"""
+    statuses = {}
+    latencies = []
+
+    async def one(session, n):
+        body = {'message': f"give me a quick workout (#{n})"}
+        # Many users, forwarded as if by a trusted proxy
+        headers = {'X-Forwarded-For': f"10.1.{random.randrange(256)}.{random.randrange(256)}"}
+        start = time.perf_counter()
+        try:
+            async with session.post(f"{url}/api/chatbot/message", json=body, headers=headers) as response:
+                await response.read()
+                status = response.status
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            status = type(e).__name__
+        statuses[status] = statuses.get(status, 0) + 1
+        if status == 200:
+            latencies.append(time.perf_counter() - start)
+
+    connector = aiohttp.TCPConnector(limit=0)
+    timeout = aiohttp.ClientTimeout(total=60)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        started = time.perf_counter()
+        tasks = []
+        for n in range(int(rate * duration)):
+            delay = started + n / rate - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(one(session, n)))
+        await asyncio.gather(*tasks)
+
+    good = sum(1 for latency in latencies if latency <= slo)
+    return statuses, latencies, good / duration
+
+
+def start_stack(args, admission):
+    env = dict(os.environ)
+    env.update({
+        'OPENAI_API_KEY': 'load-test',
+        'OPENAI_API_URL': f"http://127.0.0.1:{args.fake_port}/v1/chat/completions",
+        'COACH_CACHE_ENABLED': 'false',
+        # The upstream (provider concurrency limit) is the bottleneck in both runs
+        'UPSTREAM_MAX_IN_FLIGHT': str(args.capacity),
+        'ADMISSION_ENABLED': 'true' if admission else 'false',
+        'ADMISSION_TRUSTED_PROXIES': '127.0.0.1',
+        'ADMISSION_MAX_CONCURRENT': str(args.capacity),
+        'ADMISSION_QUEUE_SIZE': str(args.capacity),
+        'ADMISSION_QUEUE_TIMEOUT': str(args.slo / 2),
+        'ADMISSION_GLOBAL_RATE': '10000',
+        'ADMISSION_GLOBAL_BURST': '10000',
+    })
+    fake = subprocess.Popen(
+        [sys.executable, os.path.join(BENCH_DIR, 'fake_openai.py'), '--port', str(args.fake_port),
+         '--first-byte-delay', str(args.upstream_latency), '--token-delay', '0'],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    server = subprocess.Popen(
+        [sys.executable, os.path.join(SERVER_DIR, 'serve.py'), '--backend', 'openai', '--host', '127.0.0.1',
+         '--port', str(args.port), '--workers', '1', '--threads', str(args.threads)],
+        cwd=SERVER_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    return [fake, server]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Admission control load test')
+    parser.add_argument('--rates', type=float, nargs='+', default=[25, 50, 100, 200])
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--capacity', type=int, default=16, help='concurrent upstream calls')
+    parser.add_argument('--upstream-latency', type=float, default=0.3)
+    parser.add_argument('--slo', type=float, default=2.0, help='seconds a response may take to count as good')
+    parser.add_argument('--threads', type=int, default=128)
+    parser.add_argument('--port', type=int, default=5803)
+    parser.add_argument('--fake-port', type=int, default=5902)
+    args = parser.parse_args()
+
+    capacity_rps = args.capacity / args.upstream_latency
+    print("=" * 86)
+    print(f"Upstream capacity ≈ {capacity_rps:.0f} req/s ({args.capacity} concurrent × {args.upstream_latency}s), "
+          f"SLO {args.slo}s")
+    print("=" * 86)
+    print(f"{'admission':<11}{'offered':>9}{'goodput':>9}{'p50 ms':>9}{'p99 ms':>9}  statuses")
+    for admission in (False, True):
+        processes = start_stack(args, admission)
+        try:
+            url = f"http://127.0.0.1:{args.port}"
+            asyncio.run(wait_until_up(url))
+            for rate in args.rates:
+                statuses, latencies, goodput = asyncio.run(offer(url, rate, args.duration, args.slo))
+                p50 = percentile(latencies, 50) * 1000 if latencies else 0.0
+                p99 = percentile(latencies, 99) * 1000 if latencies else 0.0
+                print(f"{'on' if admission else 'off':<11}{rate:>9.0f}{goodput:>9.1f}{p50:>9.0f}{p99:>9.0f}  "
+                      f"{dict(sorted(statuses.items(), key=str))}")
+        finally:
+            for process in processes:
+                process.terminate()
+            for process in processes:
+                process.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Gateway routing benchmark with fake providers
+Runs each routing strategy against a scenario (a slow primary, a failing primary, or an outage
+that recovers) and reports where requests went, failed requests and latency.
+
+Usage:
+    python bench/bench_gateway.py --requests 300
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_providers import FakeProvider, constant, lognormal  # noqa: E402
+import llm_gateway  # noqa: E402
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+SCENARIOS = {
+    # OpenAI answers but slowly, Gemini is quick
+    'slow-primary': lambda: [FakeProvider('openai', lognormal(0.12, 0.3)),
+                             FakeProvider('gemini', lognormal(0.03, 0.3))],
+    # OpenAI fails 40% of the time
+    'flaky-primary': lambda: [FakeProvider('openai', constant(0.02), error_rate=0.4),
+                              FakeProvider('gemini', constant(0.03))],
+    # OpenAI is completely down
+    'primary-outage': lambda: [FakeProvider('openai', constant(0.005), error_rate=1.0),
+                               FakeProvider('gemini', constant(0.03))],
+}
+
+
+def run(strategy, providers, requests, concurrency):
+    gateway = llm_gateway.Gateway(providers, strategy, slow_ms=60, failure_threshold=3, cooldown=0.5)
+    latencies = []
+    failed = 0
+
+    def one(_):
+        nonlocal failed
+        start = time.perf_counter()
+        try:
+            gateway.complete('create a workout plan', [])
+        except Exception:
+            failed += 1
+            return
+        latencies.append(time.perf_counter() - start)
+
+    with ThreadPoolExecutor(concurrency) as pool:
+        list(pool.map(one, range(requests)))
+    return gateway.stats(), latencies, failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Gateway routing benchmark')
+    parser.add_argument('--requests', type=int, default=300)
+    parser.add_argument('--concurrency', type=int, default=8)
+    args = parser.parse_args()
+
+    print(f"{'scenario':<16}{'strategy':<10}{'openai':>8}{'gemini':>8}{'failed':>8}"
+          f"{'failover':>10}{'p50 ms':>9}{'p99 ms':>9}")
+    for scenario, build in SCENARIOS.items():
+        for strategy in llm_gateway.STRATEGIES:
+            stats, latencies, failed = run(strategy, build(), args.requests, args.concurrency)
+            served = stats['providers']
+            print(f"{scenario:<16}{strategy:<10}{served['openai']['served']:>8}{served['gemini']['served']:>8}"
+                  f"{failed:>8}{stats['failovers']:>10}"
+                  f"{percentile(latencies, 50) * 1000:>9.1f}{percentile(latencies, 99) * 1000:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
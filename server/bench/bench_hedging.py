@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Hedged request benchmark with fake providers
+Both providers have the same lognormal latency plus a fraction of straggler calls; the run is
+repeated without and with hedging to show the effect on tail latency and the extra upstream load.
+
+Usage:
+    python bench/bench_hedging.py --requests 2000 --median-ms 40 --tail-probability 0.05
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_providers import FakeProvider, stragglers  # noqa: E402
+import llm_gateway  # noqa: E402
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run(args, hedger):
+    latency = stragglers(args.median_ms / 1000, args.sigma, args.tail_probability, args.tail_factor)
+    providers = [FakeProvider('openai', latency), FakeProvider('gemini', latency)]
+    # Health thresholds out of the way so only hedging changes between runs
+    gateway = llm_gateway.Gateway(providers, 'fallback', slow_ms=1e9, hedger=hedger)
+    latencies = []
+
+    def one(_):
+        start = time.perf_counter()
+        gateway.complete('create a workout plan', [])
+        latencies.append(time.perf_counter() - start)
+
+    with ThreadPoolExecutor(args.concurrency) as pool:
+        list(pool.map(one, range(args.requests)))
+    if hedger is not None:
+        # Let abandoned legs finish so their calls are counted
+        hedger.executor.shutdown(wait=True)
+    calls = sum(provider.calls for provider in providers)
+    return latencies, calls, gateway.stats()['hedging']
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Hedged request benchmark')
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--median-ms', type=float, default=40)
+    parser.add_argument('--sigma', type=float, default=0.3)
+    parser.add_argument('--tail-probability', type=float, default=0.05)
+    parser.add_argument('--tail-factor', type=float, default=10)
+    parser.add_argument('--percentile', type=float, default=llm_gateway.GATEWAY_HEDGE_PERCENTILE)
+    parser.add_argument('--budget', type=float, default=llm_gateway.GATEWAY_HEDGE_BUDGET)
+    args = parser.parse_args()
+
+    print("=" * 78)
+    print(f"{args.requests} requests, latency median {args.median_ms:.0f} ms (sigma {args.sigma}), "
+          f"{args.tail_probability:.0%} stragglers ×{args.tail_factor:g}")
+    print("=" * 78)
+    print(f"{'mode':<22}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'fired':>8}{'wins':>7}{'calls/req':>11}")
+
+    rows = [('no hedging', None),
+            (f"hedge p{args.percentile:g}", llm_gateway.Hedger(args.percentile, min_ms=1, default_ms=args.median_ms * 3,
+                                                              budget=args.budget, workers=args.concurrency * 2))]
+    baseline_p99 = None
+    for name, hedger in rows:
+        latencies, calls, hedging = run(args, hedger)
+        p99 = percentile(latencies, 99) * 1000
+        baseline_p99 = baseline_p99 or p99
+        fired = f"{hedging['fireRate']:.1%}" if hedging else '-'
+        wins = str(hedging['wins']) if hedging else '-'
+        print(f"{name:<22}{percentile(latencies, 50) * 1000:>9.1f}{percentile(latencies, 95) * 1000:>9.1f}"
+              f"{p99:>9.1f}{fired:>8}{wins:>7}{calls / args.requests:>11.2f}")
+    print(f"p99 improvement: {1 - p99 / baseline_p99:.0%}")
+
+
+if __name__ == '__main__':
+    main()
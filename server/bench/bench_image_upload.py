@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Image upload memory benchmark
+Peak Python-heap memory while ingesting one photo through
+  - /api/chatbot/message  (base64 data URL inside JSON)
+  - /api/chatbot/image    (multipart file / raw image body)
+up to the point the processed image is ready for the model. The upstream call is not made.
+
+Usage:
+    python bench/bench_image_upload.py --megapixels 12 --quality 95
+"""
+
+import argparse
+import base64
+import io
+import json
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import warnings  # noqa: E402
+warnings.simplefilter('ignore', FutureWarning)
+
+from PIL import Image  # noqa: E402
+
+import gemini_ai_server  # noqa: E402
+import image_pipeline  # noqa: E402
+
+
+def make_photo(megapixels, quality):
+    width = int((megapixels * 1e6 * 4 / 3) ** 0.5)
+    height = int(width * 3 / 4)
+    # Upscaled noise has photo-like detail, so it compresses to a realistic size
+    small = (width // 8, height // 8)
+    image = Image.frombytes('RGB', small, os.urandom(small[0] * small[1] * 3))
+    image = image.resize((width, height), Image.Resampling.BICUBIC)
+    out = io.BytesIO()
+    image.save(out, 'JPEG', quality=quality)
+    return out.getvalue()
+
+
+def measure(fn):
+    # No cache so every run does the full decode/resize
+    gemini_ai_server.images = image_pipeline.ImagePipeline(cache_bytes=0)
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Image upload memory benchmark')
+    parser.add_argument('--megapixels', type=float, default=12)
+    parser.add_argument('--quality', type=int, default=95)
+    args = parser.parse_args()
+
+    photo = make_photo(args.megapixels, args.quality)
+    data_url = 'data:image/jpeg;base64,' + base64.b64encode(photo).decode('ascii')
+    json_body = json.dumps({'message': 'Is this meal healthy?', 'image': data_url}).encode('utf-8')
+    app = gemini_ai_server.app
+
+    def json_path():
+        with app.test_request_context('/api/chatbot/message', method='POST', data=json_body,
+                                      content_type='application/json'):
+            data = gemini_ai_server.request.get_json()
+            gemini_ai_server.images.process(image_pipeline.decode_data_url(data['image']))
+
+    def multipart_path():
+        with app.test_request_context('/api/chatbot/image', method='POST', data={
+            'message': 'Is this meal healthy?',
+            'image': (io.BytesIO(photo), 'meal.jpg', 'image/jpeg')
+        }):
+            gemini_ai_server.read_image_upload()
+
+    def raw_path():
+        with app.test_request_context('/api/chatbot/image?message=Is+this+meal+healthy', method='POST',
+                                      data=photo, content_type='image/jpeg'):
+            gemini_ai_server.read_image_upload()
+
+    print("=" * 60)
+    print(f"Photo: {args.megapixels} MP JPEG, {len(photo) / 1e6:.2f} MB "
+          f"(JSON body {len(json_body) / 1e6:.2f} MB)")
+    print("=" * 60)
+    for name, fn in [('JSON + base64', json_path), ('multipart', multipart_path), ('raw body', raw_path)]:
+        # The request body itself is built by the test harness before measuring starts
+        peak = measure(fn)
+        print(f"{name:<16} peak {peak / 1e6:8.2f} MB")
+
+
+if __name__ == '__main__':
+    main()
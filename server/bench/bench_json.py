@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+JSON serialization microbenchmark
+Per-request JSON work on the OpenAI chat path at growing history lengths, before and after
+fast_json / chat_history:
+  parse    - request.get_json() of the client body
+  history  - validating and shaping conversationHistory
+  upstream - encoding the chat completions payload (system prompt + history)
+  response - jsonify of the reply
+
+Usage:
+    python bench/bench_json.py --messages 10 100 500
+"""
+
+import argparse
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from flask import Flask, jsonify, request  # noqa: E402
+
+import fast_json  # noqa: E402
+import prompts  # noqa: E402
+from chat_history import clean_history  # noqa: E402
+
+USER_TURN = "I did the leg workout you suggested 💪 but my knees hurt a bit on the lunges, what should I change?"
+ASSISTANT_TURN = (
+    "## Great job finishing the workout! 🎉\n\n"
+    "Knee discomfort on lunges usually comes down to form or load. Try these changes:\n\n"
+    "1. **Shorten your stride** so your front knee stays over your ankle\n"
+    "2. **Slow the lowering phase** to 3 seconds to build control\n"
+    "3. **Swap to reverse lunges** - they put less shear force on the knee\n"
+    "4. **Reduce the weight** for a week while you groove the pattern\n\n"
+    "If the pain is sharp or lasts more than a few days, check in with a physio. "
+    "Want me to adjust the rest of the plan around this? 😊"
+)
+REPLY = ASSISTANT_TURN * 3
+
+
+def legacy_clean_history(conversation_history):
+    """clean_history as it was: every turn copied into a new dict"""
+    return [
+        {"role": msg['role'], "content": msg['content']}
+        for msg in conversation_history
+        if msg.get('role') in ['user', 'assistant']
+    ]
+
+
+def make_history(messages):
+    return [
+        {'role': 'user', 'content': USER_TURN} if i % 2 == 0 else {'role': 'assistant', 'content': ASSISTANT_TURN}
+        for i in range(messages)
+    ]
+
+
+def per_call_us(fn):
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    return min(timer.repeat(5, number)) / number * 1e6
+
+
+def measure(app, body, clean, encode_payload, system_message):
+    """Microseconds per request for each stage"""
+    history = clean(json.loads(body)['conversationHistory'])
+    payload = {'model': 'gpt-4o-mini', 'messages': [system_message, *history], 'max_tokens': 2000}
+    response_body = {'success': True, 'data': {'message': REPLY, 'suggestions': ['Track workout', 'View progress']}}
+
+    with app.test_request_context('/api/chatbot/message', method='POST', data=body,
+                                  content_type='application/json'):
+        def parse():
+            # get_json caches its result on the request, so drop the cache each time
+            request._cached_json = (Ellipsis, Ellipsis)
+            return request.get_json()
+
+        parsed = parse()
+        return {
+            'parse': per_call_us(parse),
+            'history': per_call_us(lambda: clean(parsed['conversationHistory'])),
+            'upstream': per_call_us(lambda: encode_payload(payload)),
+            'response': per_call_us(lambda: jsonify(response_body)),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='JSON serialization microbenchmark')
+    parser.add_argument('--messages', type=int, nargs='+', default=[10, 100, 500])
+    args = parser.parse_args()
+
+    system_message = {'role': 'system', 'content': prompts.load('coach_openai').text}
+    legacy_app = Flask('legacy')
+    fast_app = Flask('fast')
+    fast_json.install(fast_app)
+    variants = [
+        # requests' json= encodes with json.dumps defaults
+        ('before', legacy_app, legacy_clean_history, lambda payload: json.dumps(payload).encode('utf-8')),
+        (f"after ({fast_json.backend()})", fast_app, clean_history, fast_json.dumps_bytes),
+    ]
+    stages = ('parse', 'history', 'upstream', 'response')
+
+    print("=" * 86)
+    print(f"{'messages':>9}  {'variant':<16}" + ''.join(f"{stage + ' µs':>12}" for stage in stages) + f"{'total µs':>12}")
+    print("=" * 86)
+    for messages in args.messages:
+        body = json.dumps({'message': 'What should I do today?', 'conversationHistory': make_history(messages)})
+        for name, app, clean, encode_payload in variants:
+            result = measure(app, body, clean, encode_payload, system_message)
+            print(f"{messages:>9}  {name:<16}" + ''.join(f"{result[stage]:>12.1f}" for stage in stages)
+                  + f"{sum(result.values()):>12.1f}")
+        print(f"{'':>9}  request body {len(body) / 1024:.0f} KB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Batch meal scoring benchmark
+Morning-notification workload: top meals per slot for every user against the weather in their
+area. Compares meal_batch.BatchScorer with looping MealIndex.suggest() and the app's original
+algorithm user by user (those two are timed on a sample and extrapolated). Batch results are
+checked against MealIndex on the sample first.
+
+Usage:
+    python bench/bench_meal_batch.py --users 10000 100000 1000000 --meals 220
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import meal_batch  # noqa: E402
+from bench_meals import legacy_suggestions  # noqa: E402
+from meal_recommender import MealIndex  # noqa: E402
+from synthetic_meals import make_catalog  # noqa: E402
+
+WEATHER = ('hot', 'cold', 'rainy', 'humid', 'cloudy')
+
+
+def make_users(scorer, users, pantry, seed=0):
+    """Pantries of 0..2*pantry items drawn by how often recipes use them, plus a weather each"""
+    rng = np.random.default_rng(seed)
+    popularity = scorer.incidence[:-1].sum(axis=1)
+    sizes = rng.integers(0, 2 * pantry + 1, users)
+    offsets = np.zeros(users + 1, dtype=np.int64)
+    np.cumsum(sizes, out=offsets[1:])
+    ids = rng.choice(len(popularity), int(offsets[-1]), p=popularity / popularity.sum())
+    weather = np.array(WEATHER)[rng.integers(0, len(WEATHER), users)].tolist()
+    return meal_batch.Pantries(ids, offsets), weather
+
+
+def names(scorer, pantries, user):
+    ingredient_names = scorer.index.ingredient_names
+    return [ingredient_names[i] for i in pantries.ids[pantries.offsets[user]:pantries.offsets[user + 1]]]
+
+
+def per_user_s(fn, sample):
+    start = time.perf_counter()
+    for user in sample:
+        fn(user)
+    return (time.perf_counter() - start) / len(sample)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Batch meal scoring benchmark')
+    parser.add_argument('--users', type=int, nargs='+', default=[10000, 100000, 1000000])
+    parser.add_argument('--meals', type=int, default=220, help='catalog size (220 = the real catalog)')
+    parser.add_argument('--pantry', type=int, default=10, help='average pantry size')
+    parser.add_argument('-k', type=int, default=5, help='meals per slot')
+    parser.add_argument('--sample', type=int, default=500, help='users timed with the per-user loops')
+    args = parser.parse_args()
+
+    catalog = make_catalog(args.meals)
+    index = MealIndex(catalog)
+    scorer = meal_batch.BatchScorer(index)
+
+    # Per-user baselines and the correctness check, on a sample
+    pantries, weather = make_users(scorer, args.sample, args.pantry, seed=1)
+    sample = range(args.sample)
+    batch = scorer.top_k(pantries, weather, k=args.k)
+    for user in sample:
+        expected = index.suggest(weather[user], names(scorer, pantries, user), limit=args.k)
+        for group, rows in batch.items():
+            if [match.meal for match in scorer.matches(names(scorer, pantries, user), rows[user])] != \
+                    [match.meal for match in expected[group]]:
+                raise SystemExit(f"Batch result differs from MealIndex for user {user}, {group}")
+    legacy = per_user_s(lambda user: legacy_suggestions(catalog, weather[user], names(scorer, pantries, user)),
+                        sample)
+    indexed = per_user_s(lambda user: index.suggest(weather[user], names(scorer, pantries, user), limit=args.k),
+                         sample)
+
+    print("=" * 88)
+    print(f"{args.meals} meals, {len(index.ingredient_names)} ingredients, pantry ~{args.pantry},"
+          f" top {args.k} per slot, {len(WEATHER)} weather areas")
+    print(f"{'users':>9}  {'batch s':>9}  {'µs/user':>8}  {'users/s':>10}  {'suggest() loop s':>17}  {'legacy loop s':>14}")
+    print("=" * 88)
+    for users in args.users:
+        pantries, weather = make_users(scorer, users, args.pantry)
+        start = time.perf_counter()
+        scorer.top_k(pantries, weather, k=args.k)
+        elapsed = time.perf_counter() - start
+        print(f"{users:>9}  {elapsed:>9.2f}  {elapsed / users * 1e6:>8.2f}  {users / elapsed:>10.0f}"
+              f"  {indexed * users:>17.1f}  {legacy * users:>14.1f}")
+    print(f"loops extrapolated from {args.sample} users: suggest() {indexed * 1e6:.0f} µs/user,"
+          f" legacy {legacy * 1e6:.0f} µs/user")
+
+
+if __name__ == '__main__':
+    main()
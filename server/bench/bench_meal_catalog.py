@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Meal catalog loading benchmark
+json.load of a pretty-printed mealsData.json (what every script and server does today) against
+memory-mapping the compiled .mealbin, on synthetic catalogs. Each load runs in a fresh process so
+its time and RSS growth are measured alone; "query" counts meals under 400 kcal with at least
+10 g protein, parsing the strings per meal on the JSON side and reading the parsed columns on
+the binary side.
+
+Usage:
+    python bench/bench_meal_catalog.py --sizes 220 10000 100000
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import meal_catalog  # noqa: E402
+from meal_model import parse_number  # noqa: E402
+from synthetic_meals import make_catalog  # noqa: E402
+
+MB = 1024 * 1024
+
+
+def rss():
+    """Resident set size of this process in bytes"""
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) * 1024
+    return 0
+
+
+def load_json(path):
+    with open(path, encoding='utf-8') as f:
+        meals = json.load(f)['meals']
+    return meals, lambda: sum(1 for meal in meals
+                              if parse_number(meal['calories']) < 400
+                              and parse_number(meal['protein']) >= 10)
+
+
+def load_mealbin(path):
+    catalog = meal_catalog.Catalog(path)
+    calories = catalog.column('calories.kcal')
+    protein = catalog.column('protein.grams')
+    return catalog, lambda: sum(1 for kcal, grams in zip(calories, protein) if kcal < 400 and grams >= 10)
+
+
+def child(kind, path):
+    """Runs in a fresh interpreter: load once, query once, report"""
+    before = rss()
+    start = time.perf_counter()
+    catalog, query = (load_json if kind == 'json' else load_mealbin)(path)
+    loaded = time.perf_counter() - start
+    load_rss = rss() - before
+    start = time.perf_counter()
+    matches = query()
+    queried = time.perf_counter() - start
+    print(json.dumps({'load': loaded, 'rss': load_rss, 'query': queried,
+                      'queryRss': rss() - before, 'matches': matches}))
+
+
+def measure(kind, path):
+    output = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', kind, path],
+                            check=True, capture_output=True, text=True).stdout
+    return json.loads(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Meal catalog loading benchmark')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[220, 10000, 100000])
+    parser.add_argument('--child', nargs=2, metavar=('KIND', 'PATH'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(*args.child)
+        return
+
+    print("=" * 108)
+    print(f"{'meals':>8}  {'json MB':>8}  {'bin MB':>7}  {'build s':>8}  {'json load':>10}  {'json RSS':>9}"
+          f"  {'mmap open':>10}  {'mmap RSS':>9}  {'json query':>11}  {'bin query':>10}")
+    print("=" * 108)
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            json_path = os.path.join(tmp, f'meals-{size}.json')
+            bin_path = os.path.join(tmp, f'meals-{size}.mealbin')
+            with open(json_path, 'w', encoding='utf-8') as f:
+                # Same layout as the checked-in file
+                json.dump({'meals': make_catalog(size)}, f, indent=2)
+            start = time.perf_counter()
+            meal_catalog.build(json_path, bin_path)
+            build = time.perf_counter() - start
+
+            from_json = measure('json', json_path)
+            from_bin = measure('mealbin', bin_path)
+            if from_json['matches'] != from_bin['matches']:
+                raise SystemExit(f"Query results differ at {size} meals")
+            print(f"{size:>8}  {os.path.getsize(json_path) / MB:>8.1f}  {os.path.getsize(bin_path) / MB:>7.1f}"
+                  f"  {build:>8.2f}  {from_json['load'] * 1e3:>8.1f}ms  {from_json['rss'] / MB:>7.1f}MB"
+                  f"  {from_bin['load'] * 1e3:>8.2f}ms  {from_bin['rss'] / MB:>7.1f}MB"
+                  f"  {from_json['query'] * 1e3:>9.1f}ms  {from_bin['query'] * 1e3:>8.1f}ms")
+    print("RSS = growth over the bare interpreter; the binary query's pages are file-backed and shareable")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Meal model benchmark
+JSON dicts (numbers as strings, re-parsed by every consumer) against meal_model.Meal records on
+synthetic catalogs:
+  memory  - bytes per meal kept alive after loading (tracemalloc)
+  load    - json.loads alone vs json.loads + validate/parse into Meals
+  query   - 'dinner' meals under 400 kcal with >= 10 g protein, sorted by prep time then
+            protein, top 20
+  dump    - back to the JSON document (Meal.to_json for the records)
+
+Usage:
+    python bench/bench_meal_model.py --sizes 220 10000 100000
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import meal_model  # noqa: E402
+from meal_model import parse_number  # noqa: E402
+from synthetic_meals import make_catalog  # noqa: E402
+
+
+def query_dicts(meals):
+    found = [meal for meal in meals
+             if 'dinner' in meal['tags'] and parse_number(meal['calories']) < 400
+             and parse_number(meal['protein']) >= 10]
+    found.sort(key=lambda meal: (parse_number(meal['prepTime']), -parse_number(meal['protein'])))
+    return [meal['id'] for meal in found[:20]]
+
+
+def query_meals(meals):
+    found = [meal for meal in meals
+             if 'dinner' in meal.tags and meal.calories_kcal < 400 and meal.protein_g >= 10]
+    found.sort(key=lambda meal: (meal.prep_minutes, -meal.protein_g))
+    return [meal.id for meal in found[:20]]
+
+
+def retained(build):
+    """Bytes still allocated by build() once it returns"""
+    gc.collect()
+    tracemalloc.start()
+    kept = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return kept, size
+
+
+def per_call_ms(fn):
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    return min(timer.repeat(3, number)) / number * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Meal model benchmark')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[220, 10000, 100000])
+    args = parser.parse_args()
+
+    print("=" * 100)
+    print(f"{'meals':>8}  {'variant':<6}  {'bytes/meal':>10}  {'load ms':>9}  {'query ms':>9}  {'dump ms':>9}"
+          f"  {'query speedup':>13}")
+    print("=" * 100)
+    for size in args.sizes:
+        text = json.dumps({'meals': make_catalog(size)})
+
+        dicts, dict_bytes = retained(lambda: json.loads(text)['meals'])
+        meals, meal_bytes = retained(lambda: meal_model.from_document(json.loads(text)))
+        if [meal.to_json() for meal in meals] != dicts or query_dicts(dicts) != query_meals(meals):
+            raise SystemExit(f"Meal model disagrees with the JSON at {size} meals")
+
+        dict_query = per_call_ms(lambda: query_dicts(dicts))
+        meal_query = per_call_ms(lambda: query_meals(meals))
+        rows = [
+            ('dict', dict_bytes, per_call_ms(lambda: json.loads(text)), dict_query,
+             per_call_ms(lambda: json.dumps({'meals': dicts}))),
+            ('Meal', meal_bytes, per_call_ms(lambda: meal_model.from_document(json.loads(text))), meal_query,
+             per_call_ms(lambda: json.dumps({'meals': [meal.to_json() for meal in meals]}))),
+        ]
+        for name, size_bytes, load, query, dump in rows:
+            speedup = f"{dict_query / query:>12.1f}x" if name == 'Meal' else ''
+            print(f"{size:>8}  {name:<6}  {size_bytes / size:>10.0f}  {load:>9.1f}  {query:>9.2f}  {dump:>9.1f}"
+                  f"  {speedup:>13}")
+        del dicts, meals
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Meal catalog build benchmark
+meal_pipeline.build on synthetic catalogs split into shards (meals without imageUrl, so the
+images stage has work), against rebuilding the whole document every time as the old scripts did
+(load, fill images, validate, json.dump):
+  full     - cold build, empty cache
+  no-op    - nothing changed
+  touched  - one shard saved again unchanged (new mtime, same content)
+  edited   - one meal's description changed in one shard
+  rules    - images.json changed, every shard reprocessed
+
+Usage:
+    python bench/bench_meal_pipeline.py --sizes 220 100000 300000 --shards 100
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import meal_pipeline  # noqa: E402
+from synthetic_meals import make_catalog  # noqa: E402
+
+
+def write_sources(root, meals, shards):
+    """A sources tree like src/data/meals with the meals over `shards` files; the shard paths"""
+    os.makedirs(os.path.join(root, 'base'))
+    for name in ('images.json', 'common-ingredients.json'):
+        with open(os.path.join(meal_pipeline.MEALS_SOURCES_DIR, name), encoding='utf-8') as f, \
+                open(os.path.join(root, name), 'w', encoding='utf-8') as out:
+            out.write(f.read())
+    per_shard = -(-len(meals) // shards)
+    paths = []
+    for i in range(0, len(meals), per_shard):
+        path = os.path.join(root, 'base', f'meals-{i // per_shard:04d}.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'meals': meals[i:i + per_shard]}, f, indent=2, ensure_ascii=False)
+        paths.append(path)
+    return paths
+
+
+def rewrite_all(root, output):
+    """The whole-document rebuild: every meal loaded, transformed, validated and dumped again"""
+    with open(os.path.join(root, 'images.json'), encoding='utf-8') as f:
+        rules = json.load(f)
+    with open(os.path.join(root, 'common-ingredients.json'), encoding='utf-8') as f:
+        common = json.load(f)
+    meals = []
+    for path in sorted(os.listdir(os.path.join(root, 'base'))):
+        with open(os.path.join(root, 'base', path), encoding='utf-8') as f:
+            meals.extend(json.load(f)['meals'])
+    meals = [meal_pipeline.validate(meal_pipeline.attach_images(meal, rules), None) for meal in meals]
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({'meals': meals, 'commonIngredients': common}, f, indent=2)
+
+
+def edit(path, change):
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    change(data)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return (time.perf_counter() - start) * 1e3, result
+
+
+def per_call_ms(fn):
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    return min(timer.repeat(3, number)) / number * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Meal catalog build benchmark')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[220, 100000, 300000])
+    parser.add_argument('--shards', type=int, default=100)
+    args = parser.parse_args()
+
+    print("=" * 96)
+    print(f"{'meals':>8}  {'shards':>6}  {'rewrite all':>11}  {'full':>9}  {'no-op':>9}  {'touched':>9}"
+          f"  {'edited':>9}  {'rules':>9}  {'MB':>6}")
+    print("=" * 96)
+    for size in args.sizes:
+        meals = [{key: value for key, value in meal.items() if key != 'imageUrl'} for meal in make_catalog(size)]
+        with tempfile.TemporaryDirectory() as tmp:
+            root = os.path.join(tmp, 'meals')
+            paths = write_sources(root, meals, min(args.shards, size))
+            output = os.path.join(tmp, 'mealsData.json')
+            build_dir = os.path.join(tmp, 'build')
+            build = lambda: meal_pipeline.build(root, output, build_dir)  # noqa: E731
+
+            rewrite, _ = timed(lambda: rewrite_all(root, os.path.join(tmp, 'reference.json')))
+            full, _ = timed(build)
+            with open(output, 'rb') as built, open(os.path.join(tmp, 'reference.json'), 'rb') as reference:
+                if built.read() != reference.read():
+                    raise SystemExit(f"Pipeline output differs from json.dump at {size} meals")
+            noop = per_call_ms(build)
+
+            os.utime(paths[-1])
+            touched, summary = timed(build)
+            if summary['written']:
+                raise SystemExit("Re-saving a shard unchanged rewrote the output")
+
+            edit(paths[len(paths) // 2], lambda data: data['meals'][0].update(description='Edited'))
+            edited, summary = timed(build)
+            if summary['processed'] != [os.path.relpath(paths[len(paths) // 2], root)]:
+                raise SystemExit(f"Editing one shard processed {len(summary['processed'])}")
+
+            edit(os.path.join(root, 'images.json'), lambda rules: rules.update(fallback=rules['fallback'] + '&v=2'))
+            rules, summary = timed(build)
+
+            print(f"{size:>8}  {len(paths):>6}  {rewrite:>9.0f}ms  {full:>7.0f}ms  {noop:>7.2f}ms  {touched:>7.2f}ms"
+                  f"  {edited:>7.0f}ms  {rules:>7.0f}ms  {os.path.getsize(output) / 1024 / 1024:>6.1f}")
+
+
+if __name__ == '__main__':
+    main()
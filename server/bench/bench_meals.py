@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Meal recommendation microbenchmark
+Compares a straight port of the app's getMealSuggestions (score every weather-suitable meal with
+list scans, then sort and filter per tag) with meal_recommender's indexed search, on the real
+catalog and synthetic catalogs grown from it. Results are checked for equality first.
+
+Usage:
+    python bench/bench_meals.py --sizes 220 10000 100000 --pantry 12
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from meal_recommender import SUGGESTION_GROUPS, MealIndex  # noqa: E402
+from synthetic_meals import make_catalog, make_pantry  # noqa: E402
+
+WEATHER = 'rainy'
+
+
+def js_round(value):
+    """Math.round"""
+    return int(value + 0.5) if value >= 0 else -int(-value + 0.5)
+
+
+def legacy_suggestions(meals, weather, available_ingredients):
+    """getMealSuggestions from mealRecommendationService.ts, line for line"""
+    available = [i.lower() for i in available_ingredients]
+    with_scores = []
+    for meal in meals:
+        if weather not in meal['weatherCategories']:
+            continue
+        meal_ingredients = [i.lower() for i in meal['ingredients']]
+        matched = [i for i in meal_ingredients if i in available]
+        missing = [i for i in meal_ingredients if i not in available]
+        with_scores.append({
+            **meal,
+            'matchScore': js_round(len(matched) / len(meal_ingredients) * 100),
+            'missingIngredients': missing,
+            'availableIngredients': matched
+        })
+    viable = with_scores if not available_ingredients else [meal for meal in with_scores if meal['matchScore'] > 0]
+    viable.sort(key=lambda meal: -meal['matchScore'])
+    return {group: [meal for meal in viable if tag in meal['tags']] for group, tag in SUGGESTION_GROUPS}
+
+
+def indexed_suggestions(index, weather, pantry, limit=None):
+    return {group: [match.to_dict() for match in matches]
+            for group, matches in index.suggest(weather, pantry, limit=limit).items()}
+
+
+def per_call_us(fn):
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    return min(timer.repeat(3, number)) / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Meal recommendation microbenchmark')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[220, 10000, 100000])
+    parser.add_argument('--pantry', type=int, default=12, help='ingredients the user has')
+    parser.add_argument('--limit', type=int, default=10, help='meals per group for the top-k rows')
+    args = parser.parse_args()
+
+    print("=" * 92)
+    print(f"{'meals':>8}  {'candidates':>10}  {'legacy µs':>12}  {'index µs':>12}  {'speedup':>8}"
+          f"  {'top-k µs':>12}  {'ranked µs':>12}")
+    print("=" * 92)
+    for size in args.sizes:
+        catalog = make_catalog(size)
+        pantry = make_pantry(catalog, args.pantry)
+        index = MealIndex(catalog)
+        if legacy_suggestions(catalog, WEATHER, pantry) != indexed_suggestions(index, WEATHER, pantry):
+            raise SystemExit(f"Results differ from the legacy algorithm at {size} meals")
+
+        candidates = len(index.ranked(pantry, weather=WEATHER))
+        legacy = per_call_us(lambda: legacy_suggestions(catalog, WEATHER, pantry))
+        full = per_call_us(lambda: indexed_suggestions(index, WEATHER, pantry))
+        top_k = per_call_us(lambda: indexed_suggestions(index, WEATHER, pantry, args.limit))
+        ranked = per_call_us(lambda: index.ranked(pantry, tag='dinner', weather=WEATHER, limit=args.limit))
+        print(f"{size:>8}  {candidates:>10}  {legacy:>12.1f}  {full:>12.1f}  {legacy / full:>7.1f}x"
+              f"  {top_k:>12.1f}  {ranked:>12.1f}")
+    print(f"pantry of {args.pantry}, weather '{WEATHER}'; top-k = {args.limit} per group,"
+          f" ranked = positions only (tag 'dinner')")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Model registry microbenchmark
+Per-request genai.GenerativeModel construction vs. a shared registry instance,
+measured under concurrent load. No network calls are made.
+
+Usage:
+    python bench/bench_model_registry.py --threads 1 8 32 --requests 20000
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import google.generativeai as genai  # noqa: E402
+
+import model_registry  # noqa: E402
+
+MODEL_NAME = 'gemini-2.0-flash'
+GENERATION_CONFIG = {
+    'temperature': 0.9,
+    'top_p': 0.95,
+    'top_k': 40,
+    'max_output_tokens': 2048,
+}
+SYSTEM_INSTRUCTION = "You are Fit Fusion AI Coach. " * 200
+
+
+def build(model_name, **options):
+    return genai.GenerativeModel(model_name=model_name, **options)
+
+
+def run(threads, requests, setup):
+    per_thread = requests // threads
+
+    def worker():
+        for _ in range(per_thread):
+            setup()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        for future in [pool.submit(worker) for _ in range(threads)]:
+            future.result()
+    elapsed = time.perf_counter() - start
+    return elapsed / (per_thread * threads) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Model registry microbenchmark')
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 8, 32])
+    parser.add_argument('--requests', type=int, default=20000)
+    args = parser.parse_args()
+
+    variants = {
+        'generation_config': {'generation_config': GENERATION_CONFIG},
+        '+ system_instruction': {'generation_config': GENERATION_CONFIG, 'system_instruction': SYSTEM_INSTRUCTION},
+    }
+
+    print("=" * 72)
+    print(f"{'variant':<24}{'threads':>8}{'per-request us':>18}{'registry us':>14}{'speedup':>8}")
+    print("=" * 72)
+    for name, options in variants.items():
+        registry = model_registry.ModelRegistry(build)
+        for threads in args.threads:
+            fresh = run(threads, args.requests, lambda: build(MODEL_NAME, **options))
+            shared = run(threads, args.requests, lambda: registry.get(MODEL_NAME, **options))
+            print(f"{name:<24}{threads:>8}{fresh:>18.2f}{shared:>14.2f}{fresh / shared:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
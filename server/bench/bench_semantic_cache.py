@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Semantic cache benchmark
+1. Lookup latency (embed + nearest neighbour) at 10k / 100k / 1M cached entries.
+2. Upstream calls and spend avoided when replaying a query log.
+
+Usage:
+    python bench/bench_semantic_cache.py
+    python bench/bench_semantic_cache.py --sizes 10000 100000 --log queries.txt
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import semantic_cache  # noqa: E402
+
+# Paraphrase families used when no query log is supplied
+PARAPHRASES = [
+    ["vegan meal ideas", "give me vegan meals", "vegan meal ideas please", "some vegan meal ideas?"],
+    ["create a 4 day workout plan", "create a 4 day workout plan for me", "4 day workout plan please"],
+    ["I'm on keto, what should I eat?", "what should I eat on keto", "keto what should I eat"],
+    ["how do I lose belly fat", "how can I lose belly fat?", "lose belly fat tips"],
+    ["best protein sources for vegetarians", "vegetarian protein sources", "best vegetarian protein sources"],
+    ["how much water should I drink", "how much water should I drink daily?"],
+    ["home workout without equipment", "home workouts with no equipment", "no equipment home workout"],
+    ["how to build muscle fast", "how do I build muscle fast?", "build muscle fast"],
+]
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def bench_lookup(size, dim, queries):
+    cache = semantic_cache.SemanticCache(max_entries=size, dim=dim, enabled=True)
+    rng = np.random.default_rng(42)
+
+    # Bulk-fill with random unit vectors in chunks to keep peak memory down
+    chunk = 50000
+    for start in range(0, size, chunk):
+        block = rng.standard_normal((min(chunk, size - start), dim), dtype=np.float32)
+        block /= np.linalg.norm(block, axis=1, keepdims=True)
+        for vector in block:
+            cache.add_vector(vector, 'answer')
+
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        cache.get(query)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    return {
+        'entries': len(cache),
+        'p50_ms': round(percentile(timings, 50), 3),
+        'p99_ms': round(percentile(timings, 99), 3),
+        'matrix_mb': round(size * dim * 4 / 1e6, 1)
+    }
+
+
+def load_log(path):
+    messages = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith('{'):
+                line = json.loads(line).get('message', '')
+            messages.append(line)
+    return messages
+
+
+def synthetic_log(length, seed=7):
+    rng = random.Random(seed)
+    return [rng.choice(rng.choice(PARAPHRASES)) for _ in range(length)]
+
+
+def bench_replay(messages, threshold, prompt_tokens, completion_tokens, input_price, output_price):
+    cache = semantic_cache.SemanticCache(threshold=threshold, enabled=True)
+    exact = set()
+    upstream_calls = 0
+    semantic_hits = 0
+
+    for message in messages:
+        key = message.strip().lower()
+        if key in exact:
+            continue
+        # Either way the answer now sits in the exact-match cache for this wording
+        exact.add(key)
+        if cache.get(message) is not None:
+            semantic_hits += 1
+            continue
+        upstream_calls += 1
+        cache.add(message, f"answer for {message}")
+
+    cost_per_call = (prompt_tokens * input_price + completion_tokens * output_price) / 1e6
+    baseline_calls = len({m.strip().lower() for m in messages})
+    return {
+        'queries': len(messages),
+        'exact_only_calls': baseline_calls,
+        'with_semantic_calls': upstream_calls,
+        'semantic_hits': semantic_hits,
+        'calls_avoided_pct': round(100 * (1 - upstream_calls / baseline_calls), 1) if baseline_calls else 0.0,
+        'spend_avoided_usd': round(semantic_hits * cost_per_call, 4)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Semantic cache benchmark')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000])
+    parser.add_argument('--dim', type=int, default=semantic_cache.SEMANTIC_CACHE_DIM)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--log', help='query log: one message per line or JSON lines with "message"')
+    parser.add_argument('--replay-length', type=int, default=5000)
+    parser.add_argument('--threshold', type=float, default=semantic_cache.SEMANTIC_CACHE_THRESHOLD)
+    parser.add_argument('--prompt-tokens', type=int, default=3000)
+    parser.add_argument('--completion-tokens', type=int, default=700)
+    parser.add_argument('--input-price', type=float, default=0.15, help='USD per 1M input tokens')
+    parser.add_argument('--output-price', type=float, default=0.60, help='USD per 1M output tokens')
+    args = parser.parse_args()
+
+    queries = [random.choice(family) for family in PARAPHRASES for _ in range(args.queries // len(PARAPHRASES))]
+
+    print("=" * 60)
+    print(f"Lookup latency (dim={args.dim}, {len(queries)} queries)")
+    print("=" * 60)
+    for size in args.sizes:
+        result = bench_lookup(size, args.dim, queries)
+        print(f"{size:>9,} entries  p50 {result['p50_ms']:>8} ms  p99 {result['p99_ms']:>8} ms  "
+              f"matrix {result['matrix_mb']} MB")
+
+    messages = load_log(args.log) if args.log else synthetic_log(args.replay_length)
+    result = bench_replay(messages, args.threshold, args.prompt_tokens, args.completion_tokens,
+                          args.input_price, args.output_price)
+    print("=" * 60)
+    print(f"Replay ({'log: ' + args.log if args.log else 'synthetic paraphrase log'})")
+    print("=" * 60)
+    for name, value in result.items():
+        print(f"{name:>22}: {value}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+Benchmark harness for the AI coach servers against local fake LLM backends
+Starts bench/fake_openai.py and/or bench/fake_gemini.py plus serve.py for the chosen backend,
+replays the conversation mix in bench/conversations.json (multi-turn history, meal photos) at
+fixed concurrency levels, and reports throughput, latency per request kind and server memory.
+Save a run with --json and pass it to --compare on a later commit to see the difference.
+
+Usage:
+    python bench/bench_servers.py --backend openai --concurrency 8 32 64 --duration 20
+    python bench/bench_servers.py --backend gemini --latency 0.6 --token-rate 200 --error-rate 0.01
+    python bench/bench_servers.py --backend gateway --json before.json
+    python bench/bench_servers.py --backend gateway --compare before.json
+"""
+
+import argparse
+import asyncio
+import base64
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import threading
+import time
+
+import aiohttp
+
+from load_test import BENCH_DIR, SERVER_DIR, percentile, wait_until_up
+
+BACKENDS = ('openai', 'gemini', 'gateway')
+KINDS = ('first_turn', 'follow_up', 'image')
+
+
+def load_mix(path):
+    with open(path, encoding='utf-8') as f:
+        scenarios = json.load(f)['scenarios']
+    return scenarios, [scenario['weight'] for scenario in scenarios]
+
+
+def make_photo(megapixels, seed):
+    """JPEG of upscaled noise: photo-like detail, so it compresses to a realistic size"""
+    from PIL import Image
+    width = int((megapixels * 1e6 * 4 / 3) ** 0.5)
+    height = int(width * 3 / 4)
+    small = (width // 8, height // 8)
+    noise = random.Random(seed).randbytes(small[0] * small[1] * 3)
+    image = Image.frombytes('RGB', small, noise).resize((width, height), Image.Resampling.BICUBIC)
+    out = io.BytesIO()
+    image.save(out, 'JPEG', quality=85)
+    return out.getvalue()
+
+
+def process_tree_rss(root_pid):
+    """Resident memory in bytes of a process and all its descendants (Linux /proc), or None"""
+    if root_pid is None or not os.path.isdir('/proc'):
+        return None
+    children = {}
+    rss = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                # The command name may contain spaces, so split after its closing parenthesis
+                fields = f.read().rsplit(')', 1)[1].split()
+        except OSError:
+            continue
+        pid = int(entry)
+        children.setdefault(int(fields[1]), []).append(pid)
+        rss[pid] = int(fields[21]) * os.sysconf('SC_PAGE_SIZE')
+    if root_pid not in rss:
+        return None
+    total, stack = 0, [root_pid]
+    while stack:
+        pid = stack.pop()
+        total += rss.get(pid, 0)
+        stack.extend(children.get(pid, ()))
+    return total
+
+
+class MemorySampler:
+    """Polls the server's process-tree RSS in the background, keeping the peak"""
+
+    def __init__(self, pid, interval=0.25):
+        self.pid = pid
+        self.interval = interval
+        self.peak = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            rss = process_tree_rss(self.pid)
+            if rss is not None:
+                self.peak = max(self.peak or 0, rss)
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+async def replay(url, concurrency, duration, scenarios, weights, photo, unique, seed):
+    """Closed-loop load: each client replays weighted scenarios turn by turn until time is up"""
+    samples = {kind: [] for kind in KINDS}
+    errors = {}
+    counter = 0
+    stop_at = time.monotonic() + duration
+
+    async def client(session, client_index):
+        nonlocal counter
+        rng = random.Random(seed * 100003 + client_index)
+        # A distinct address per virtual user, forwarded as if by a trusted proxy
+        headers = {'X-Forwarded-For': f"10.0.{client_index // 256}.{client_index % 256}"}
+        while time.monotonic() < stop_at:
+            scenario = rng.choices(scenarios, weights)[0]
+            history = []
+            for turn in scenario['turns']:
+                if time.monotonic() >= stop_at:
+                    return
+                counter += 1
+                message = turn['message']
+                if unique:
+                    # Keeps the response/semantic caches from short-circuiting the run
+                    message = f"{message} (#{counter})"
+                body = {'message': message, 'conversationHistory': history}
+                kind = 'follow_up' if history else 'first_turn'
+                if turn.get('image'):
+                    kind = 'image'
+                    # Bytes after the JPEG end marker change the digest but not the decode work
+                    image = photo + counter.to_bytes(8, 'big') if unique else photo
+                    body['image'] = 'data:image/jpeg;base64,' + base64.b64encode(image).decode('ascii')
+
+                start = time.perf_counter()
+                try:
+                    async with session.post(f"{url}/api/chatbot/message", json=body, headers=headers) as response:
+                        payload = await response.read()
+                        status = response.status
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    status = type(e).__name__
+                if status != 200:
+                    errors[status] = errors.get(status, 0) + 1
+                    # A failed turn ends the conversation, as it would in the app
+                    break
+                samples[kind].append(time.perf_counter() - start)
+                reply = json.loads(payload)['data']['message']
+                history = history + [{'role': 'user', 'content': message}, {'role': 'assistant', 'content': reply}]
+
+    connector = aiohttp.TCPConnector(limit=0)
+    timeout = aiohttp.ClientTimeout(total=120)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        started = time.monotonic()
+        await asyncio.gather(*[client(session, i) for i in range(concurrency)])
+        elapsed = time.monotonic() - started
+
+    latencies = [latency for kind in KINDS for latency in samples[kind]]
+    failed = sum(errors.values())
+
+    def summary(values):
+        return {
+            'requests': len(values),
+            'p50_ms': round(percentile(values, 50) * 1000, 1) if values else None,
+            'p95_ms': round(percentile(values, 95) * 1000, 1) if values else None,
+            'p99_ms': round(percentile(values, 99) * 1000, 1) if values else None,
+        }
+
+    return {
+        'concurrency': concurrency,
+        **summary(latencies),
+        'rps': round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        'errors': {str(status): count for status, count in errors.items()},
+        'error_rate': round(failed / (failed + len(latencies)), 4) if failed + len(latencies) else 0.0,
+        'kinds': {kind: summary(samples[kind]) for kind in KINDS},
+    }
+
+
+def fake_command(script, port, args):
+    return [
+        sys.executable, os.path.join(BENCH_DIR, script), '--port', str(port),
+        '--first-byte-delay', str(args.latency), '--latency-jitter', str(args.latency_jitter),
+        '--token-delay', str(1 / args.token_rate if args.token_rate else 0),
+        '--error-rate', str(args.error_rate), '--error-status', str(args.error_status),
+    ]
+
+
+def start_stack(args):
+    """Fake upstream(s) + production server subprocesses; the server is last"""
+    env = dict(os.environ)
+    env.update({
+        'PYTHONUNBUFFERED': '1',
+        'PYTHONWARNINGS': 'ignore',
+        # Off unless --admission: the harness measures the server, not the rate limit
+        'ADMISSION_ENABLED': 'true' if args.admission else 'false',
+        'ADMISSION_TRUSTED_PROXIES': '127.0.0.1',
+    })
+    if not args.cacheable:
+        env.update({'COACH_CACHE_ENABLED': 'false', 'SEMANTIC_CACHE_ENABLED': 'false'})
+
+    processes = []
+    if args.backend in ('openai', 'gateway'):
+        env.update({
+            'OPENAI_API_KEY': 'bench',
+            'OPENAI_API_URL': f"http://127.0.0.1:{args.fake_port}/v1/chat/completions",
+        })
+        processes.append(subprocess.Popen(fake_command('fake_openai.py', args.fake_port, args),
+                                          cwd=BENCH_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL))
+    if args.backend in ('gemini', 'gateway'):
+        env.update({
+            'GEMINI_API_KEY': 'bench',
+            'GEMINI_API_ENDPOINT': f"http://127.0.0.1:{args.fake_port + 1}",
+        })
+        processes.append(subprocess.Popen(fake_command('fake_gemini.py', args.fake_port + 1, args),
+                                          cwd=BENCH_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL))
+    processes.append(subprocess.Popen(
+        [sys.executable, os.path.join(SERVER_DIR, 'serve.py'), '--backend', args.backend, '--host', '127.0.0.1',
+         '--port', str(args.port), '--workers', str(args.workers), '--threads', str(args.threads)],
+        cwd=SERVER_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    ))
+    return processes
+
+
+def git_revision():
+    try:
+        revision = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=SERVER_DIR,
+                                  capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=SERVER_DIR,
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return revision + ('-dirty' if dirty else '')
+
+
+def mb(value):
+    return f"{value / 1e6:.0f}" if value is not None else '-'
+
+
+def delta(new, old):
+    if new is None or old is None or old == 0:
+        return '-'
+    return f"{(new - old) / old * 100:+.1f}%"
+
+
+def print_report(report):
+    print(f"{'concurrency':>12}{'requests':>10}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+          f"{'err %':>7}{'rss MB':>8}{'peak MB':>9}")
+    for result in report['results']:
+        print(f"{result['concurrency']:>12}{result['requests']:>10}{result['rps']:>9.1f}"
+              f"{result['p50_ms'] or 0:>9.0f}{result['p95_ms'] or 0:>9.0f}{result['p99_ms'] or 0:>9.0f}"
+              f"{result['error_rate'] * 100:>7.1f}{mb(result['rss_end']):>8}{mb(result['rss_peak']):>9}")
+    print()
+    print(f"{'concurrency':>12}  {'kind':<12}{'requests':>9}{'p50 ms':>9}{'p99 ms':>9}")
+    for result in report['results']:
+        for kind, stats in result['kinds'].items():
+            if stats['requests']:
+                print(f"{result['concurrency']:>12}  {kind:<12}{stats['requests']:>9}"
+                      f"{stats['p50_ms']:>9.0f}{stats['p99_ms']:>9.0f}")
+    errors = {result['concurrency']: result['errors'] for result in report['results'] if result['errors']}
+    if errors:
+        print(f"\nErrors by concurrency: {errors}")
+
+
+def print_comparison(report, baseline):
+    print(f"\nCompared with {baseline.get('revision') or 'baseline'} ({baseline['backend']}):")
+    print(f"{'concurrency':>12}{'req/s':>10}{'p50':>10}{'p99':>10}{'peak rss':>10}")
+    previous = {result['concurrency']: result for result in baseline['results']}
+    for result in report['results']:
+        old = previous.get(result['concurrency'])
+        if old is None:
+            continue
+        print(f"{result['concurrency']:>12}{delta(result['rps'], old['rps']):>10}"
+              f"{delta(result['p50_ms'], old['p50_ms']):>10}{delta(result['p99_ms'], old['p99_ms']):>10}"
+              f"{delta(result['rss_peak'], old['rss_peak']):>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='AI coach server benchmark')
+    parser.add_argument('--backend', choices=BACKENDS, default='openai')
+    parser.add_argument('--url', help='target an already-running server instead of starting one')
+    parser.add_argument('--pid', type=int, help='server process to measure memory of, with --url')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[8, 32, 64])
+    parser.add_argument('--duration', type=float, default=15)
+    parser.add_argument('--warmup', type=float, default=3, help='seconds of unrecorded load before the first level')
+    parser.add_argument('--mix', default=os.path.join(BENCH_DIR, 'conversations.json'))
+    parser.add_argument('--megapixels', type=float, default=2, help='size of the meal photos sent')
+    parser.add_argument('--cacheable', action='store_true',
+                        help='replay messages verbatim with caches on (measures cache hits too)')
+    parser.add_argument('--admission', action='store_true', help='keep admission control on')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--threads', type=int, default=32)
+    parser.add_argument('--port', type=int, default=5804)
+    parser.add_argument('--fake-port', type=int, default=5904, help='fake OpenAI port (fake Gemini uses the next one)')
+    parser.add_argument('--latency', type=float, default=0.3, help='median seconds before the fake LLM answers')
+    parser.add_argument('--latency-jitter', type=float, default=0.3, help='lognormal sigma of the fake latency')
+    parser.add_argument('--token-rate', type=float, default=0, help='fake tokens per second (0 = instant)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of fake LLM calls that fail')
+    parser.add_argument('--error-status', type=int, default=500)
+    parser.add_argument('--json', help='write the report to this file')
+    parser.add_argument('--compare', help='report written by an earlier --json run')
+    args = parser.parse_args()
+
+    scenarios, weights = load_mix(args.mix)
+    photo = make_photo(args.megapixels, args.seed)
+    processes = [] if args.url else start_stack(args)
+    url = args.url or f"http://127.0.0.1:{args.port}"
+    server_pid = args.pid if args.url else processes[-1].pid
+
+    report = {
+        'revision': git_revision(),
+        'backend': args.backend,
+        'target': url,
+        'python': platform.python_version(),
+        'settings': {key: value for key, value in vars(args).items() if key not in ('json', 'compare', 'url', 'pid')},
+        'results': [],
+    }
+    try:
+        asyncio.run(wait_until_up(url))
+        print("=" * 82)
+        print(f"{args.backend} @ {report['revision'] or 'unknown revision'}: "
+              + (url if args.url else f"{args.workers} workers × {args.threads} threads, ")
+              + ('' if args.url else f"fake LLM {args.latency}s (σ {args.latency_jitter}), "
+                 f"{args.token_rate or '∞'} tok/s, {args.error_rate:.0%} errors"))
+        print(f"Mix: {len(scenarios)} scenarios from {os.path.basename(args.mix)}, "
+              f"photos {args.megapixels} MP ({len(photo) / 1e6:.2f} MB)")
+        print("=" * 82)
+        if args.warmup:
+            asyncio.run(replay(url, args.concurrency[0], args.warmup, scenarios, weights, photo,
+                               not args.cacheable, args.seed + 1))
+        for concurrency in args.concurrency:
+            with MemorySampler(server_pid) as sampler:
+                result = asyncio.run(replay(url, concurrency, args.duration, scenarios, weights, photo,
+                                            not args.cacheable, args.seed))
+            result['rss_peak'] = sampler.peak
+            result['rss_end'] = process_tree_rss(server_pid)
+            report['results'].append(result)
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait()
+
+    print_report(report)
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            print_comparison(report, json.load(f))
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.json}")
+
+
+if __name__ == '__main__':
+    main()
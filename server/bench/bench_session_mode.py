@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Session mode benchmark
+Client request size and server-side prompt build time as a conversation grows,
+with the full conversationHistory resent vs. a server-side session.
+
+Usage:
+    python bench/bench_session_mode.py --turns 10 50 200
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+os.environ.setdefault('OPENAI_API_KEY', 'bench')
+
+import python_ai_server  # noqa: E402
+import session_store  # noqa: E402
+
+REPEAT = 2000
+
+
+def conversation(turns):
+    history = []
+    for i in range(turns):
+        history.append({'role': 'user', 'content': f"Question {i}: how many sets should I do for legs?"})
+        history.append({'role': 'assistant', 'content': "Aim for 10-20 hard sets per week. " * 20})
+    return history
+
+
+def timed(fn):
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        fn()
+    return (time.perf_counter() - start) / REPEAT * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Session mode benchmark')
+    parser.add_argument('--turns', type=int, nargs='+', default=[10, 50, 200])
+    args = parser.parse_args()
+
+    store = session_store.SessionStore()
+    message = "What should I eat after training?"
+
+    print("=" * 78)
+    print(f"{'turns':>6}{'full body B':>14}{'session body B':>16}{'full build us':>16}{'session build us':>18}")
+    print("=" * 78)
+    for turns in args.turns:
+        history = conversation(turns)
+        session = store.create(python_ai_server.clean_history(history))
+
+        full_body = len(json.dumps({'message': message, 'conversationHistory': history}))
+        session_body = len(json.dumps({'message': message, 'sessionId': session.id}))
+
+        full_build = timed(lambda: python_ai_server.build_messages(
+            message, python_ai_server.clean_history(history)))
+        session_build = timed(lambda: python_ai_server.build_messages(
+            message, store.get(session.id).messages))
+
+        print(f"{turns:>6}{full_body:>14,}{session_body:>16,}{full_build:>16.2f}{session_build:>18.2f}")
+
+
+if __name__ == '__main__':
+    main()
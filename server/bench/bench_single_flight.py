@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Request coalescing benchmark
+Fires bursts of identical suggestion-chip prompts at the OpenAI server (in-process, against
+bench/fake_openai.py) with and without single-flight and counts the upstream calls made.
+The response cache is off so only coalescing can save calls.
+
+Usage:
+    python bench/bench_single_flight.py --burst 200 --upstream-latency 0.5
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+CHIPS = ['Create workout', 'Meal plan', 'Check progress']
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Request coalescing benchmark')
+    parser.add_argument('--burst', type=int, default=200, help='concurrent requests per burst')
+    parser.add_argument('--upstream-latency', type=float, default=0.5)
+    parser.add_argument('--fake-port', type=int, default=5911)
+    args = parser.parse_args()
+
+    os.environ.update({
+        'OPENAI_API_KEY': 'bench',
+        'OPENAI_API_URL': f"http://127.0.0.1:{args.fake_port}/v1/chat/completions",
+        'COACH_CACHE_ENABLED': 'false',
+        'UPSTREAM_MAX_IN_FLIGHT': str(args.burst),
+    })
+    fake = subprocess.Popen(
+        [sys.executable, os.path.join(BENCH_DIR, 'fake_openai.py'), '--port', str(args.fake_port),
+         '--first-byte-delay', str(args.upstream_latency)],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        # Imported after the environment is set - the server reads its config at import time
+        import python_ai_server
+        import single_flight
+
+        time.sleep(1)
+        client = python_ai_server.app.test_client()
+
+        def send(n):
+            return client.post('/api/chatbot/message', json={'message': CHIPS[n % len(CHIPS)]}).status_code
+
+        print("=" * 64)
+        print(f"Burst of {args.burst} requests over {len(CHIPS)} chip prompts, upstream {args.upstream_latency}s")
+        print("=" * 64)
+        print(f"{'mode':<16}{'upstream calls':>16}{'saved':>8}{'elapsed s':>12}  statuses")
+        for enabled in (False, True):
+            python_ai_server.flights = single_flight.SingleFlight(enabled=enabled)
+            before = python_ai_server.upstream_pool.all_stats()
+            started = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()), ThreadPoolExecutor(args.burst) as pool:
+                statuses = list(pool.map(send, range(args.burst)))
+            elapsed = time.perf_counter() - started
+            after = python_ai_server.upstream_pool.all_stats()
+            calls = sum(pool_stats['requests'] for pool_stats in after.values()) - \
+                sum(pool_stats['requests'] for pool_stats in before.values())
+            stats = python_ai_server.flights.stats()
+            counts = {status: statuses.count(status) for status in set(statuses)}
+            print(f"{'single-flight' if enabled else 'off':<16}{calls:>16}{stats['savedCalls']:>8}"
+                  f"{elapsed:>12.2f}  {counts}")
+    finally:
+        fake.terminate()
+        fake.wait()
+
+
+if __name__ == '__main__':
+    main()
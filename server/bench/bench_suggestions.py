@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Suggestion chip microbenchmark
+Compares the original substring-scan generate_suggestions with the rule engine on messages of
+increasing length, and counts how often the substring version fires on a word it shouldn't.
+
+Usage:
+    python bench/bench_suggestions.py --lengths 40 400 4000 40000
+"""
+
+import argparse
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import suggestions  # noqa: E402
+
+FILLER = ("honestly I feel great today but my week has been packed with meetings and I keep "
+          "wondering what would be the best thing to do this weekend before the holidays").split()
+KEYWORDS = ['workout', 'meal', 'progress', 'protein', 'goals', 'keto', 'squats']
+# Substrings of chip keywords inside unrelated words
+TRAPS = ['That was a great idea', 'Repeat after me', 'The theater was packed',
+         'My heartbeat is fine', 'I got sidetracked at work', 'Beat the heat']
+
+
+def legacy_suggestions(message):
+    """generate_suggestions as it was before the rule engine"""
+    message_lower = message.lower()
+    
+    if any(word in message_lower for word in ['workout', 'exercise', 'training']):
+        return ['Track workout', 'View progress', 'Nutrition advice']
+    elif any(word in message_lower for word in ['meal', 'diet', 'food', 'eat', 'nutrition']):
+        return ['Log meal', 'Track calories', 'Workout plan']
+    elif any(word in message_lower for word in ['progress', 'stats', 'track']):
+        return ['View analytics', 'Set new goal', 'Get motivation']
+    else:
+        return ['Create workout', 'Meal plan', 'Check progress']
+
+
+def make_message(length, keyword=None):
+    words = []
+    while sum(len(word) + 1 for word in words) < length:
+        words.append(random.choice(FILLER))
+    if keyword:
+        words[random.randrange(len(words))] = keyword
+    return ' '.join(words).capitalize() + '?'
+
+
+def per_call_us(fn, message):
+    timer = timeit.Timer(lambda: fn(message))
+    number, _ = timer.autorange()
+    return min(timer.repeat(3, number)) / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Suggestion chip microbenchmark')
+    parser.add_argument('--lengths', type=int, nargs='+', default=[40, 400, 4000, 40000])
+    args = parser.parse_args()
+    random.seed(7)
+
+    engine = suggestions.engine
+    print("=" * 72)
+    print(f"{'chars':>8}{'case':>12}{'legacy µs':>12}{'engine µs':>12}  legacy / engine chips")
+    print("=" * 72)
+    for length in args.lengths:
+        for case, keyword in [('no keyword', None), ('keyword', random.choice(KEYWORDS))]:
+            message = make_message(length, keyword)
+            legacy_us = per_call_us(legacy_suggestions, message)
+            engine_us = per_call_us(engine.suggest, message)
+            print(f"{length:>8}{case:>12}{legacy_us:>12.2f}{engine_us:>12.2f}  "
+                  f"{legacy_suggestions(message)[0]} / {engine.suggest(message)[0]}")
+
+    print()
+    print("Substring false positives (expected: default chips)")
+    for message in TRAPS:
+        print(f"  {message!r:<28} legacy {legacy_suggestions(message)[0]!r:<18} engine {engine.suggest(message)[0]!r}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Fake Gemini generateContent server
+Answers the REST API the google-generativeai SDK uses, so gemini_ai_server can be exercised
+without API quota. Same latency/failure knobs as fake_openai.py.
+
+Usage:
+    python bench/fake_gemini.py --port 5910 --first-byte-delay 0.4 --token-delay 0.005
+    GEMINI_API_KEY=fake GEMINI_API_ENDPOINT=http://127.0.0.1:5910 python gemini_ai_server.py
+"""
+
+import argparse
+import asyncio
+import random
+
+from aiohttp import web
+
+from fake_openai import CANNED_REPLY, add_arguments, sample_delay, tokenize
+
+STATUS_NAMES = {429: 'RESOURCE_EXHAUSTED', 500: 'INTERNAL', 503: 'UNAVAILABLE'}
+
+
+def count_tokens(content):
+    """Rough token count (4 chars per token) of one Content's text parts"""
+    return sum(len(part.get('text', '')) // 4 for part in (content or {}).get('parts', []))
+
+
+def create_app(first_byte_delay=0.0, token_delay=0.0, reply=CANNED_REPLY, latency_jitter=0.0,
+               error_rate=0.0, error_status=500):
+    """Build the fake upstream app"""
+    tokens = tokenize(reply)
+
+    async def generate_content(request):
+        method = request.match_info['method']
+        if method != 'generateContent':
+            return web.json_response({
+                'error': {'code': 404, 'message': f"{method} is not faked", 'status': 'NOT_FOUND'}
+            }, status=404)
+        body = await request.json()
+
+        if first_byte_delay:
+            await asyncio.sleep(sample_delay(first_byte_delay, latency_jitter))
+
+        if error_rate and random.random() < error_rate:
+            return web.json_response({
+                'error': {'code': error_status, 'message': 'Injected failure',
+                          'status': STATUS_NAMES.get(error_status, 'UNKNOWN')}
+            }, status=error_status)
+
+        await asyncio.sleep(token_delay * len(tokens))
+        prompt_tokens = count_tokens(body.get('systemInstruction')) + sum(
+            count_tokens(content) for content in body.get('contents', [])
+        )
+        return web.json_response({
+            'candidates': [{
+                'content': {'parts': [{'text': reply}], 'role': 'model'},
+                'finishReason': 'STOP',
+                'index': 0
+            }],
+            'usageMetadata': {
+                'promptTokenCount': prompt_tokens,
+                'candidatesTokenCount': len(tokens),
+                'totalTokenCount': prompt_tokens + len(tokens)
+            },
+            'modelVersion': request.match_info['model']
+        })
+
+    app = web.Application(client_max_size=64 * 1024 * 1024)
+    app.router.add_post('/v1beta/models/{model}:{method}', generate_content)
+    return app
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Fake Gemini server')
+    parser.add_argument('--port', type=int, default=5910)
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    web.run_app(
+        create_app(args.first_byte_delay, args.token_delay, latency_jitter=args.latency_jitter,
+                   error_rate=args.error_rate, error_status=args.error_status),
+        host='127.0.0.1',
+        port=args.port
+    )
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Fake OpenAI chat completions server
+Streams canned tokens so the coach servers can be exercised without API quota.
+Usage reports cached prompt tokens the way OpenAI's automatic prefix caching does: once a
+leading system message of 1024+ tokens has been seen, repeats of it count as cached in
+128-token steps.
+
+Latency can be jittered and a share of requests can fail, to mimic a real provider.
+
+Usage:
+    python bench/fake_openai.py --port 5900 --token-delay 0.02
+    python bench/fake_openai.py --first-byte-delay 0.4 --latency-jitter 0.5 --error-rate 0.02
+    OPENAI_API_URL=http://localhost:5900/v1/chat/completions python python_ai_server.py
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import time
+
+from aiohttp import web
+
+CANNED_REPLY = (
+    "Great question! Here's a simple plan: warm up for 5 minutes, "
+    "do 3 sets of 10 squats, 3 sets of 10 push-ups and finish with a 60 second plank. "
+    "Stay hydrated and progress a little each week!"
+)
+
+
+def tokenize(text):
+    """Split text into word-sized chunks, keeping the whitespace like real deltas do"""
+    words = text.split(' ')
+    return [word if i == 0 else ' ' + word for i, word in enumerate(words)]
+
+
+def count_tokens(content):
+    """Rough token count (4 chars per token), also for multimodal content parts"""
+    if isinstance(content, list):
+        return sum(len(part.get('text', '')) // 4 for part in content)
+    return len(content or '') // 4
+
+
+# Prefix caching applies from this many prompt tokens, in steps of CACHE_BLOCK_TOKENS
+CACHE_MIN_TOKENS = 1024
+CACHE_BLOCK_TOKENS = 128
+
+
+def sample_delay(seconds, jitter):
+    """`seconds` scaled by a lognormal factor (median 1) so a few requests are much slower"""
+    return seconds * random.lognormvariate(0, jitter) if jitter else seconds
+
+
+def add_arguments(parser):
+    """Latency/throughput/failure knobs shared by the fake providers"""
+    parser.add_argument('--first-byte-delay', type=float, default=0.0,
+                        help='seconds before the first byte (median when jittered)')
+    parser.add_argument('--token-delay', type=float, default=0.02,
+                        help='seconds per generated token (1 / token rate)')
+    parser.add_argument('--latency-jitter', type=float, default=0.0,
+                        help='lognormal sigma applied to the first-byte delay')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of requests that fail')
+    parser.add_argument('--error-status', type=int, default=500, help='HTTP status of injected failures')
+
+
+def create_app(first_byte_delay=0.0, token_delay=0.0, reply=CANNED_REPLY, latency_jitter=0.0,
+               error_rate=0.0, error_status=500):
+    """Build the fake upstream app"""
+    tokens = tokenize(reply)
+    seen_prefixes = set()
+
+    def usage(messages):
+        prompt_tokens = sum(count_tokens(m.get('content')) for m in messages)
+        cached_tokens = 0
+        if messages and messages[0].get('role') == 'system':
+            prefix_tokens = count_tokens(messages[0].get('content'))
+            if prefix_tokens >= CACHE_MIN_TOKENS:
+                prefix = hashlib.sha256(str(messages[0].get('content')).encode('utf-8')).digest()
+                if prefix in seen_prefixes:
+                    cached_tokens = prefix_tokens // CACHE_BLOCK_TOKENS * CACHE_BLOCK_TOKENS
+                seen_prefixes.add(prefix)
+        return {
+            'prompt_tokens': prompt_tokens,
+            'completion_tokens': len(tokens),
+            'total_tokens': prompt_tokens + len(tokens),
+            'prompt_tokens_details': {'cached_tokens': cached_tokens}
+        }
+
+    async def completions(request):
+        body = await request.json()
+        model = body.get('model', 'gpt-4o-mini')
+        created = int(time.time())
+
+        if first_byte_delay:
+            await asyncio.sleep(sample_delay(first_byte_delay, latency_jitter))
+
+        if error_rate and random.random() < error_rate:
+            return web.json_response({
+                'error': {'message': 'Injected failure', 'type': 'server_error', 'code': None}
+            }, status=error_status)
+
+        if not body.get('stream'):
+            await asyncio.sleep(token_delay * len(tokens))
+            return web.json_response({
+                'id': 'chatcmpl-fake',
+                'object': 'chat.completion',
+                'created': created,
+                'model': model,
+                'choices': [{
+                    'index': 0,
+                    'message': {'role': 'assistant', 'content': reply},
+                    'finish_reason': 'stop'
+                }],
+                'usage': usage(body.get('messages', []))
+            })
+
+        response = web.StreamResponse(headers={'Content-Type': 'text/event-stream'})
+        await response.prepare(request)
+        for token in tokens:
+            chunk = {
+                'id': 'chatcmpl-fake',
+                'object': 'chat.completion.chunk',
+                'created': created,
+                'model': model,
+                'choices': [{'index': 0, 'delta': {'content': token}, 'finish_reason': None}]
+            }
+            await response.write(f"data: {json.dumps(chunk)}\n\n".encode('utf-8'))
+            if token_delay:
+                await asyncio.sleep(token_delay)
+        if (body.get('stream_options') or {}).get('include_usage'):
+            chunk = {
+                'id': 'chatcmpl-fake',
+                'object': 'chat.completion.chunk',
+                'created': created,
+                'model': model,
+                'choices': [],
+                'usage': usage(body.get('messages', []))
+            }
+            await response.write(f"data: {json.dumps(chunk)}\n\n".encode('utf-8'))
+        await response.write(b"data: [DONE]\n\n")
+        await response.write_eof()
+        return response
+
+    # Image requests carry base64 data URLs
+    app = web.Application(client_max_size=64 * 1024 * 1024)
+    app.router.add_post('/v1/chat/completions', completions)
+    return app
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Fake OpenAI streaming server')
+    parser.add_argument('--port', type=int, default=5900)
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    web.run_app(
+        create_app(args.first_byte_delay, args.token_delay, latency_jitter=args.latency_jitter,
+                   error_rate=args.error_rate, error_status=args.error_status),
+        host='127.0.0.1',
+        port=args.port
+    )
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+In-process fake LLM providers for exercising llm_gateway without API quota.
+Latency is drawn from a distribution and failures are injected at a fixed rate.
+"""
+
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import llm_gateway  # noqa: E402
+
+
+class FakeProviderError(RuntimeError):
+    """Injected upstream failure"""
+
+
+def constant(seconds):
+    return lambda: seconds
+
+
+def lognormal(median, sigma):
+    """Long-tailed latency like real completions: most calls near `median`, a few far slower"""
+    mu = math.log(median)
+    return lambda: random.lognormvariate(mu, sigma)
+
+
+def stragglers(median, sigma, tail_probability, tail_factor):
+    """Lognormal latency where a fraction of calls also hit a slow path (queueing, cold replica)"""
+    base = lognormal(median, sigma)
+    return lambda: base() * (tail_factor if random.random() < tail_probability else 1.0)
+
+
+class FakeProvider(llm_gateway.Provider):
+    """Sleeps for a sampled latency, then answers (or raises with probability `error_rate`)"""
+
+    def __init__(self, name, latency=constant(0.0), error_rate=0.0, reply=None):
+        self.name = name
+        self.model = f"fake-{name}"
+        self.latency = latency
+        self.error_rate = error_rate
+        self.reply = reply or f"Answer from {name}"
+        self.calls = 0
+
+    def complete(self, message, history, image=None):
+        self.calls += 1
+        time.sleep(self.latency())
+        if self.error_rate and random.random() < self.error_rate:
+            raise FakeProviderError(f"{self.name} injected failure")
+        return self.reply
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Load test for the AI coach servers against a local fake LLM
+Starts bench/fake_openai.py and serve.py (unless --url is given), then drives
+/api/chatbot/message at a fixed concurrency and reports requests/sec and latency percentiles.
+
+Usage:
+    python bench/load_test.py --concurrency 64 --duration 20 --workers 2 --threads 32
+    python bench/load_test.py --url http://localhost:5002 --concurrency 32
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+import aiohttp
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SERVER_DIR = os.path.dirname(BENCH_DIR)
+
+QUESTIONS = [
+    "create a 4 day workout plan",
+    "I'm on keto, what should I eat?",
+    "give me vegan meal ideas",
+    "how do I track my progress?",
+    "best exercises for lower back pain",
+]
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def wait_until_up(url, timeout=30):
+    deadline = time.monotonic() + timeout
+    async with aiohttp.ClientSession() as session:
+        while time.monotonic() < deadline:
+            try:
+                async with session.get(f"{url}/api/health") as response:
+                    if response.status == 200:
+                        return
+            except aiohttp.ClientError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"Server at {url} did not come up")
+
+
+async def drive(url, concurrency, duration, path='/api/chatbot/message', build_body=None):
+    """Closed-loop load: `concurrency` clients each send a request as soon as the last one returns"""
+    latencies = []
+    errors = {}
+    counter = 0
+    stop_at = time.monotonic() + duration
+
+    def default_body(n):
+        # Unique wording per request so the response cache can't short-circuit the run
+        return {'message': f"{QUESTIONS[n % len(QUESTIONS)]} (#{n})", 'conversationHistory': []}
+
+    build_body = build_body or default_body
+
+    async def client(session):
+        nonlocal counter
+        while time.monotonic() < stop_at:
+            counter += 1
+            body = build_body(counter)
+            start = time.perf_counter()
+            try:
+                async with session.post(f"{url}{path}", json=body) as response:
+                    await response.read()
+                    if response.status != 200:
+                        errors[response.status] = errors.get(response.status, 0) + 1
+                        continue
+            except aiohttp.ClientError as e:
+                errors[type(e).__name__] = errors.get(type(e).__name__, 0) + 1
+                continue
+            latencies.append(time.perf_counter() - start)
+
+    connector = aiohttp.TCPConnector(limit=0)
+    timeout = aiohttp.ClientTimeout(total=120)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        started = time.monotonic()
+        await asyncio.gather(*[client(session) for _ in range(concurrency)])
+        elapsed = time.monotonic() - started
+
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'rps': len(latencies) / elapsed if elapsed else 0.0,
+        'p50_ms': percentile(latencies, 50) * 1000 if latencies else 0.0,
+        'p99_ms': percentile(latencies, 99) * 1000 if latencies else 0.0,
+    }
+
+
+def start_stack(args):
+    """Fake upstream + production server subprocesses"""
+    env = dict(os.environ)
+    env.update({
+        'OPENAI_API_KEY': 'load-test',
+        'OPENAI_API_URL': f"http://127.0.0.1:{args.fake_port}/v1/chat/completions",
+        'COACH_CACHE_ENABLED': 'false',
+        # Every simulated client shares one address, so per-client rate limits would cap the run
+        'ADMISSION_ENABLED': 'false',
+        'PYTHONUNBUFFERED': '1',
+    })
+    fake = subprocess.Popen(
+        [sys.executable, os.path.join(BENCH_DIR, 'fake_openai.py'), '--port', str(args.fake_port),
+         '--first-byte-delay', str(args.upstream_latency), '--token-delay', '0'],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    server = subprocess.Popen(
+        [sys.executable, os.path.join(SERVER_DIR, 'serve.py'), '--backend', 'openai', '--host', '127.0.0.1',
+         '--port', str(args.port), '--workers', str(args.workers), '--threads', str(args.threads)],
+        cwd=SERVER_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    return [fake, server]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='AI coach load test')
+    parser.add_argument('--url', help='target an already-running server instead of starting one')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[16, 64])
+    parser.add_argument('--duration', type=float, default=15)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--threads', type=int, default=32)
+    parser.add_argument('--port', type=int, default=5802)
+    parser.add_argument('--fake-port', type=int, default=5901)
+    parser.add_argument('--upstream-latency', type=float, default=0.3,
+                        help='seconds the fake LLM waits before answering')
+    args = parser.parse_args()
+
+    processes = [] if args.url else start_stack(args)
+    url = args.url or f"http://127.0.0.1:{args.port}"
+    try:
+        asyncio.run(wait_until_up(url))
+        print("=" * 64)
+        print(f"Target {url}" + ('' if args.url else
+              f" ({args.workers} workers × {args.threads} threads, upstream {args.upstream_latency}s)"))
+        print("=" * 64)
+        print(f"{'concurrency':>12}{'requests':>10}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}  errors")
+        for concurrency in args.concurrency:
+            result = asyncio.run(drive(url, concurrency, args.duration))
+            print(f"{concurrency:>12}{result['requests']:>10}{result['rps']:>10.1f}"
+                  f"{result['p50_ms']:>10.1f}{result['p99_ms']:>10.1f}  {result['errors'] or '-'}")
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait()
+
+
+if __name__ == '__main__':
+    main()
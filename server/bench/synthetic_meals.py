@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Synthetic meal catalogs for the meal benchmarks
+Grows the real mealsData.json catalog to any size: each synthetic meal copies the tags, weather
+categories, diet and recipe length of a real meal, and draws its ingredients from a larger
+vocabulary (the real ingredients plus generated ones) with Zipf weights, so a few staples
+(onion, salt, egg...) appear everywhere and most ingredients are rare - like real recipes.
+"""
+
+import bisect
+import itertools
+import json
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from meal_recommender import MEALS_DATA_PATH, normalize  # noqa: E402
+
+# Vocabulary grows with the catalog: one distinct ingredient per this many meals, at least the real ones
+MEALS_PER_INGREDIENT = 25
+ZIPF_EXPONENT = 1.1
+
+
+def real_meals(path=MEALS_DATA_PATH):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)['meals']
+
+
+def vocabulary(meals, size):
+    """Real ingredients, most used first, padded with generated names up to `size`"""
+    counts = {}
+    for meal in meals:
+        for name in meal['ingredients']:
+            name = normalize(name)
+            counts[name] = counts.get(name, 0) + 1
+    names = sorted(counts, key=counts.get, reverse=True)
+    names += [f"ingredient-{i}" for i in range(size - len(names))]
+    return names
+
+
+def make_catalog(size, seed=42, path=MEALS_DATA_PATH):
+    """`size` meals shaped like the app's catalog; the real meals come first, unchanged"""
+    rng = random.Random(seed)
+    meals = real_meals(path)
+    names = vocabulary(meals, max(size // MEALS_PER_INGREDIENT, len(meals)))
+    cumulative = list(itertools.accumulate(1 / (rank + 1) ** ZIPF_EXPONENT for rank in range(len(names))))
+
+    def draw(count):
+        picked = {}
+        while len(picked) < count:
+            picked[names[bisect.bisect(cumulative, rng.random() * cumulative[-1])]] = None
+        return list(picked)
+
+    catalog = meals[:size]
+    next_id = max(meal['id'] for meal in meals) + 1
+    while len(catalog) < size:
+        template = rng.choice(meals)
+        catalog.append({
+            **template,
+            'id': next_id,
+            'name': f"{template['name']} #{next_id}",
+            'ingredients': draw(len(template['ingredients'])),
+        })
+        next_id += 1
+    return catalog
+
+
+def make_pantry(catalog, size=12, seed=7):
+    """A pantry of `size` ingredients drawn like a user's: mostly common, some rare"""
+    rng = random.Random(seed)
+    pantry = {}
+    while len(pantry) < size:
+        pantry[rng.choice(rng.choice(catalog)['ingredients'])] = None
+    return list(pantry)
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Fit Fusion AI Coach - Conversation history
+Validates the conversationHistory clients send and shapes it for each provider. Turns are
+{'role': 'user'|'assistant', 'content': str}; other roles and malformed entries are dropped.
+Well-formed turns are reused as-is instead of being copied into new dicts.
+"""
+
+CHAT_ROLES = frozenset(('user', 'assistant'))
+
+# Gemini uses 'model' for the assistant role
+GEMINI_ROLES = {'user': 'user', 'assistant': 'model'}
+
+
+def _valid(msg):
+    return isinstance(msg, dict) and msg.get('role') in CHAT_ROLES and isinstance(msg.get('content'), str)
+
+
+def clean_history(conversation_history):
+    """
+    Neutral user/assistant turns. Returns the client's own list when every turn is already
+    exactly {'role', 'content'}, and only copies the turns that carry extra fields.
+    """
+    if not isinstance(conversation_history, list):
+        return []
+    cleaned = None
+    for index, msg in enumerate(conversation_history):
+        # Checked inline: this runs once per turn on every request
+        if type(msg) is dict and len(msg) == 2 and msg.get('role') in CHAT_ROLES and type(msg.get('content')) is str:
+            if cleaned is not None:
+                cleaned.append(msg)
+            continue
+        if cleaned is None:
+            cleaned = conversation_history[:index]
+        if _valid(msg):
+            cleaned.append({'role': msg['role'], 'content': msg['content']})
+    return conversation_history if cleaned is None else cleaned
+
+
+def to_gemini(conversation_history):
+    """Gemini-shaped turns ({'role': 'user'|'model', 'parts': [text]}) in a single pass"""
+    if not isinstance(conversation_history, list):
+        return []
+    return [
+        {'role': GEMINI_ROLES[msg['role']], 'parts': [msg['content']]}
+        for msg in conversation_history
+        if _valid(msg)
+    ]
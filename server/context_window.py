@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Fit Fusion AI Coach - Context window manager
+Keeps the newest turns within a token budget and folds older turns into a cached rolling summary
+"""
+
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
+CONTEXT_HISTORY_TOKENS = int(os.getenv('CONTEXT_HISTORY_TOKENS', 3000))
+CONTEXT_SUMMARY_TOKENS = int(os.getenv('CONTEXT_SUMMARY_TOKENS', 300))
+CONTEXT_SUMMARY_CACHE_SIZE = int(os.getenv('CONTEXT_SUMMARY_CACHE_SIZE', 4096))
+
+try:
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding('o200k_base')
+except Exception:
+    _ENCODING = None
+
+# Words, numbers and individual punctuation marks - close to BPE counts for English chat text
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+_SENTENCE_END = re.compile(r'(?<=[.!?])\s')
+
+
+@lru_cache(maxsize=8192)
+def count_tokens(text):
+    """Token count of a string (tiktoken when installed, otherwise a fast estimate)"""
+    if not text:
+        return 0
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text, disallowed_special=()))
+    words = _TOKEN_PATTERN.findall(text)
+    # Long words split into several BPE tokens
+    return len(words) + sum(len(word) // 8 for word in words)
+
+
+def message_text(message):
+    """Text of an OpenAI ({'content'}) or Gemini ({'parts'}) shaped turn"""
+    if 'content' in message:
+        return message['content'] or ''
+    return ' '.join(part for part in message.get('parts', []) if isinstance(part, str))
+
+
+def extractive_summary(previous, turns, max_tokens=CONTEXT_SUMMARY_TOKENS):
+    """
+    Cheap local summary: the first sentence of every earlier turn, newest kept when over budget.
+    `previous` is the summary of the turns before these ones.
+    """
+    lines = previous.split('\n') if previous else []
+    for turn in turns:
+        first = _SENTENCE_END.split(message_text(turn).strip(), 1)[0][:200]
+        if first:
+            speaker = 'User' if turn.get('role') == 'user' else 'Coach'
+            lines.append(f"- {speaker}: {first}")
+
+    while lines and count_tokens('\n'.join(lines)) > max_tokens:
+        lines.pop(0)
+    return '\n'.join(lines)
+
+
+class ContextWindow:
+    """Trims a conversation to a token budget, summarizing whatever falls out of it"""
+
+    def __init__(self, budget=CONTEXT_HISTORY_TOKENS, summary_tokens=CONTEXT_SUMMARY_TOKENS,
+                 summarizer=extractive_summary, cache_size=CONTEXT_SUMMARY_CACHE_SIZE):
+        self.budget = budget
+        self.summary_tokens = summary_tokens
+        self.summarizer = summarizer
+        self.cache_size = cache_size
+        # rolling digest of a dropped prefix -> summary of that prefix
+        self._summaries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _cached(self, digest):
+        with self._lock:
+            summary = self._summaries.get(digest)
+            if summary is not None:
+                self._summaries.move_to_end(digest)
+            return summary
+
+    def _store(self, digest, summary):
+        with self._lock:
+            self._summaries[digest] = summary
+            while len(self._summaries) > self.cache_size:
+                self._summaries.popitem(last=False)
+
+    def summarize(self, dropped):
+        """Rolling summary of the dropped turns, reusing the longest cached prefix"""
+        digests = []
+        digest = b''
+        for turn in dropped:
+            digest = hashlib.sha1(digest + f"{turn.get('role')}\0{message_text(turn)}".encode('utf-8')).digest()
+            digests.append(digest)
+
+        start, previous = 0, ''
+        for index in range(len(digests) - 1, -1, -1):
+            summary = self._cached(digests[index])
+            if summary is not None:
+                start, previous = index + 1, summary
+                break
+
+        if start == len(dropped):
+            return previous
+
+        summary = self.summarizer(previous, dropped[start:], self.summary_tokens)
+        self._store(digests[-1], summary)
+        return summary
+
+    def fit(self, history):
+        """
+        Split history into (summary or None, kept turns, stats).
+        Kept turns are the newest ones whose combined tokens fit the budget.
+        """
+        kept_tokens = 0
+        cut = len(history)
+        while cut > 0:
+            tokens = count_tokens(message_text(history[cut - 1]))
+            if kept_tokens + tokens > self.budget:
+                break
+            kept_tokens += tokens
+            cut -= 1
+
+        # Start the kept window on a user turn so the model never sees an orphaned reply
+        while cut < len(history) and history[cut].get('role') != 'user':
+            kept_tokens -= count_tokens(message_text(history[cut]))
+            cut += 1
+
+        summary = self.summarize(history[:cut]) if cut else None
+        stats = {
+            'turns': len(history),
+            'keptTurns': len(history) - cut,
+            'summarizedTurns': cut,
+            'historyTokens': kept_tokens,
+            'summaryTokens': count_tokens(summary) if summary else 0
+        }
+        return summary or None, history[cut:], stats
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Fit Fusion AI Coach - JSON encoding
+One JSON codec for request parsing, responses, upstream payloads and stream frames: orjson when
+it is installed (and FAST_JSON_ENABLED isn't false), otherwise the standard library with compact,
+unsorted output. install(app) makes Flask's jsonify and request.get_json use it.
+"""
+
+import json
+import os
+
+from flask.json.provider import DefaultJSONProvider
+
+FAST_JSON_ENABLED = os.getenv('FAST_JSON_ENABLED', 'true').lower() != 'false'
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if not FAST_JSON_ENABLED:
+    orjson = None
+
+# Dates, decimals, dataclasses etc. fall back to Flask's conversions
+_default = DefaultJSONProvider.default
+
+if orjson is not None:
+    _OPTIONS = orjson.OPT_NON_STR_KEYS
+
+    def dumps_bytes(obj):
+        """UTF-8 encoded JSON"""
+        return orjson.dumps(obj, default=_default, option=_OPTIONS)
+
+    def dumps(obj):
+        return orjson.dumps(obj, default=_default, option=_OPTIONS).decode('utf-8')
+
+    loads = orjson.loads
+else:
+    # ASCII escaping is the faster C path in the standard library, even for emoji-heavy replies
+    _encoder = json.JSONEncoder(separators=(',', ':'), default=_default)
+
+    def dumps_bytes(obj):
+        """Encoded JSON (ASCII, so also valid UTF-8)"""
+        return _encoder.encode(obj).encode('ascii')
+
+    dumps = _encoder.encode
+    loads = json.loads
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by this module's codec"""
+
+    def dumps(self, obj, **kwargs):
+        return dumps(obj)
+
+    def loads(self, s, **kwargs):
+        return loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        # Encoded straight to bytes, skipping the str round trip
+        return self._app.response_class(dumps_bytes(obj), mimetype=self.mimetype)
+
+
+def backend():
+    return 'orjson' if orjson is not None else 'json'
+
+
+def install(app):
+    """Use the fast codec for jsonify / request.get_json in a Flask app"""
+    app.json = FastJSONProvider(app)
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Fit Fusion AI Coach - Gateway server
+One process in front of every configured AI provider (OpenAI, Gemini), routed by llm_gateway.
+Same API as the single-provider servers.
+"""
+
+from flask import Flask, request, jsonify
+from flask_cors import CORS
+import requests
+import os
+from dotenv import load_dotenv
+
+import admission
+import fast_json
+import image_pipeline
+import job_queue
+import llm_gateway
+import metrics
+import response_cache
+import semantic_cache
+import session_store
+import single_flight
+import upstream_pool
+from chat_history import clean_history
+from suggestions import generate_suggestions
+
+# Load environment variables
+load_dotenv()
+
+# Initialize Flask app
+app = Flask(__name__)
+CORS(app)  # Enable CORS for frontend
+
+# jsonify / get_json through orjson when available
+fast_json.install(app)
+
+# Providers and routing come from GATEWAY_PROVIDERS / GATEWAY_STRATEGY
+gateway = llm_gateway.create_gateway()
+
+# Cache for repeated questions
+cache = response_cache.create_cache()
+semantic = semantic_cache.SemanticCache()
+
+# Server-side conversation history (neutral role/content turns, whichever provider answers)
+sessions = session_store.SessionStore()
+
+# Identical prompts arriving together share one upstream call
+flights = single_flight.SingleFlight()
+
+# Request counts and per-stage latency at /metrics (installed first so rejected requests are counted too)
+metrics.install(app)
+
+# Overload is shed with a fast 429 instead of queueing upstream calls without bound
+admission_control = admission.AdmissionController()
+admission.install(app, admission_control)
+
+# Long generations can run in the background and be polled for (/api/chatbot/jobs)
+jobs = job_queue.JobQueue(job_queue.endpoint_runner(app, 'chat'))
+job_queue.install(app, jobs)
+
+# Uploaded images are validated, downscaled and re-encoded before going upstream
+images = image_pipeline.ImagePipeline()
+
+
+@app.route('/api/health', methods=['GET'])
+def health_check():
+    """Health check endpoint"""
+    return jsonify({
+        'status': 'healthy',
+        'service': 'Fit Fusion AI Coach (Gateway)',
+        'version': '1.0.0',
+        'gateway': gateway.stats(),
+        'cache': cache.stats(),
+        'semanticCache': semantic.stats(),
+        'sessions': sessions.stats(),
+        'singleFlight': flights.stats(),
+        'admission': admission_control.stats(),
+        'jobs': jobs.stats(),
+        'images': images.stats()
+    })
+
+
+@app.route('/api/chatbot/message', methods=['POST'])
+def chat():
+    """Main chatbot endpoint - answered by whichever provider the gateway routes to"""
+    try:
+        with metrics.stage('parse'):
+            data = request.get_json()
+
+        if not data or 'message' not in data:
+            return jsonify({
+                'success': False,
+                'error': 'Message is required'
+            }), 400
+
+        user_message = data['message']
+        image = None
+        if data.get('image'):
+            with metrics.stage('image_decode'):
+                image = images.process(image_pipeline.decode_data_url(data['image']))
+
+        # Session mode: history lives on the server, the client only sends the new message
+        session = None
+        if data.get('sessionId'):
+            session = sessions.get(data['sessionId'])
+            if session is None:
+                return jsonify({
+                    'success': False,
+                    'error': 'Session not found or expired',
+                    'sessionExpired': True
+                }), 404
+            conversation_history = session.messages
+        elif data.get('session'):
+            session = sessions.create(clean_history(data.get('conversationHistory')))
+            conversation_history = session.messages
+        else:
+            conversation_history = clean_history(data.get('conversationHistory'))
+
+        # Serve repeated text questions from the cache (image answers depend on the image)
+        ai_message = None
+        provider = None
+        cache_key = None
+        first_turn = not conversation_history
+        if image is None:
+            cache_key = response_cache.make_key(gateway.cache_identity(), {}, user_message, conversation_history)
+            ai_message = cache.get(cache_key)
+            if ai_message is None and first_turn:
+                # First-turn paraphrases can reuse an earlier answer
+                ai_message = semantic.get(user_message)
+
+        if ai_message is None:
+            # Image requests have no cache key, so they are never coalesced
+            (ai_message, provider), shared = flights.do(
+                cache_key, lambda: gateway.complete(user_message, conversation_history, image)
+            )
+            if cache_key is not None and not shared:
+                cache.set(cache_key, ai_message)
+                if first_turn:
+                    semantic.add(user_message, ai_message)
+
+        response_body = {
+            'success': True,
+            'data': {
+                'message': ai_message,
+                'suggestions': generate_suggestions(user_message),
+                'provider': provider
+            }
+        }
+        if session is not None:
+            sessions.append(
+                session,
+                {"role": "user", "content": user_message},
+                {"role": "assistant", "content": ai_message}
+            )
+            response_body['data']['sessionId'] = session.id
+
+        with metrics.stage('serialize'):
+            return jsonify(response_body)
+
+    except image_pipeline.ImageRejected as e:
+        metrics.record_error(e)
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), e.status
+    except (llm_gateway.NoProviderAvailable, upstream_pool.UpstreamBusy) as e:
+        metrics.record_error(e)
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 503
+    except requests.HTTPError as e:
+        # Last provider tried was still failing - pass rate limits through, report the rest as a bad gateway
+        metrics.record_error(e)
+        status = e.response.status_code
+        headers = {}
+        if status == 429 and e.response.headers.get('Retry-After'):
+            headers['Retry-After'] = e.response.headers['Retry-After']
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 429 if status == 429 else 502, headers
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        metrics.record_error(e)
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@app.route('/api/chatbot/session/<session_id>', methods=['DELETE'])
+def end_session(session_id):
+    """Drop a server-side conversation"""
+    sessions.delete(session_id)
+    return jsonify({'success': True})
+
+
+if __name__ == '__main__':
+    port = int(os.getenv('PORT', 5002))
+
+    print("=" * 60)
+    print("🤖 Fit Fusion AI Coach - Gateway Server")
+    print("=" * 60)
+    for provider in gateway.providers:
+        status = "Configured" if provider.configured() else "MISSING API KEY"
+        print(f"{'✅' if provider.configured() else '❌'} {provider.name}: {provider.model} ({status})")
+    print(f"✅ Routing: {gateway.strategy}" + (" with hedging" if gateway.hedger is not None else ""))
+    print(f"📡 Server starting on http://localhost:{port}")
+    print(f"📡 API endpoint: http://localhost:{port}/api/chatbot/message")
+    print(f"📡 Background jobs: http://localhost:{port}/api/chatbot/jobs")
+    print(f"✅ Health check: http://localhost:{port}/api/health")
+    print("=" * 60)
+
+    print("💡 Development server - for production use: python serve.py --backend gateway")
+
+    # Run Flask app (debugger/reloader only when FLASK_DEBUG=1)
+    app.run(host='0.0.0.0', port=port, debug=os.getenv('FLASK_DEBUG') == '1')
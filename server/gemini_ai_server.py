@@ -8,9 +8,27 @@ FREE and NO RATE LIMITS!
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
 import os
+import tempfile
+import time
 from dotenv import load_dotenv
 
+import admission
+import fast_json
+import gemini_context_cache
+import image_pipeline
+import job_queue
+import metrics
+import prompts
+import model_registry
+import response_cache
+import semantic_cache
+import session_store
+import single_flight
+from chat_history import to_gemini
+from suggestions import generate_suggestions
+
 # Load environment variables
 load_dotenv()
 
@@ -18,78 +36,76 @@ load_dotenv()
 app = Flask(__name__)
 CORS(app)  # Enable CORS for frontend
 
+# jsonify / get_json through orjson when available
+fast_json.install(app)
+
 # Configure Gemini API
 GEMINI_API_KEY = os.getenv('GEMINI_API_KEY') or os.getenv('GOOGLE_API_KEY')
+# Optional endpoint override (a proxy, or bench/fake_gemini.py), spoken over REST
+GEMINI_API_ENDPOINT = os.getenv('GEMINI_API_ENDPOINT')
 if GEMINI_API_KEY:
-    genai.configure(api_key=GEMINI_API_KEY)
-
-# Comprehensive fitness training system prompt
-SYSTEM_PROMPT = """You are Fit Fusion AI Coach - an elite fitness and nutrition expert with deep expertise in exercise science, sports nutrition, behavioral psychology, and personalized coaching.
-
-CORE IDENTITY:
-You are warm, empathetic, knowledgeable, and genuinely invested in helping users achieve their fitness goals. You meet users where they are with compassion, expertise, and practical guidance.
-
-CRITICAL INSTRUCTION - WORKOUT PLANS:
-When a user asks for a workout plan (3-day, 4-day, 5-day, etc.), you MUST provide a DAY-BY-DAY structured plan with:
-- Day 1, Day 2, Day 3, etc. clearly labeled
-- Specific exercises for each day
-- Sets, reps, and rest periods
-- Warm-up and cool-down
-- Rest days clearly marked
-
-Example format for "create a 4 day workout plan":
-**DAY 1 - UPPER BODY**
-Warm-up: 5 min
-1. Exercise: sets × reps
-2. Exercise: sets × reps
-Cool-down: 5 min
-
-**DAY 2 - LOWER BODY**
-[exercises]
-
-**DAY 3 - REST**
-
-**DAY 4 - FULL BODY**
-[exercises]
-
-DIET EXPERTISE - Recognize and provide specific meals for:
-🥑 KETO: High-fat (70-75%), low-carb (<5%) - Avocado, eggs, fatty fish, nuts, olive oil
-🌱 VEGAN: No animal products - Tofu, tempeh, lentils, chickpeas, quinoa
-🥛 VEGETARIAN: No meat, includes dairy/eggs
-🥩 PALEO: Whole foods, no grains/dairy
-⏰ INTERMITTENT FASTING: Time-restricted eating (16:8, 18:6, OMAD)
-🍽️ MEDITERRANEAN: Olive oil, fish, vegetables, whole grains
-🥤 LOW-CARB: Reduced carbs (50-150g/day)
-🍖 CARNIVORE: Animal products only
-And more...
-
-RESPONSE STYLE:
-✓ Natural, conversational, friendly tone
-✓ Clear and easy to understand
-✓ Break complex topics into digestible pieces
-✓ Use emojis purposefully
-✓ Format with headers, bullets, spacing
-✓ Provide specific numbers (reps, sets, calories, grams)
-✓ Explain WHY behind recommendations
-✓ Be encouraging and supportive
-
-CRITICAL RULES:
-✓ Answer the ACTUAL question asked
-✓ For workout plans: Provide DAY-BY-DAY structure
-✓ For diet questions: Provide specific meals with macros
-✓ Give specific, actionable advice
-✓ Explain reasoning and science
-✓ Be realistic about timelines
-✓ Prioritize safety
-
-NEVER:
-✗ Give generic responses
-✗ Ignore the specific request (e.g., if they ask for 4 days, give 4 days!)
-✗ Recommend unsafe practices
-✗ Make unrealistic promises
-✗ Be condescending or judgmental
-
-REMEMBER: You're coaching, educating, motivating, and empowering users to achieve their fitness goals!"""
+    if GEMINI_API_ENDPOINT:
+        genai.configure(api_key=GEMINI_API_KEY, transport='rest',
+                        client_options={'api_endpoint': GEMINI_API_ENDPOINT})
+    else:
+        genai.configure(api_key=GEMINI_API_KEY)
+
+GEMINI_MODEL = 'gemini-2.0-flash'
+
+# Generation settings used for every chat
+GENERATION_CONFIG = {
+    'temperature': 0.9,
+    'top_p': 0.95,
+    'top_k': 40,
+    'max_output_tokens': 2048,
+}
+
+# Configured models are built once and shared by all requests
+models = model_registry.ModelRegistry(
+    lambda model_name, **options: genai.GenerativeModel(model_name=model_name, **options)
+)
+
+# Cache for repeated questions
+cache = response_cache.create_cache()
+semantic = semantic_cache.SemanticCache()
+
+# Uploaded images are validated, downscaled and re-encoded before going upstream
+images = image_pipeline.ImagePipeline()
+
+# Raw image bodies stay in memory up to this size, then spill to a temp file
+UPLOAD_SPOOL_BYTES = 1024 * 1024
+# Allowance for multipart boundaries and text fields on top of the image itself
+UPLOAD_FORM_OVERHEAD = 256 * 1024
+
+# Server-side conversation history for clients that opt in with sessionId/session
+sessions = session_store.SessionStore()
+
+# Identical prompts arriving together share one upstream call
+flights = single_flight.SingleFlight()
+
+# Request counts and per-stage latency at /metrics (installed first so rejected requests are counted too)
+metrics.install(app)
+
+# Overload is shed with a fast 429 instead of queueing upstream calls without bound
+admission_control = admission.AdmissionController()
+admission.install(app, admission_control)
+
+# Long generations can run in the background and be polled for (/api/chatbot/jobs)
+jobs = job_queue.JobQueue(job_queue.endpoint_runner(app, 'chat'))
+job_queue.install(app, jobs)
+
+# Versioned coach prompt (prompts/coach_gemini.vN.txt), read once at startup
+PROMPT = prompts.load('coach_gemini')
+SYSTEM_PROMPT = PROMPT.text
+
+# Cached answers are only valid for the prompt version that produced them
+CACHE_PARAMS = {**GENERATION_CONFIG, 'prompt': PROMPT.id}
+
+# The prompt goes upstream as system_instruction (a stable prefix Gemini can cache implicitly),
+# or as explicit cached content with GEMINI_CONTEXT_CACHE=true
+context_cache = gemini_context_cache.ContextCache(
+    gemini_context_cache.GEMINI_CONTEXT_CACHE_MODEL or f"{GEMINI_MODEL}-001", SYSTEM_PROMPT, GENERATION_CONFIG
+)
 
 
 @app.route('/api/health', methods=['GET'])
@@ -98,8 +114,18 @@ def health_check():
     return jsonify({
         'status': 'ok',
         'message': 'AI Coach Gemini server is running',
-        'model': 'gemini-2.0-flash',
-        'version': '2.0.0'
+        'model': GEMINI_MODEL,
+        'version': '2.0.0',
+        'prompt': PROMPT.stats(),
+        'contextCache': context_cache.stats(),
+        'cache': cache.stats(),
+        'semanticCache': semantic.stats(),
+        'models': models.stats(),
+        'sessions': sessions.stats(),
+        'singleFlight': flights.stats(),
+        'admission': admission_control.stats(),
+        'jobs': jobs.stats(),
+        'images': images.stats()
     })
 
 
@@ -107,7 +133,8 @@ def health_check():
 def chat():
     """Main chatbot endpoint - handles all fitness questions"""
     try:
-        data = request.get_json()
+        with metrics.stage('parse'):
+            data = request.get_json()
         
         if not data or 'message' not in data:
             return jsonify({
@@ -115,97 +142,216 @@ def chat():
                 'error': 'Message is required'
             }), 400
         
-        user_message = data['message']
-        conversation_history = data.get('conversationHistory', [])
-        image_data = data.get('image', None)
+        # Decode, validate and shrink the image if present
+        image = None
+        if data.get('image'):
+            with metrics.stage('image_decode'):
+                image = images.process(image_pipeline.decode_data_url(data['image']))
         
-        # Initialize Gemini model (use vision model if image is present)
-        model_name = 'gemini-2.0-flash' if not image_data else 'gemini-2.0-flash'
-        model = genai.GenerativeModel(
-            model_name=model_name,
-            generation_config={
-                'temperature': 0.9,
-                'top_p': 0.95,
-                'top_k': 40,
-                'max_output_tokens': 2048,
-            }
-        )
-        
-        # Build conversation with system prompt
-        chat_history = []
+        return respond(data, image)
         
-        # Add conversation history
-        for msg in conversation_history:
-            if msg.get('role') == 'user':
-                chat_history.append({
-                    'role': 'user',
-                    'parts': [msg['content']]
-                })
-            elif msg.get('role') == 'assistant':
-                chat_history.append({
-                    'role': 'model',
-                    'parts': [msg['content']]
-                })
+    except Exception as e:
+        return error_response(e)
+
+
+@app.route('/api/chatbot/image', methods=['POST'])
+def chat_image():
+    """
+    Image endpoint without base64: either multipart/form-data with an `image` file plus
+    message / conversationHistory (JSON string) / sessionId / session fields, or a raw
+    image/* body with message, sessionId and session in the query string.
+    """
+    try:
+        # Covers receiving the body as well as decoding, since the upload is streamed
+        with metrics.stage('image_decode'):
+            data, image = read_image_upload()
         
-        # Handle image if present
-        if image_data:
-            import base64
-            import PIL.Image
-            import io
-            
-            # Decode base64 image
-            image_bytes = base64.b64decode(image_data.split(',')[1])
-            image = PIL.Image.open(io.BytesIO(image_bytes))
-            
-            # Send message with image
-            if not chat_history:
-                prompt = f"{SYSTEM_PROMPT}\n\nUser: {user_message}\n\nAnalyze the image and provide fitness advice."
-            else:
-                prompt = f"{user_message}\n\nAnalyze the image and provide fitness advice."
-            
-            response = model.generate_content([prompt, image])
-            ai_message = response.text
-        else:
-            # Start chat with history (text only)
-            chat = model.start_chat(history=chat_history)
-            
-            # Send message with system prompt prepended to first message
-            if not chat_history:
-                full_message = f"{SYSTEM_PROMPT}\n\nUser: {user_message}"
-            else:
-                full_message = user_message
-            
-            response = chat.send_message(full_message)
-            ai_message = response.text
+        if not data.get('message'):
+            return jsonify({
+                'success': False,
+                'error': 'Message is required'
+            }), 400
         
-        return jsonify({
-            'success': True,
-            'data': {
-                'message': ai_message,
-                'suggestions': generate_suggestions(user_message)
-            }
-        })
+        return respond(data, image)
         
     except Exception as e:
-        print(f"Error: {str(e)}")
+        return error_response(e)
+
+
+def read_image_upload():
+    """Form fields and the processed image, with the body held in a bounded spooled buffer"""
+    limit = images.max_upload_bytes
+    
+    if request.mimetype == 'multipart/form-data':
+        # Werkzeug spools file parts to disk past 500 KB; the length check bounds the rest
+        if request.content_length is None or request.content_length > limit + UPLOAD_FORM_OVERHEAD:
+            raise image_pipeline.ImageRejected(f'Upload exceeds {limit // (1024 * 1024)} MB limit', status=413)
+        upload = request.files.get('image')
+        if upload is None:
+            raise image_pipeline.ImageRejected('Image file is required')
+        fields = request.form
+        try:
+            history = fast_json.loads(fields.get('conversationHistory') or '[]')
+        except ValueError:
+            history = None
+        if not isinstance(history, list):
+            raise image_pipeline.ImageRejected('conversationHistory must be a JSON array')
+        data = {
+            'message': fields.get('message'),
+            'sessionId': fields.get('sessionId'),
+            'session': fields.get('session') in ('true', '1'),
+            'conversationHistory': history
+        }
+        return data, images.process_file(upload.stream)
+    
+    if not request.mimetype.startswith('image/'):
+        raise image_pipeline.ImageRejected('Send multipart/form-data or an image/* body', status=415)
+    if request.content_length is not None and request.content_length > limit:
+        raise image_pipeline.ImageRejected(f'Image exceeds {limit // (1024 * 1024)} MB limit', status=413)
+    
+    data = {
+        'message': request.args.get('message'),
+        'sessionId': request.args.get('sessionId'),
+        'session': request.args.get('session') in ('true', '1')
+    }
+    with tempfile.SpooledTemporaryFile(max_size=UPLOAD_SPOOL_BYTES) as buffer:
+        received = 0
+        for chunk in iter(lambda: request.stream.read(64 * 1024), b''):
+            received += len(chunk)
+            if received > limit:
+                raise image_pipeline.ImageRejected(f'Image exceeds {limit // (1024 * 1024)} MB limit', status=413)
+            buffer.write(chunk)
+        return data, images.process_file(buffer)
+
+
+def complete(user_message, chat_history, image=None):
+    """
+    One Gemini reply for a Gemini-shaped history; returns the reply text.
+    `image` is an optional image_pipeline.ProcessedImage.
+    """
+    model = context_cache.model()
+    if model is not None:
+        try:
+            return send(model, user_message, chat_history, image)
+        except google_exceptions.NotFound:
+            # Cached content expired or was deleted upstream; answer without it and recreate later
+            context_cache.invalidate()
+    
+    # Shared Gemini model carrying the system prompt (the same model handles images)
+    model = models.get(GEMINI_MODEL, generation_config=GENERATION_CONFIG, system_instruction=SYSTEM_PROMPT)
+    return send(model, user_message, chat_history, image)
+
+
+def send(model, user_message, chat_history, image=None):
+    """Reply text from `model`, which already holds the system prompt"""
+    # Handle image if present
+    if image is not None:
+        prompt = f"{user_message}\n\nAnalyze the image and provide fitness advice."
+        return generate(lambda: model.generate_content([prompt, image.as_part()]))
+    
+    # Start chat with history (text only)
+    chat = model.start_chat(history=chat_history)
+    return generate(lambda: chat.send_message(user_message))
+
+
+def generate(call):
+    """Text of one Gemini call, recording its latency and token usage"""
+    started = time.perf_counter()
+    try:
+        response = call()
+    finally:
+        # Non-streamed calls only expose the total; time to first byte is not observable here
+        metrics.STAGE_SECONDS.observe(time.perf_counter() - started, stage='upstream_total', provider='gemini')
+    usage = getattr(response, 'usage_metadata', None)
+    if usage is not None:
+        metrics.record_usage('gemini', getattr(usage, 'prompt_token_count', 0),
+                             getattr(usage, 'candidates_token_count', 0),
+                             getattr(usage, 'cached_content_token_count', 0))
+    return response.text
+
+
+def respond(data, image=None):
+    """Shared chat flow for both endpoints: history/session, caches, model call, response body"""
+    user_message = data['message']
+    
+    # Session mode: history lives on the server, the client only sends the new message
+    session = None
+    if data.get('sessionId'):
+        session = sessions.get(data['sessionId'])
+        if session is None:
+            return jsonify({
+                'success': False,
+                'error': 'Session not found or expired',
+                'sessionExpired': True
+            }), 404
+        chat_history = session.messages
+    else:
+        # Add conversation history
+        with metrics.stage('prompt_build', 'gemini'):
+            chat_history = to_gemini(data.get('conversationHistory'))
+        if data.get('session'):
+            session = sessions.create(chat_history)
+            chat_history = session.messages
+    
+    # Serve repeated text questions from the cache (image answers depend on the image)
+    ai_message = None
+    cache_key = None
+    if image is None:
+        cache_key = response_cache.make_key(GEMINI_MODEL, CACHE_PARAMS, user_message, chat_history)
+        ai_message = cache.get(cache_key)
+        if ai_message is None and not chat_history:
+            # First-turn paraphrases can reuse an earlier answer
+            ai_message = semantic.get(user_message)
+    
+    if image is not None:
+        ai_message = complete(user_message, chat_history, image)
+    elif ai_message is None:
+        ai_message, shared = flights.do(cache_key, lambda: complete(user_message, chat_history))
+        if not shared:
+            cache.set(cache_key, ai_message)
+            if not chat_history:
+                semantic.add(user_message, ai_message)
+    
+    response_body = {
+        'success': True,
+        'data': {
+            'message': ai_message,
+            'suggestions': generate_suggestions(user_message)
+        }
+    }
+    if session is not None:
+        sessions.append(
+            session,
+            {'role': 'user', 'parts': [user_message]},
+            {'role': 'model', 'parts': [ai_message]}
+        )
+        response_body['data']['sessionId'] = session.id
+    
+    with metrics.stage('serialize'):
+        return jsonify(response_body)
+
+
+def error_response(e):
+    """JSON error body for a failed chat request"""
+    metrics.record_error(e)
+    if isinstance(e, image_pipeline.ImageRejected):
         return jsonify({
             'success': False,
             'error': str(e)
-        }), 500
+        }), e.status
+    
+    print(f"Error: {str(e)}")
+    return jsonify({
+        'success': False,
+        'error': str(e)
+    }), 500
 
 
-def generate_suggestions(message):
-    """Generate contextual suggestions based on user message"""
-    message_lower = message.lower()
-    
-    if any(word in message_lower for word in ['workout', 'exercise', 'training']):
-        return ['Track workout', 'View progress', 'Nutrition advice']
-    elif any(word in message_lower for word in ['meal', 'diet', 'food', 'eat', 'nutrition']):
-        return ['Log meal', 'Track calories', 'Workout plan']
-    elif any(word in message_lower for word in ['progress', 'stats', 'track']):
-        return ['View analytics', 'Set new goal', 'Get motivation']
-    else:
-        return ['Create workout', 'Meal plan', 'Check progress']
+@app.route('/api/chatbot/session/<session_id>', methods=['DELETE'])
+def end_session(session_id):
+    """Drop a server-side conversation"""
+    sessions.delete(session_id)
+    return jsonify({'success': True})
 
 
 if __name__ == '__main__':
@@ -222,20 +368,25 @@ if __name__ == '__main__':
         print("=" * 60)
         exit(1)
     
-    # Use port 5002 explicitly (avoid conflict with port 5000)
-    port = 5002
+    # Defaults to 5002 (avoid conflict with port 5000); set PORT to run next to the OpenAI server
+    port = int(os.getenv('PORT', 5002))
     
     print("=" * 60)
     print("🤖 Fit Fusion AI Coach - Gemini Server")
     print("=" * 60)
     print(f"✅ Gemini API Key: Configured")
-    print(f"✅ Model: gemini-2.0-flash (LATEST & FREE!)")
+    print(f"✅ Model: {GEMINI_MODEL} (LATEST & FREE!)")
+    print(f"✅ Prompt: {PROMPT.id}" + (" (context cache)" if context_cache.enabled else ""))
     print(f"✅ Training: Complete (all diets, workouts, etc.)")
     print(f"✅ Rate Limits: NONE (Free tier is generous!)")
     print(f"📡 Server starting on http://localhost:{port}")
     print(f"📡 API endpoint: http://localhost:{port}/api/chatbot/message")
+    print(f"📡 Background jobs: http://localhost:{port}/api/chatbot/jobs")
+    print(f"📡 Image upload: http://localhost:{port}/api/chatbot/image")
     print(f"✅ Health check: http://localhost:{port}/api/health")
     print("=" * 60)
     
-    # Run Flask app
-    app.run(host='0.0.0.0', port=port, debug=True)
+    print("💡 Development server - for production use: python serve.py")
+    
+    # Run Flask app (debugger/reloader only when FLASK_DEBUG=1)
+    app.run(host='0.0.0.0', port=port, debug=os.getenv('FLASK_DEBUG') == '1')
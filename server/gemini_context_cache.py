@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Fit Fusion AI Coach - Gemini context cache
+Keeps the coach system prompt in a Gemini CachedContent so requests reference it instead of
+sending it again, renewing the cache before its TTL runs out. Explicit caching needs a pinned
+model version (e.g. gemini-2.0-flash-001) and a prompt above the model's minimum cacheable
+size; when creation fails the server keeps using system_instruction and retries later.
+"""
+
+import os
+import threading
+import time
+from datetime import timedelta
+
+GEMINI_CONTEXT_CACHE = os.getenv('GEMINI_CONTEXT_CACHE', 'false').lower() == 'true'
+GEMINI_CONTEXT_CACHE_MODEL = os.getenv('GEMINI_CONTEXT_CACHE_MODEL')
+GEMINI_CONTEXT_CACHE_TTL = float(os.getenv('GEMINI_CONTEXT_CACHE_TTL', 60 * 60))
+# Seconds to wait before trying again after the cache could not be created
+GEMINI_CONTEXT_CACHE_RETRY = float(os.getenv('GEMINI_CONTEXT_CACHE_RETRY', 5 * 60))
+
+# Renew once this fraction of the TTL has passed, well before the cache expires upstream
+RENEW_AFTER = 0.8
+
+
+def _create(model_name, system_instruction, ttl):
+    from google.generativeai import caching
+    return caching.CachedContent.create(
+        model=model_name,
+        display_name='fit-fusion-coach',
+        system_instruction=system_instruction,
+        ttl=timedelta(seconds=ttl)
+    )
+
+
+def _bind(cached, generation_config):
+    import google.generativeai as genai
+    return genai.GenerativeModel.from_cached_content(cached, generation_config=generation_config)
+
+
+class ContextCache:
+    """
+    One cached system prompt and the model bound to it.
+    model() returns None when caching is off or currently unavailable; callers then send the
+    prompt as system_instruction instead.
+    """
+
+    def __init__(self, model_name, system_instruction, generation_config, ttl=GEMINI_CONTEXT_CACHE_TTL,
+                 retry=GEMINI_CONTEXT_CACHE_RETRY, enabled=GEMINI_CONTEXT_CACHE, create=_create, bind=_bind):
+        self.model_name = model_name
+        self.system_instruction = system_instruction
+        self.generation_config = generation_config
+        self.ttl = ttl
+        self.retry = retry
+        self.enabled = enabled
+        self.create = create
+        self.bind = bind
+
+        self._cached = None
+        self._model = None
+        self._renew_at = 0.0
+        self._expires_at = 0.0
+        self._retry_at = 0.0
+        self._lock = threading.Lock()
+
+        self.creates = 0
+        self.renewals = 0
+        self.failures = 0
+        self.last_error = None
+
+    def model(self):
+        if not self.enabled:
+            return None
+        now = time.monotonic()
+        model = self._model
+        if model is not None and now < self._renew_at:
+            return model
+
+        with self._lock:
+            now = time.monotonic()
+            if self._model is not None and now < self._renew_at:
+                return self._model
+            if now >= self._retry_at:
+                self._refresh(now)
+            # A failed renewal keeps serving the old cache until it actually expires
+            return self._model if now < self._expires_at else None
+
+    def _refresh(self, now):
+        try:
+            if self._cached is not None and now < self._expires_at:
+                self._cached.update(ttl=timedelta(seconds=self.ttl))
+                self.renewals += 1
+            else:
+                self._cached = self.create(self.model_name, self.system_instruction, self.ttl)
+                self._model = self.bind(self._cached, self.generation_config)
+                self.creates += 1
+            self._renew_at = now + self.ttl * RENEW_AFTER
+            self._expires_at = now + self.ttl
+        except Exception as e:
+            self.failures += 1
+            self.last_error = str(e)
+            self._retry_at = now + self.retry
+            print(f"⚠️ Gemini context cache unavailable, using system_instruction: {e}")
+
+    def invalidate(self):
+        """Forget the cache (e.g. it was deleted upstream); the next call recreates it"""
+        with self._lock:
+            self._cached = None
+            self._model = None
+            self._renew_at = self._expires_at = 0.0
+
+    def stats(self):
+        return {
+            'enabled': self.enabled,
+            'active': self._model is not None and time.monotonic() < self._expires_at,
+            'name': getattr(self._cached, 'name', None),
+            'creates': self.creates,
+            'renewals': self.renewals,
+            'failures': self.failures,
+            'lastError': self.last_error
+        }
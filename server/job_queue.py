@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+Fit Fusion AI Coach - Background jobs
+Long generations (multi-day plans) run on a bounded worker pool instead of holding the HTTP
+request open: POST /api/chatbot/jobs returns a job id at once and the client polls
+GET /api/chatbot/jobs/<id> (optionally long-polling with ?wait=<seconds>) for the result.
+A job takes the same body as /api/chatbot/message and its result is that endpoint's `data`.
+
+Jobs run in the process that accepted them. Results are kept for JOB_RESULT_TTL seconds, in
+memory by default; set JOB_STORE_PATH to a SQLite file so every worker process can answer polls.
+serve.py does that itself when it runs several workers.
+"""
+
+import json
+import math
+import os
+import queue
+import secrets
+import sqlite3
+import threading
+import time
+
+from flask import jsonify, request, url_for
+
+import metrics
+
+JOB_WORKERS = int(os.getenv('JOB_WORKERS', 4))
+JOB_QUEUE_SIZE = int(os.getenv('JOB_QUEUE_SIZE', 256))
+JOB_RESULT_TTL = float(os.getenv('JOB_RESULT_TTL', 60 * 60))
+JOB_MAX_WAIT = float(os.getenv('JOB_MAX_WAIT', 25))
+JOB_STORE_PATH = os.getenv('JOB_STORE_PATH')
+
+# Expired results are swept at most this often
+PURGE_INTERVAL = 60.0
+# Long polls re-check the store this often, to see jobs finished by other processes
+POLL_INTERVAL = 0.5
+
+QUEUED, RUNNING, DONE, FAILED = 'queued', 'running', 'done', 'failed'
+FINISHED = (DONE, FAILED)
+
+
+class QueueFull(Exception):
+    """No room for another job; retry later"""
+
+
+class JobError(Exception):
+    """A job that ran but failed; `body` is the error response the endpoint produced"""
+
+    def __init__(self, message, body=None):
+        super().__init__(message)
+        self.body = body
+
+
+class Job:
+    """One background generation; timestamps are wall-clock so they mean the same in every process"""
+
+    __slots__ = ('id', 'status', 'payload', 'result', 'error', 'created', 'started', 'finished')
+
+    def __init__(self, job_id, payload, status=QUEUED, result=None, error=None,
+                 created=None, started=None, finished=None):
+        self.id = job_id
+        self.status = status
+        self.payload = payload
+        self.result = result
+        self.error = error
+        self.created = time.time() if created is None else created
+        self.started = started
+        self.finished = finished
+
+    def to_dict(self):
+        return {
+            'jobId': self.id,
+            'status': self.status,
+            'result': self.result,
+            'error': self.error,
+            'createdAt': self.created,
+            'startedAt': self.started,
+            'finishedAt': self.finished
+        }
+
+
+class MemoryJobStore:
+    """Jobs of this process, dropped `ttl` seconds after they finish"""
+
+    def __init__(self):
+        self._jobs = {}
+        self._expires = {}
+        self._lock = threading.Lock()
+
+    def save(self, job, ttl):
+        with self._lock:
+            self._jobs[job.id] = job
+            if job.status in FINISHED:
+                self._expires[job.id] = job.finished + ttl
+
+    def get(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None and self._expires.get(job_id, float('inf')) <= time.time():
+                return None
+            return job
+
+    def purge(self, now):
+        with self._lock:
+            expired = [job_id for job_id, expires in self._expires.items() if expires <= now]
+            for job_id in expired:
+                del self._jobs[job_id]
+                del self._expires[job_id]
+            return len(expired)
+
+    def __len__(self):
+        return len(self._jobs)
+
+
+class SQLiteJobStore:
+    """Jobs in a SQLite file shared by every worker process on the host"""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        connection = self._connection()
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute(
+            'CREATE TABLE IF NOT EXISTS jobs ('
+            'id TEXT PRIMARY KEY, status TEXT NOT NULL, result TEXT, error TEXT, '
+            'created REAL NOT NULL, started REAL, finished REAL, expires REAL)'
+        )
+        connection.execute('CREATE INDEX IF NOT EXISTS jobs_expires ON jobs (expires)')
+        connection.commit()
+        # Don't carry an open connection into gunicorn workers forked after import
+        connection.close()
+        self._local.connection = None
+
+    def _connection(self):
+        # sqlite3 connections can't be shared between threads
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = self._local.connection = sqlite3.connect(self.path, timeout=5)
+        return connection
+
+    def save(self, job, ttl):
+        expires = job.finished + ttl if job.status in FINISHED else None
+        connection = self._connection()
+        connection.execute(
+            'INSERT OR REPLACE INTO jobs (id, status, result, error, created, started, finished, expires) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            (job.id, job.status, json.dumps(job.result) if job.result is not None else None, job.error,
+             job.created, job.started, job.finished, expires)
+        )
+        connection.commit()
+
+    def get(self, job_id):
+        row = self._connection().execute(
+            'SELECT id, status, result, error, created, started, finished, expires FROM jobs WHERE id = ?',
+            (job_id,)
+        ).fetchone()
+        if row is None or (row[7] is not None and row[7] <= time.time()):
+            return None
+        # The payload stays with the process running the job
+        return Job(row[0], None, status=row[1], result=json.loads(row[2]) if row[2] else None, error=row[3],
+                   created=row[4], started=row[5], finished=row[6])
+
+    def purge(self, now):
+        connection = self._connection()
+        deleted = connection.execute('DELETE FROM jobs WHERE expires <= ?', (now,)).rowcount
+        connection.commit()
+        return deleted
+
+    def __len__(self):
+        return self._connection().execute('SELECT COUNT(*) FROM jobs').fetchone()[0]
+
+
+def create_store(path=JOB_STORE_PATH):
+    """SQLite store when JOB_STORE_PATH is set, otherwise in-process"""
+    return SQLiteJobStore(path) if path else MemoryJobStore()
+
+
+class JobQueue:
+    """
+    Bounded FIFO of jobs served by `workers` threads, each calling `run(payload)` for the result.
+    Threads start with the first job, so gunicorn workers forked after import each get their own.
+    """
+
+    def __init__(self, run, workers=JOB_WORKERS, queue_size=JOB_QUEUE_SIZE, ttl=JOB_RESULT_TTL, store=None):
+        self.run = run
+        self.workers = workers
+        self.queue_size = queue_size
+        self.ttl = ttl
+        self.store = store if store is not None else create_store()
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._threads = []
+        self._lock = threading.Lock()
+        self._finished = threading.Condition(self._lock)
+        self._running = 0
+        self._purged_at = time.monotonic()
+
+        self.submitted = 0
+        self.rejected = 0
+        self.completed = 0
+        self.failed = 0
+        self.wait_total = 0.0
+
+    def submit(self, payload):
+        """Queue a job and return it; raises QueueFull when the queue is at capacity"""
+        self._start_workers()
+        self._purge()
+        job = Job(secrets.token_urlsafe(16), payload)
+        self.store.save(job, self.ttl)
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            job.status, job.error, job.finished = FAILED, 'Job queue is full', time.time()
+            self.store.save(job, 0)
+            with self._lock:
+                self.rejected += 1
+            metrics.JOBS.inc(status='rejected')
+            raise QueueFull(f"Job queue is full ({self.queue_size} waiting), please retry shortly") from None
+        with self._lock:
+            self.submitted += 1
+        metrics.JOB_QUEUE_DEPTH.set(self._queue.qsize())
+        return job
+
+    def get(self, job_id):
+        return self.store.get(job_id)
+
+    def wait(self, job_id, timeout):
+        """The job once finished, or as it stands after `timeout` seconds; None if unknown"""
+        deadline = time.monotonic() + timeout
+        while True:
+            job = self.store.get(job_id)
+            remaining = deadline - time.monotonic()
+            if job is None or job.status in FINISHED or remaining <= 0:
+                return job
+            with self._finished:
+                self._finished.wait(min(remaining, POLL_INTERVAL))
+
+    def _start_workers(self):
+        if len(self._threads) >= self.workers:
+            return
+        with self._lock:
+            while len(self._threads) < self.workers:
+                thread = threading.Thread(target=self._work, name=f"job-worker-{len(self._threads)}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def _work(self):
+        while True:
+            job = self._queue.get()
+            metrics.JOB_QUEUE_DEPTH.set(self._queue.qsize())
+            job.status, job.started = RUNNING, time.time()
+            self.store.save(job, self.ttl)
+            waited = job.started - job.created
+            metrics.JOB_WAIT_SECONDS.observe(waited)
+            with self._lock:
+                self._running += 1
+                self.wait_total += waited
+            metrics.JOBS_RUNNING.inc()
+
+            try:
+                job.result, job.status = self.run(job.payload), DONE
+            except JobError as e:
+                job.result, job.error, job.status = e.body, str(e), FAILED
+            except Exception as e:
+                print(f"Job {job.id} failed: {e}")
+                job.error, job.status = str(e), FAILED
+            job.finished = time.time()
+            # The payload (message, history) isn't needed once the job has run
+            job.payload = None
+            self.store.save(job, self.ttl)
+
+            metrics.JOBS_RUNNING.dec()
+            metrics.JOB_RUN_SECONDS.observe(job.finished - job.started)
+            metrics.JOBS.inc(status=job.status)
+            with self._finished:
+                self._running -= 1
+                if job.status == DONE:
+                    self.completed += 1
+                else:
+                    self.failed += 1
+                self._finished.notify_all()
+
+    def _purge(self):
+        now = time.monotonic()
+        if now - self._purged_at < PURGE_INTERVAL:
+            return
+        self._purged_at = now
+        self.store.purge(time.time())
+
+    def stats(self):
+        with self._lock:
+            started = self.completed + self.failed + self._running
+            return {
+                'workers': self.workers,
+                'queued': self._queue.qsize(),
+                'running': self._running,
+                'queueSize': self.queue_size,
+                'submitted': self.submitted,
+                'completed': self.completed,
+                'failed': self.failed,
+                'rejected': self.rejected,
+                'avgWaitMs': round(self.wait_total / started * 1000, 1) if started else 0.0,
+                'store': 'sqlite' if isinstance(self.store, SQLiteJobStore) else 'memory'
+            }
+
+
+def endpoint_runner(app, endpoint='chat'):
+    """
+    Job runner that answers a payload with an existing JSON endpoint of `app`, so jobs share its
+    caches, sessions and error handling. A non-2xx response fails the job with that body.
+    """
+
+    def run(payload):
+        rule = next(app.url_map.iter_rules(endpoint))
+        with app.test_request_context(rule.rule, method='POST', json=payload):
+            response = app.make_response(app.view_functions[endpoint]())
+        body = response.get_json(silent=True) or {}
+        if response.status_code >= 400:
+            raise JobError(body.get('error') or f"HTTP {response.status_code}", body)
+        return body.get('data')
+
+    return run
+
+
+def install(app, jobs):
+    """Add the job submit/poll endpoints to a Flask app"""
+    app.extensions['job_queue'] = jobs
+
+    @app.route('/api/chatbot/jobs', methods=['POST'])
+    def submit_job():
+        """Queue a chat request; answers 202 with the job id to poll"""
+        data = request.get_json(silent=True)
+        if not data or 'message' not in data:
+            return jsonify({
+                'success': False,
+                'error': 'Message is required'
+            }), 400
+        try:
+            job = jobs.submit(data)
+        except QueueFull as e:
+            response = jsonify({
+                'success': False,
+                'error': str(e)
+            })
+            response.status_code = 503
+            response.headers['Retry-After'] = '5'
+            return response
+
+        response = jsonify({'success': True, 'data': job.to_dict()})
+        response.status_code = 202
+        response.headers['Location'] = url_for('job_status', job_id=job.id)
+        return response
+
+    @app.route('/api/chatbot/jobs/<job_id>', methods=['GET'])
+    def job_status(job_id):
+        """Job state and, once finished, its result; ?wait=<seconds> holds the request until then"""
+        wait = request.args.get('wait', 0, type=float)
+        # NaN slips through min/max and would spin in wait() past JOB_MAX_WAIT
+        wait = min(max(wait, 0.0), JOB_MAX_WAIT) if math.isfinite(wait) else 0.0
+        job = jobs.wait(job_id, wait) if wait else jobs.get(job_id)
+        if job is None:
+            return jsonify({
+                'success': False,
+                'error': 'Job not found or expired'
+            }), 404
+        return jsonify({'success': True, 'data': job.to_dict()})
@@ -0,0 +1,433 @@
+#!/usr/bin/env python3
+"""
+Fit Fusion AI Coach - Multi-provider LLM gateway
+One interface over the OpenAI and Gemini backends, with health tracking and configurable routing:
+  primary  - always the first healthy provider; a failed request is not retried elsewhere
+  fallback - configured order, moving on to the next provider when one fails
+  latency  - picks among healthy providers weighted by observed speed, falling back on failure
+Slow or failing providers are bypassed automatically until they recover.
+Optional hedging (GATEWAY_HEDGE=true) sends a duplicate request to the next provider when the first
+has not answered within its recent p90 latency, and takes whichever answer arrives first.
+"""
+
+import importlib
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, TimeoutError as FutureTimeout, wait
+
+import prompts
+from chat_history import to_gemini
+
+GATEWAY_PROVIDERS = os.getenv('GATEWAY_PROVIDERS', 'openai,gemini')
+GATEWAY_STRATEGY = os.getenv('GATEWAY_STRATEGY', 'fallback')
+GATEWAY_SLOW_MS = float(os.getenv('GATEWAY_SLOW_MS', 8000))
+GATEWAY_FAILURE_THRESHOLD = int(os.getenv('GATEWAY_FAILURE_THRESHOLD', 3))
+GATEWAY_COOLDOWN = float(os.getenv('GATEWAY_COOLDOWN', 30))
+
+GATEWAY_HEDGE = os.getenv('GATEWAY_HEDGE', 'false').lower() == 'true'
+GATEWAY_HEDGE_PERCENTILE = float(os.getenv('GATEWAY_HEDGE_PERCENTILE', 90))
+GATEWAY_HEDGE_MIN_MS = float(os.getenv('GATEWAY_HEDGE_MIN_MS', 50))
+GATEWAY_HEDGE_DEFAULT_MS = float(os.getenv('GATEWAY_HEDGE_DEFAULT_MS', 3000))
+GATEWAY_HEDGE_BUDGET = float(os.getenv('GATEWAY_HEDGE_BUDGET', 0.15))
+GATEWAY_HEDGE_WORKERS = int(os.getenv('GATEWAY_HEDGE_WORKERS', 64))
+
+# Recent latencies kept per provider, and how many are needed before the percentile is trusted
+LATENCY_WINDOW = 512
+LATENCY_MIN_SAMPLES = 20
+
+STRATEGIES = ('primary', 'fallback', 'latency')
+
+
+class NoProviderAvailable(RuntimeError):
+    """Every provider is down and another request holds the recovery probe"""
+
+
+class Provider:
+    """
+    An LLM backend. History is always the neutral [{'role': 'user'|'assistant', 'content'}] shape;
+    providers translate it for their API.
+    """
+
+    name = None
+    model = None
+    # prompts template the provider answers with, part of the response cache identity
+    prompt = None
+
+    def configured(self):
+        """Whether credentials for this provider are present"""
+        return True
+
+    def complete(self, message, history, image=None):
+        """Reply text for `message` after `history`; `image` is an optional ProcessedImage"""
+        raise NotImplementedError
+
+
+class OpenAIProvider(Provider):
+    """OpenAI chat completions, through python_ai_server's pooled client and context trimming"""
+
+    name = 'openai'
+    prompt = 'coach_openai'
+
+    def __init__(self):
+        # Imported on first use so a Gemini-only gateway never loads the OpenAI server
+        self._server = None
+        self.model = os.getenv('OPENAI_MODEL', 'gpt-4o-mini')
+
+    def configured(self):
+        return bool(os.getenv('OPENAI_API_KEY'))
+
+    def server(self):
+        if self._server is None:
+            self._server = importlib.import_module('python_ai_server')
+        return self._server
+
+    def complete(self, message, history, image=None):
+        return self.server().complete(message, history, image)
+
+
+class GeminiProvider(Provider):
+    """Google Gemini, through gemini_ai_server's shared model registry"""
+
+    name = 'gemini'
+    prompt = 'coach_gemini'
+
+    def __init__(self):
+        self._server = None
+        self.model = 'gemini-2.0-flash'
+
+    def configured(self):
+        return bool(os.getenv('GEMINI_API_KEY') or os.getenv('GOOGLE_API_KEY'))
+
+    def server(self):
+        if self._server is None:
+            self._server = importlib.import_module('gemini_ai_server')
+            self.model = self._server.GEMINI_MODEL
+        return self._server
+
+    def complete(self, message, history, image=None):
+        return self.server().complete(message, to_gemini(history), image)
+
+
+PROVIDERS = {
+    'openai': OpenAIProvider,
+    'gemini': GeminiProvider,
+}
+
+
+class ProviderHealth:
+    """
+    Latency EWMA plus a failure circuit for one provider.
+    After `failure_threshold` consecutive failures the provider is down for `cooldown` seconds;
+    then a single probe request is let through and its outcome closes or re-opens the circuit.
+    A slow provider is probed the same way so it can be seen recovering.
+    """
+
+    def __init__(self, slow_ms=GATEWAY_SLOW_MS, failure_threshold=GATEWAY_FAILURE_THRESHOLD,
+                 cooldown=GATEWAY_COOLDOWN, alpha=0.2):
+        self.slow_ms = slow_ms
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.alpha = alpha
+        self.ewma_ms = None
+        self.successes = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.retry_at = 0.0
+        self.probing = False
+        self.samples = deque(maxlen=LATENCY_WINDOW)
+        self._lock = threading.Lock()
+
+    def record_success(self, latency):
+        latency_ms = latency * 1000
+        with self._lock:
+            self.successes += 1
+            self.consecutive_failures = 0
+            self.probing = False
+            self.samples.append(latency_ms)
+            if self.ewma_ms is None:
+                self.ewma_ms = latency_ms
+            else:
+                self.ewma_ms += self.alpha * (latency_ms - self.ewma_ms)
+            self.retry_at = time.monotonic() + self.cooldown if self.ewma_ms > self.slow_ms else 0.0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self.consecutive_failures += 1
+            self.probing = False
+            if self.consecutive_failures >= self.failure_threshold:
+                self.retry_at = time.monotonic() + self.cooldown
+
+    def state(self):
+        """'down' (circuit open), 'slow' (EWMA over the threshold) or 'up'"""
+        with self._lock:
+            if self.consecutive_failures >= self.failure_threshold:
+                return 'down'
+            if self.ewma_ms is not None and self.ewma_ms > self.slow_ms:
+                return 'slow'
+            return 'up'
+
+    def percentile_ms(self, pct):
+        """Latency percentile over the recent window, or None until there are enough samples"""
+        with self._lock:
+            if len(self.samples) < LATENCY_MIN_SAMPLES:
+                return None
+            ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]
+
+    def probe_ready(self):
+        """Cooldown over and no probe in flight"""
+        with self._lock:
+            return not self.probing and time.monotonic() >= self.retry_at
+
+    def try_probe(self):
+        """Claim the single half-open probe once the cooldown has passed"""
+        with self._lock:
+            if self.probing or time.monotonic() < self.retry_at:
+                return False
+            self.probing = True
+            return True
+
+    def stats(self):
+        state = self.state()
+        with self._lock:
+            return {
+                'state': state,
+                'latencyMs': round(self.ewma_ms, 1) if self.ewma_ms is not None else None,
+                'successes': self.successes,
+                'failures': self.failures,
+                'consecutiveFailures': self.consecutive_failures
+            }
+
+
+class Hedger:
+    """
+    Hedging policy: the delay before a duplicate request is the primary's recent latency percentile,
+    and at most `budget` of requests may be hedged so a general slowdown can't double the load.
+    """
+
+    def __init__(self, percentile=GATEWAY_HEDGE_PERCENTILE, min_ms=GATEWAY_HEDGE_MIN_MS,
+                 default_ms=GATEWAY_HEDGE_DEFAULT_MS, budget=GATEWAY_HEDGE_BUDGET,
+                 workers=GATEWAY_HEDGE_WORKERS):
+        self.percentile = percentile
+        self.min_ms = min_ms
+        self.default_ms = default_ms
+        self.budget = budget
+        # Both legs run here so the caller can return as soon as either answers
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='hedge')
+        self.requests = 0
+        self.fired = 0
+        self.wins = 0
+        self.cancelled = 0
+        self.abandoned = 0
+        self._lock = threading.Lock()
+
+    def delay(self, health):
+        """Seconds to wait on the primary before hedging"""
+        observed = health.percentile_ms(self.percentile)
+        return max(self.min_ms, observed if observed is not None else self.default_ms) / 1000
+
+    def start(self):
+        with self._lock:
+            self.requests += 1
+
+    def allow(self):
+        """Take a hedge from the budget if there is one left"""
+        with self._lock:
+            if self.fired >= self.budget * self.requests:
+                return False
+            self.fired += 1
+            return True
+
+    def settled(self, won_by_hedge, losers):
+        """Record the outcome; losers still queued are cancelled, running ones are left to finish"""
+        cancelled = sum(1 for future in losers if future.cancel())
+        with self._lock:
+            self.wins += won_by_hedge
+            self.cancelled += cancelled
+            self.abandoned += len(losers) - cancelled
+
+    def stats(self):
+        with self._lock:
+            return {
+                'percentile': self.percentile,
+                'budget': self.budget,
+                'requests': self.requests,
+                'fired': self.fired,
+                'fireRate': round(self.fired / self.requests, 4) if self.requests else 0.0,
+                'wins': self.wins,
+                'cancelled': self.cancelled,
+                'abandoned': self.abandoned
+            }
+
+
+class Gateway:
+    """Routes completions across providers according to a strategy and their health"""
+
+    def __init__(self, providers, strategy=GATEWAY_STRATEGY, slow_ms=GATEWAY_SLOW_MS,
+                 failure_threshold=GATEWAY_FAILURE_THRESHOLD, cooldown=GATEWAY_COOLDOWN, hedger=None):
+        if not providers:
+            raise ValueError('Gateway needs at least one provider')
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown strategy '{strategy}' (expected one of: {', '.join(STRATEGIES)})")
+        self.providers = list(providers)
+        self.strategy = strategy
+        # Hedging needs a second provider to send to, so it never applies to the primary strategy
+        self.hedger = hedger if strategy != 'primary' else None
+        self.health = {
+            provider.name: ProviderHealth(slow_ms, failure_threshold, cooldown)
+            for provider in self.providers
+        }
+        self.served = {provider.name: 0 for provider in self.providers}
+        self.failovers = 0
+        self._lock = threading.Lock()
+
+    def route(self):
+        """(provider, is_probe) pairs to try for one request, best first"""
+        up, slow, probes = [], [], []
+        for provider in self.providers:
+            health = self.health[provider.name]
+            state = health.state()
+            if state == 'up':
+                up.append(provider)
+            elif health.probe_ready():
+                probes.append(provider)
+            elif state == 'slow':
+                slow.append(provider)
+
+        if self.strategy == 'latency' and len(up) > 1:
+            up = self._weighted_order(up)
+
+        # A recovering provider gets its probe ahead of slow ones so it can rejoin quickly
+        route = [(p, False) for p in up] + [(p, True) for p in probes] + [(p, False) for p in slow]
+        if not route:
+            # Everything is down - still try rather than refuse outright
+            route = [(p, False) for p in self.providers]
+        if self.strategy == 'primary':
+            return route[:1]
+        return route
+
+    def _weighted_order(self, providers):
+        """Order sampled without replacement, weighted by inverse latency"""
+        known = [self.health[p.name].ewma_ms for p in providers if self.health[p.name].ewma_ms]
+        # Providers without samples get the best observed weight so they are explored
+        default_ms = min(known) if known else 1.0
+        pool = [(p, 1.0 / (self.health[p.name].ewma_ms or default_ms)) for p in providers]
+        ordered = []
+        while pool:
+            pick = random.choices(range(len(pool)), weights=[weight for _, weight in pool])[0]
+            ordered.append(pool.pop(pick)[0])
+        return ordered
+
+    def _attempts(self):
+        """Providers in route order; a probe slot is claimed only when the request actually reaches it"""
+        for provider, probe in self.route():
+            if probe and not self.health[provider.name].try_probe():
+                continue
+            yield provider
+
+    def _call(self, provider, message, history, image):
+        """One provider call, with its outcome recorded in the provider's health"""
+        health = self.health[provider.name]
+        start = time.perf_counter()
+        try:
+            reply = provider.complete(message, history, image)
+        except Exception as e:
+            health.record_failure()
+            print(f"⚠️  {provider.name} failed: {str(e)}")
+            raise
+        health.record_success(time.perf_counter() - start)
+        return reply
+
+    def _hedged(self, provider, attempts, message, history, image):
+        """
+        Call `provider`; if it hasn't answered within the hedge delay, also call the next provider
+        in the route and return whichever succeeds first as (reply, provider name).
+        """
+        hedger = self.hedger
+        primary = hedger.executor.submit(self._call, provider, message, history, image)
+        try:
+            # A primary error propagates from here so the caller fails over as usual
+            return primary.result(timeout=hedger.delay(self.health[provider.name])), provider.name
+        except FutureTimeout:
+            pass
+
+        secondary = next(attempts, None) if hedger.allow() else None
+        if secondary is None:
+            return primary.result(), provider.name
+
+        hedge = hedger.executor.submit(self._call, secondary, message, history, image)
+        legs = {primary: provider, hedge: secondary}
+        pending = set(legs)
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    # A losing leg that is already running still records its latency when it finishes
+                    hedger.settled(future is hedge, pending)
+                    return future.result(), legs[future].name
+                error = future.exception()
+        hedger.settled(False, ())
+        raise error
+
+    def complete(self, message, history, image=None):
+        """(reply text, provider name); raises the last provider error when every attempt fails"""
+        last_error = None
+        attempts = self._attempts()
+        if self.hedger is not None:
+            # One request however many providers it fails over through
+            self.hedger.start()
+        for index, provider in enumerate(attempts):
+            try:
+                if self.hedger is not None:
+                    reply, served_by = self._hedged(provider, attempts, message, history, image)
+                else:
+                    reply, served_by = self._call(provider, message, history, image), provider.name
+            except Exception as e:
+                last_error = e
+                continue
+            with self._lock:
+                self.served[served_by] += 1
+                if index:
+                    self.failovers += 1
+            return reply, served_by
+        raise last_error or NoProviderAvailable('No AI provider is available right now')
+
+    def cache_identity(self):
+        """Model identity for response cache keys (any provider's answer is a valid answer)"""
+        return ','.join(
+            f"{provider.name}:{provider.model}" + (f":{prompts.load(provider.prompt).id}" if provider.prompt else '')
+            for provider in self.providers
+        )
+
+    def stats(self):
+        with self._lock:
+            served = dict(self.served)
+            failovers = self.failovers
+        return {
+            'strategy': self.strategy,
+            'failovers': failovers,
+            'hedging': self.hedger.stats() if self.hedger is not None else None,
+            'providers': {
+                provider.name: dict(self.health[provider.name].stats(),
+                                    model=provider.model, served=served[provider.name])
+                for provider in self.providers
+            }
+        }
+
+
+def create_gateway(names=None, strategy=None, hedge=GATEWAY_HEDGE):
+    """Gateway over the configured providers named in GATEWAY_PROVIDERS (in priority order)"""
+    names = names or [name.strip() for name in GATEWAY_PROVIDERS.split(',') if name.strip()]
+    unknown = [name for name in names if name not in PROVIDERS]
+    if unknown:
+        raise ValueError(f"Unknown provider(s) {', '.join(unknown)} (expected: {', '.join(PROVIDERS)})")
+
+    providers = [PROVIDERS[name]() for name in names]
+    # Skip providers without credentials, unless none have any (the server reports that on startup)
+    providers = [provider for provider in providers if provider.configured()] or providers
+    return Gateway(providers, strategy or GATEWAY_STRATEGY, hedger=Hedger() if hedge else None)
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Fit Fusion AI Coach - Batch meal scoring
+getMealSuggestions for many users at once, for jobs like the morning notifications. Pantries
+become a user x ingredient matrix and the catalog an ingredient x meal incidence matrix, so one
+matrix product per block of users gives every user's matched-ingredient count for every meal.
+Scores, weather/diet filters and the top k per meal slot are then whole-array operations.
+Results are the same meals, in the same order, as MealIndex.suggest(..., limit=k).
+"""
+
+import os
+
+import numpy as np
+
+from meal_recommender import SUGGESTION_GROUPS, normalize
+
+# Upper bound on user x meal cells scored at once; each cell costs ~12 bytes across the block's arrays
+MEAL_BATCH_CELLS = int(os.getenv('MEAL_BATCH_CELLS', 4_000_000))
+
+
+class Pantries:
+    """User pantries as ingredient ids in CSR form: user u has ids[offsets[u]:offsets[u + 1]]"""
+
+    __slots__ = ('ids', 'offsets')
+
+    def __init__(self, ids, offsets):
+        self.ids = np.asarray(ids, dtype=np.int32)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def sizes(self):
+        return np.diff(self.offsets)
+
+
+class BatchScorer:
+    """Vectorized scoring of many pantries against one MealIndex"""
+
+    def __init__(self, index):
+        self.index = index
+        meals = len(index)
+        ingredients = len(index.ingredient_names)
+        # Pantry items the catalog doesn't know map to an extra all-zero row: they still make
+        # the pantry non-empty, which matters for the score-0 rule
+        self.unknown = ingredients
+        # float32 counts are exact and keep the product on the BLAS path
+        self.incidence = np.zeros((ingredients + 1, meals), dtype=np.float32)
+        for ingredient_id, postings in enumerate(index.postings):
+            np.add.at(self.incidence[ingredient_id], np.frombuffer(postings, dtype=np.uint32), 1)
+        # A meal with no ingredients never matches; 1 keeps the score division defined
+        self.lengths = np.maximum(np.frombuffer(index.lengths, dtype=np.uint16), 1).astype(np.int32)
+        self.flags = np.frombuffer(index.flags, dtype=np.uint64)
+        self.slots = [
+            (group, np.flatnonzero(self.matching('tag', tag)))
+            for group, tag in SUGGESTION_GROUPS
+        ]
+
+    def matching(self, dimension, values):
+        """Boolean meal vector for a filter (all True for None), like MealIndex.mask"""
+        mask = self.index.mask(dimension, values)
+        if mask is None:
+            return np.ones(len(self.flags), dtype=bool)
+        return (self.flags & np.uint64(mask)) != 0
+
+    def encode(self, pantries):
+        """Pantries from ingredient name lists"""
+        ids = self.index.ingredient_ids
+        unknown = self.unknown
+        offsets = np.zeros(len(pantries) + 1, dtype=np.int64)
+        np.cumsum(np.fromiter(map(len, pantries), dtype=np.int64, count=len(pantries)), out=offsets[1:])
+        names = (normalize(name) for pantry in pantries for name in pantry)
+        return Pantries(np.fromiter((ids.get(name, unknown) for name in names), dtype=np.int32,
+                                    count=int(offsets[-1])), offsets)
+
+    def _codes(self, dimension, values, users):
+        """
+        Per-user row into a table of allowed-meal vectors, for a filter that's one value for
+        everyone or one value per user
+        """
+        if values is None or isinstance(values, str):
+            return np.zeros(users, dtype=np.int32), self.matching(dimension, values)[None, :]
+        distinct = {value: code for code, value in enumerate(dict.fromkeys(values))}
+        codes = np.fromiter(map(distinct.__getitem__, values), dtype=np.int32, count=users)
+        return codes, np.stack([self.matching(dimension, value) for value in distinct])
+
+    def pantry_matrix(self, pantries, users):
+        """Dense users x ingredients 0/1 matrix for an array of user numbers"""
+        starts = pantries.offsets[users]
+        sizes = pantries.offsets[users + 1] - starts
+        # Flat positions of every listed item, user by user
+        items = np.repeat(starts - (np.cumsum(sizes) - sizes), sizes) + np.arange(sizes.sum())
+        matrix = np.zeros((len(users), self.incidence.shape[0]), dtype=np.float32)
+        # Assignment, not addition: a pantry listing an item twice still has it once
+        matrix[np.repeat(np.arange(len(users)), sizes), pantries.ids[items]] = 1
+        return matrix
+
+    def top_k(self, pantries, weather, diet=None, k=10):
+        """
+        Best k meals per user and slot: {'breakfast': positions, ...}, each a users x k int32
+        array of catalog positions, best first, padded with -1. `weather` and `diet` are one
+        value for everyone or a sequence with one value per user.
+        """
+        if not isinstance(pantries, Pantries):
+            pantries = self.encode(pantries)
+        users = len(pantries)
+        meals = len(self.flags)
+        weather_codes, weather_allowed = self._codes('weather', weather, users)
+        diet_codes, diet_allowed = self._codes('diet', diet, users)
+        empty = pantries.sizes() == 0
+        results = {group: np.full((users, min(k, len(slot))), -1, dtype=np.int32) for group, slot in self.slots}
+
+        # Users sharing a weather and diet share the meals they can get, so each group of them
+        # is scored against only those meals' columns
+        combos = weather_codes.astype(np.int64) * len(diet_allowed) + diet_codes
+        order = np.argsort(combos, kind='stable')
+        combos, starts = np.unique(combos[order], return_index=True)
+        for combo, group_users in zip(combos, np.split(order, starts[1:])):
+            allowed = weather_allowed[combo // len(diet_allowed)] & diet_allowed[combo % len(diet_allowed)]
+            columns = []
+            for group, slot in self.slots:
+                positions = slot[allowed[slot]]
+                columns.append((group, positions, self.incidence[:, positions], self.lengths[positions]))
+
+            # Without a pantry the app lists every allowed meal, in catalog order
+            empty_users = group_users[empty[group_users]]
+            for group, positions, _, _ in columns:
+                width = min(results[group].shape[1], len(positions))
+                results[group][empty_users[:, None], np.arange(width)] = positions[:width]
+
+            scored = group_users[~empty[group_users]]
+            block = max(1, MEAL_BATCH_CELLS // max(meals, self.incidence.shape[0]))
+            for start in range(0, len(scored), block):
+                block_users = scored[start:start + block]
+                matrix = self.pantry_matrix(pantries, block_users)
+                for group, positions, incidence, lengths in columns:
+                    if len(positions):
+                        results[group][block_users] = self._best(matrix, positions, incidence, lengths,
+                                                                 results[group].shape[1])
+        return results
+
+    def _best(self, matrix, positions, incidence, lengths, width):
+        """
+        Top `width` of the meals at `positions` (with their incidence columns and lengths) for
+        each pantry row of `matrix`, as catalog positions padded with -1
+        """
+        meals = len(self.flags)
+        # round(matched / length * 100) with Math.round, in integers
+        score = (matrix @ incidence).astype(np.int32)
+        score *= 200
+        score += lengths
+        score //= 2 * lengths
+        # Sort key (100 - score) * meals + position: best score first, then catalog order like
+        # the app's stable sort. Score-0 meals (dropped by the app) land at 100 * meals and up.
+        keys = score
+        keys *= -meals
+        keys += 100 * meals + positions.astype(np.int32)
+        if width < len(positions):
+            keys = np.partition(keys, width - 1, axis=1)[:, :width]
+        keys.sort(axis=1)
+        best = np.full((len(keys), width), -1, dtype=np.int32)
+        kept = keys < 100 * meals
+        best[:, :keys.shape[1]][kept] = keys[kept] % meals
+        return best
+
+    def matches(self, pantry, positions):
+        """Matches for one user's row of a top_k result"""
+        pantry_ids = self.index.pantry_ids(pantry)
+        return [self.index.match(int(position), pantry_ids) for position in positions if position >= 0]
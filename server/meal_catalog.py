@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Fit Fusion AI Coach - Binary meal catalog
+Compiles mealsData.json into a compact columnar file that readers memory-map instead of parsing:
+  - every distinct string (names, ingredients, tags, image URLs...) stored once in a string table
+  - one fixed-width column per field: string ids, integers, or offsets + values for lists
+  - protein / calories / prepTime also parsed once into integer columns (grams, kcal, minutes)
+Columns are read in place through memoryviews, and a meal only becomes a dict when asked for.
+to_json() gives back exactly the JSON it was built from; documents whose field names don't fit a
+section name (MAX_SECTION_NAME) are refused at build time.
+
+Build:
+    python meal_catalog.py                                  # src/data/mealsData.json -> .mealbin
+    python meal_catalog.py --input meals.json --output meals.mealbin
+"""
+
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from meal_model import FIELDS, parse_quantity
+from meal_recommender import MEALS_DATA_PATH
+
+MEALS_CATALOG_PATH = os.getenv('MEALS_CATALOG_PATH', os.path.splitext(MEALS_DATA_PATH)[0] + '.mealbin')
+
+MAGIC = b'FFMC'
+VERSION = 1
+# magic, version, section count, meal count
+HEADER = struct.Struct('<4sHHI')
+# Longest section name in bytes: a field name plus '.offsets' / '.values' must fit
+MAX_SECTION_NAME = 32
+# name, array typecode, item count, byte offset
+SECTION = struct.Struct(f'<{MAX_SECTION_NAME}s1s7xQQ')
+ALIGNMENT = 8
+
+# Fields parsed into integer columns: field -> (column, unit); -1 where the text isn't spelled as
+# meal_model.NUMBER_FORMATS has it ('1 hr', '2.5g')
+PARSED_FIELDS = {
+    'protein': ('protein.grams', 'g'),
+    'calories': ('calories.kcal', 'kcal'),
+    'prepTime': ('prepTime.minutes', 'min'),
+}
+
+
+class CatalogFormatError(ValueError):
+    """File isn't a meal catalog this version can read"""
+
+
+def _kind(values):
+    """Column kind for a field's values: 'str', 'int' or 'list' (of strings)"""
+    kinds = set()
+    for value in values:
+        if isinstance(value, str):
+            kinds.add('str')
+        elif isinstance(value, int) and not isinstance(value, bool):
+            kinds.add('int')
+        elif isinstance(value, list) and all(isinstance(item, str) for item in value):
+            kinds.add('list')
+        else:
+            raise ValueError(f"Unsupported value {value!r}: fields must be strings, integers or string lists")
+    if len(kinds) != 1:
+        raise ValueError(f"Field mixes {', '.join(sorted(kinds))} values")
+    return kinds.pop()
+
+
+class _StringTable:
+    """Interned strings, numbered in first-seen order"""
+
+    def __init__(self):
+        self.ids = {}
+
+    def __getitem__(self, text):
+        string_id = self.ids.get(text)
+        if string_id is None:
+            string_id = self.ids[text] = len(self.ids)
+        return string_id
+
+    def sections(self):
+        data = bytearray()
+        offsets = array('I', [0])
+        for text in self.ids:
+            data += text.encode('utf-8', 'surrogatepass')
+            offsets.append(len(data))
+        return {'strings.offsets': offsets, 'strings.data': array('B', data)}
+
+
+def compile_catalog(data):
+    """Sections (name -> array) for a mealsData.json document"""
+    meals = data['meals']
+    strings = _StringTable()
+    fields = list(dict.fromkeys(field for meal in meals for field in meal))
+    # Each distinct key order once: which fields a meal has, and in what order
+    positions = {field: i for i, field in enumerate(fields)}
+    layouts = {}
+    layout_ids = array('I', (layouts.setdefault(tuple(map(positions.__getitem__, meal)), len(layouts))
+                             for meal in meals))
+    schema = {'fields': [], 'layouts': list(layouts), 'parsed': {}, 'lists': {}}
+    sections = {'layout': layout_ids}
+
+    for field in fields:
+        kind = _kind(meal[field] for meal in meals if field in meal)
+        schema['fields'].append([field, kind])
+        # Missing values still take a slot so row i is meal i
+        values = [meal.get(field) for meal in meals]
+        if kind == 'str':
+            sections[field] = array('I', (strings[value] if value is not None else 0 for value in values))
+        elif kind == 'int':
+            sections[field] = array('q', (value or 0 for value in values))
+        else:
+            offsets = array('I', [0])
+            items = array('I')
+            for value in values:
+                items.extend(strings[item] for item in value or ())
+                offsets.append(len(items))
+            sections[f'{field}.offsets'] = offsets
+            sections[f'{field}.values'] = items
+
+        if field in PARSED_FIELDS:
+            column, unit = PARSED_FIELDS[field]
+            parsed = (parse_quantity(FIELDS[field][1], value) for value in values)
+            sections[column] = array('i', (-1 if number is None else number for number in parsed))
+            schema['parsed'][field] = [column, unit]
+
+    # Other top-level lists of strings (commonIngredients)
+    for key, value in data.items():
+        if key != 'meals':
+            if _kind([value]) != 'list':
+                raise ValueError(f"Unsupported top-level field {key!r}")
+            schema['lists'][key] = f'{key}.values'
+            sections[f'{key}.values'] = array('I', (strings[item] for item in value))
+
+    sections.update(strings.sections())
+    sections['schema'] = array('B', json.dumps(schema, separators=(',', ':')).encode('utf-8'))
+    for name in sections:
+        # struct.pack would cut the name short and the reader could no longer find the section
+        if len(name.encode('utf-8')) > MAX_SECTION_NAME:
+            raise ValueError(f"Section name {name!r} is longer than {MAX_SECTION_NAME} bytes; "
+                             "shorten the field name")
+    return len(meals), sections
+
+
+def write_catalog(data, path):
+    """Compile `data` and write it to `path` atomically"""
+    count, sections = compile_catalog(data)
+    if sys.byteorder != 'little':
+        for values in sections.values():
+            values.byteswap()
+
+    offset = HEADER.size + SECTION.size * len(sections)
+    table = []
+    for name, values in sections.items():
+        offset += -offset % ALIGNMENT
+        table.append(SECTION.pack(name.encode('utf-8'), values.typecode.encode('ascii'), len(values), offset))
+        offset += len(values) * values.itemsize
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(sections), count))
+        f.write(b''.join(table))
+        for values in sections.values():
+            f.write(b'\0' * (-f.tell() % ALIGNMENT))
+            values.tofile(f)
+    os.replace(tmp_path, path)
+    return path
+
+
+class Catalog:
+    """
+    A memory-mapped .mealbin. Columns are memoryviews over the file, e.g.
+    catalog.column('calories.kcal')[i]; catalog.meal(i) builds the JSON dict for one meal.
+    """
+
+    def __init__(self, path=MEALS_CATALOG_PATH):
+        if sys.byteorder != 'little':
+            raise CatalogFormatError("Memory-mapped catalogs need a little-endian machine")
+        self.path = path
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size < HEADER.size:
+                raise CatalogFormatError(f"{path} is too short to be a meal catalog")
+            magic, version, section_count, self.count = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC or version != VERSION:
+                raise CatalogFormatError(f"{path} is not a version {VERSION} meal catalog")
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+
+        self._columns = {}
+        for i in range(section_count):
+            name, typecode, length, offset = SECTION.unpack_from(self._mmap, HEADER.size + i * SECTION.size)
+            typecode = typecode.decode('ascii')
+            end = offset + length * array(typecode).itemsize
+            self._columns[name.rstrip(b'\0').decode('utf-8')] = self._view[offset:end].cast(typecode)
+
+        schema = json.loads(bytes(self._columns['schema']))
+        self.fields = [tuple(field) for field in schema['fields']]
+        self._layouts = [[self.fields[i] for i in layout] for layout in schema['layouts']]
+        self.parsed = {field: tuple(column) for field, column in schema['parsed'].items()}
+        self._lists = schema['lists']
+        self._string_offsets = self._columns['strings.offsets']
+        self._string_data = self._columns['strings.data']
+        # Decoded lazily, each at most once
+        self._strings = [None] * (len(self._string_offsets) - 1)
+
+    def __len__(self):
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        for view in self._columns.values():
+            view.release()
+        self._columns.clear()
+        self._view.release()
+        self._mmap.close()
+
+    def column(self, name):
+        """A section as a memoryview: `field` for str/int fields (string ids for str),
+        `field.offsets` / `field.values` for lists, the parsed columns, `layout`"""
+        return self._columns[name]
+
+    def string(self, string_id):
+        text = self._strings[string_id]
+        if text is None:
+            offsets = self._string_offsets
+            text = self._strings[string_id] = str(
+                self._string_data[offsets[string_id]:offsets[string_id + 1]], 'utf-8', 'surrogatepass')
+        return text
+
+    def value(self, field, kind, i):
+        """One meal's value for a field, as it was in the JSON"""
+        if kind == 'list':
+            offsets = self._columns[f'{field}.offsets']
+            return [self.string(item) for item in self._columns[f'{field}.values'][offsets[i]:offsets[i + 1]]]
+        value = self._columns[field][i]
+        return self.string(value) if kind == 'str' else value
+
+    def meal(self, i):
+        """Meal i as the JSON dict"""
+        if not 0 <= i < self.count:
+            raise IndexError(i)
+        layout = self._layouts[self._columns['layout'][i]]
+        return {field: self.value(field, kind, i) for field, kind in layout}
+
+    def meals(self):
+        return (self.meal(i) for i in range(self.count))
+
+    def strings(self, key):
+        """A top-level string list such as commonIngredients"""
+        return [self.string(item) for item in self._columns[self._lists[key]]]
+
+    def to_json(self):
+        """The mealsData.json document this catalog was built from"""
+        return {'meals': list(self.meals()), **{key: self.strings(key) for key in self._lists}}
+
+
+def build(input_path=MEALS_DATA_PATH, output_path=MEALS_CATALOG_PATH):
+    with open(input_path, encoding='utf-8') as f:
+        data = json.load(f)
+    return write_catalog(data, output_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compile mealsData.json into a memory-mappable catalog')
+    parser.add_argument('--input', default=MEALS_DATA_PATH)
+    parser.add_argument('--output', default=MEALS_CATALOG_PATH)
+    args = parser.parse_args()
+
+    path = build(args.input, args.output)
+    with Catalog(path) as catalog:
+        meals = len(catalog)
+    print(f"✅ {meals} meals: {os.path.getsize(args.input):,} bytes JSON -> {os.path.getsize(path):,} bytes {path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Fit Fusion AI Coach - Meal model
+One typed record per meal instead of a JSON dict: slotted attributes, ingredient/tag/weather
+lists as tuples of interned strings, and protein / calories / prep time parsed once into whole
+grams, kcal and minutes. from_json() validates a mealsData.json entry - numbers must be spelled
+as in NUMBER_FORMATS - and to_json() gives it back exactly: key order, optional fields and
+unknown fields.
+"""
+
+import json
+import re
+import sys
+
+from meal_recommender import MEALS_DATA_PATH, normalize
+
+DIETS = ('veg', 'non-veg')
+
+_NUMBER = re.compile(r'\s*(\d+)')
+
+# JSON key -> (attribute, kind, required). Kinds: int, str, symbol (a str worth interning),
+# list (of symbols) and the number kinds of NUMBER_FORMATS
+FIELDS = {
+    'id': ('id', 'int', True),
+    'name': ('name', 'str', True),
+    'ingredients': ('ingredients', 'list', True),
+    'tags': ('tags', 'list', True),
+    'prepTime': ('prep_minutes', 'minutes', True),
+    'weatherCategories': ('weather_categories', 'list', True),
+    'image': ('image', 'symbol', True),
+    'description': ('description', 'str', True),
+    'type': ('type', 'symbol', True),
+    'protein': ('protein_g', 'grams', True),
+    'calories': ('calories_kcal', 'kcal', True),
+    'imageUrl': ('image_url', 'str', False),
+    'ageGroup': ('age_group', 'symbol', False),
+}
+
+# The only accepted spelling of each number kind in the JSON: '1 hr' or '2.5g' would parse to
+# the wrong whole number, so they are rejected rather than guessed at
+NUMBER_FORMATS = {'grams': '{}g', 'kcal': '{}', 'minutes': '{} min'}
+
+_TYPES = {'int': int, 'str': str, 'symbol': str, 'list': list}
+_TYPE_NAMES = {'int': 'an integer', 'str': 'a string', 'symbol': 'a string', 'list': 'a list of strings'}
+_MISSING = object()
+
+# Key orders seen so far, shared by every meal with that order
+_layouts = {}
+
+
+class MealFormatError(ValueError):
+    """A meal entry that doesn't fit the schema"""
+
+
+def parse_number(text):
+    """Leading whole number of '12g' / '350' / '10 min', or None"""
+    match = _NUMBER.match(text) if isinstance(text, str) else None
+    return int(match.group(1)) if match else None
+
+
+def parse_quantity(kind, text):
+    """Whole number of a NUMBER_FORMATS[kind] spelling ('12g', '350', '10 min'), else None"""
+    number = parse_number(text)
+    return number if number is not None and text == NUMBER_FORMATS[kind].format(number) else None
+
+
+def _layout(keys):
+    keys = tuple(keys)
+    return _layouts.setdefault(keys, keys)
+
+
+class Meal:
+    """A meal from mealsData.json, e.g. meal.calories_kcal < 400 and 'dinner' in meal.tags"""
+
+    __slots__ = tuple(attribute for attribute, _, _ in FIELDS.values()) + ('extra', '_layout')
+
+    def __init__(self, id, name, ingredients, tags, prep_minutes, weather_categories, image, description,
+                 type, protein_g, calories_kcal, image_url=None, age_group=None):
+        self.id = id
+        self.name = name
+        # sys.intern also rejects anything that isn't a str
+        self.ingredients = tuple(map(sys.intern, ingredients))
+        self.tags = tuple(map(sys.intern, tags))
+        self.prep_minutes = prep_minutes
+        self.weather_categories = tuple(map(sys.intern, weather_categories))
+        self.image = sys.intern(image)
+        self.description = description
+        self.type = sys.intern(type)
+        self.protein_g = protein_g
+        self.calories_kcal = calories_kcal
+        self.image_url = image_url
+        self.age_group = sys.intern(age_group) if age_group is not None else None
+        # JSON fields outside the schema, kept as they were
+        self.extra = None
+        # JSON key order
+        self._layout = _DEFAULT_LAYOUTS[image_url is not None, age_group is not None]
+
+    @classmethod
+    def from_json(cls, data):
+        """Validated Meal from one entry of mealsData.json's `meals`"""
+        if not isinstance(data, dict):
+            raise MealFormatError(f"Meal entry must be an object, not {type(data).__name__}")
+        values = {}
+        for key, (attribute, kind, required) in FIELDS.items():
+            value = data.get(key, _MISSING)
+            if value is _MISSING:
+                if required:
+                    raise MealFormatError(f"{_label(data)}: missing {key}")
+                continue
+            if kind in NUMBER_FORMATS:
+                number = parse_quantity(kind, value)
+                if number is None:
+                    raise MealFormatError(f"{_label(data)}: {key} must be spelled like "
+                                          f"{NUMBER_FORMATS[kind].format(12)!r}, not {value!r}")
+                value = number
+            elif not isinstance(value, _TYPES[kind]) or value is True or value is False:
+                raise MealFormatError(f"{_label(data)}: {key} must be {_TYPE_NAMES[kind]}")
+            values[attribute] = value
+        if normalize(values['type']) not in DIETS:
+            raise MealFormatError(f"{_label(data)}: type must be one of {', '.join(DIETS)}")
+
+        try:
+            meal = cls(**values)
+        except TypeError:
+            raise MealFormatError(f"{_label(data)}: ingredients, tags and weatherCategories must hold strings")
+        if len(data) != len(values):
+            meal.extra = {key: value for key, value in data.items() if key not in FIELDS}
+        keys = tuple(data)
+        if keys != meal._layout:
+            meal._layout = _layout(keys)
+        return meal
+
+    def to_json(self):
+        """The mealsData.json entry this meal came from"""
+        data = {}
+        for key in self._layout:
+            spec = FIELDS.get(key)
+            if spec is None:
+                data[key] = self.extra[key]
+                continue
+            attribute, kind, _ = spec
+            value = getattr(self, attribute)
+            if kind == 'list':
+                value = list(value)
+            elif kind in NUMBER_FORMATS:
+                value = NUMBER_FORMATS[kind].format(value)
+            data[key] = value
+        return data
+
+    @property
+    def diet(self):
+        """'veg' or 'non-veg'"""
+        return normalize(self.type)
+
+    def __repr__(self):
+        return f"Meal({self.id}, {self.name!r}, {self.calories_kcal} kcal, {self.protein_g}g protein)"
+
+
+# Key order of meals built in code, by whether they have an image URL / age group
+_DEFAULT_LAYOUTS = {
+    (has_url, has_age): _layout(key for key, (_, _, required) in FIELDS.items()
+                                if required or {'imageUrl': has_url, 'ageGroup': has_age}.get(key))
+    for has_url in (False, True) for has_age in (False, True)
+}
+
+
+def _label(data):
+    return f"Meal {data.get('id', data.get('name', '?'))}"
+
+
+def from_document(data):
+    """Meals of a mealsData.json document; ids must be unique"""
+    meals = [Meal.from_json(meal) for meal in data['meals']]
+    ids = set()
+    for meal in meals:
+        if meal.id in ids:
+            raise MealFormatError(f"Meal {meal.id}: duplicate id")
+        ids.add(meal.id)
+    return meals
+
+
+def load(path=MEALS_DATA_PATH):
+    with open(path, encoding='utf-8') as f:
+        return from_document(json.load(f))
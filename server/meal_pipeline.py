@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Fit Fusion AI Coach - Meal catalog build
+Builds src/data/mealsData.json from the declarative sources in src/data/meals/, in place of the
+scripts that each rewrote it. Every stage declares the files it reads:
+  generate     base/*.json               the catalog's meals ({"meals": [...]} per file)
+  baby         baby/*.json               baby / infant meals
+  images       images.json               imageUrl for meals without one: the first keyword
+                                         found in the name, else the default for a tag
+  validate                               Meal schema (meal_model), unique ids
+  ingredients  common-ingredients.json   the commonIngredients list
+
+Each source file is a shard, processed on its own and cached under a hash of its content, the
+transform stages' inputs and this code. The output is the cached shards joined in order, written
+atomically, byte-for-byte what json.dump(..., indent=2) would write. Rebuilding with nothing
+changed only stats the inputs; editing one shard reprocesses just that shard, so big catalogs
+should be split over several files.
+
+Usage:
+    python server/meal_pipeline.py              # build (a no-op when nothing changed)
+    python server/meal_pipeline.py --force      # ignore the cache
+    python server/meal_pipeline.py --mealbin    # also compile the binary catalog
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import time
+
+import meal_model
+from meal_recommender import MEALS_DATA_PATH
+
+DATA_DIR = os.path.dirname(MEALS_DATA_PATH)
+MEALS_SOURCES_DIR = os.getenv('MEALS_SOURCES_DIR', os.path.join(DATA_DIR, 'meals'))
+MEALS_BUILD_DIR = os.getenv('MEALS_BUILD_DIR', os.path.join(DATA_DIR, '.meals-build'))
+
+# Bumped when the cache layout changes
+STATE_VERSION = 1
+
+# Code whose behaviour ends up in cached shards
+CODE_FILES = (os.path.abspath(__file__), os.path.abspath(meal_model.__file__))
+
+
+class BuildError(Exception):
+    """Sources that can't be built into a catalog"""
+
+
+def attach_images(meal, rules):
+    """images stage: add imageUrl from the rules unless the meal has one"""
+    if 'imageUrl' in meal:
+        return meal
+    name = meal['name'].lower()
+    url = next((url for keyword, url in rules['keywords'].items() if keyword in name), None)
+    if url is None:
+        url = next((rules['defaults'][tag] for tag in meal['tags'] if tag in rules['defaults']), rules['fallback'])
+    return {**meal, 'imageUrl': url}
+
+
+def validate(meal, _config):
+    """validate stage: per-meal schema check (ids are checked across shards at assembly)"""
+    meal_model.Meal.from_json(meal)
+    return meal
+
+
+class Stage:
+    """
+    One build step. Sources contribute shards of meals, transforms and checks run on every meal
+    with their inputs' parsed JSON, fields add a top-level key to the document.
+    """
+
+    __slots__ = ('name', 'kind', 'inputs', 'run', 'key')
+
+    def __init__(self, name, kind, inputs=(), run=None, key=None):
+        self.name = name
+        self.kind = kind
+        self.inputs = inputs
+        self.run = run
+        self.key = key
+
+    def files(self, sources_dir):
+        return [path for pattern in self.inputs for path in sorted(glob.glob(os.path.join(sources_dir, pattern)))]
+
+
+STAGES = (
+    Stage('generate', 'source', ('base/*.json',)),
+    Stage('baby', 'source', ('baby/*.json',)),
+    Stage('images', 'transform', ('images.json',), run=attach_images),
+    Stage('validate', 'check', run=validate),
+    Stage('ingredients', 'field', ('common-ingredients.json',), key='commonIngredients'),
+)
+
+
+def digest(*parts):
+    return hashlib.sha256('\0'.join(parts).encode('utf-8')).hexdigest()
+
+
+def _indented(value, level):
+    """json.dumps(value, indent=2) as it appears `level` spaces deep in the document"""
+    return json.dumps(value, indent=2).replace('\n', '\n' + ' ' * level)
+
+
+def _write_atomic(path, write):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        write(f)
+    os.replace(tmp_path, path)
+
+
+class _Files:
+    """Content hashes of input files; a file is only re-read when its size or mtime changed"""
+
+    def __init__(self, known):
+        self.known = known
+        self.seen = {}
+
+    def hash(self, path):
+        stat = os.stat(path)
+        record = self.known.get(path)
+        if record is None or record[:2] != [stat.st_size, stat.st_mtime_ns]:
+            content = hashlib.sha256()
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                    content.update(chunk)
+            record = [stat.st_size, stat.st_mtime_ns, content.hexdigest()]
+        self.seen[path] = record
+        return record[2]
+
+
+def _load_json(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        raise BuildError(f"{path}: {e}")
+
+
+def _process_shard(path, steps):
+    """Shard text (its meals as they sit in the document, comma separated) and the meal ids"""
+    document = _load_json(path)
+    if not isinstance(document, dict) or not isinstance(document.get('meals'), list):
+        raise BuildError(f"{path}: expected {{\"meals\": [...]}}")
+    fragments = []
+    ids = []
+    for meal in document['meals']:
+        try:
+            for run, config in steps:
+                meal = run(meal, config)
+        except (meal_model.MealFormatError, KeyError, TypeError, AttributeError) as e:
+            raise BuildError(f"{path}: {e}")
+        ids.append(meal['id'])
+        fragments.append('    ' + _indented(meal, 4))
+    return ',\n'.join(fragments), ids
+
+
+def build(sources_dir=MEALS_SOURCES_DIR, output=MEALS_DATA_PATH, build_dir=MEALS_BUILD_DIR, force=False):
+    """
+    Bring `output` up to date with the sources. Returns a summary: whether the output was
+    written, and which shards were processed / reused.
+    """
+    state_path = os.path.join(build_dir, 'state.json')
+    state = {}
+    if not force and os.path.exists(state_path):
+        state = _load_json(state_path)
+        if state.get('version') != STATE_VERSION:
+            state = {}
+    files = _Files(state.get('files', {}))
+
+    code = digest(*map(files.hash, CODE_FILES))
+    steps_key = digest(code, *(f"{stage.name}:{files.hash(path)}" for stage in STAGES
+                               if stage.kind in ('transform', 'check') for path in stage.files(sources_dir)))
+    shards = []
+    for stage in STAGES:
+        if stage.kind == 'source':
+            for path in stage.files(sources_dir):
+                name = os.path.relpath(path, sources_dir)
+                shards.append((name, path, digest(steps_key, stage.name, name, files.hash(path))))
+    fields = []
+    for stage in STAGES:
+        if stage.kind == 'field':
+            paths = stage.files(sources_dir)
+            if len(paths) != 1:
+                raise BuildError(f"{stage.name}: expected one {', '.join(stage.inputs)} in {sources_dir}")
+            fields.append((stage.key, paths[0], files.hash(paths[0])))
+
+    output_key = digest(code, *(key for _, _, key in shards), *(f"{key}:{value}" for key, _, value in fields))
+    summary = {'written': False, 'processed': [], 'reused': [], 'meals': 0}
+    recorded = state.get('output', {})
+    if recorded.get('key') == output_key and os.path.exists(output):
+        stat = os.stat(output)
+        if recorded.get('stat') == [stat.st_size, stat.st_mtime_ns]:
+            summary['reused'] = [name for name, _, _ in shards]
+            summary['meals'] = recorded.get('meals', 0)
+            return summary
+
+    parts_dir = os.path.join(build_dir, 'parts')
+    os.makedirs(parts_dir, exist_ok=True)
+    steps = None
+    seen_ids = {}
+    for name, path, key in shards:
+        part_path = os.path.join(parts_dir, f"{key}.part")
+        ids_path = os.path.join(parts_dir, f"{key}.ids")
+        if not force and os.path.exists(part_path) and os.path.exists(ids_path):
+            ids = _load_json(ids_path)
+            summary['reused'].append(name)
+        else:
+            if steps is None:
+                steps = [(stage.run, _load_json(stage.files(sources_dir)[0]) if stage.inputs else None)
+                         for stage in STAGES if stage.kind in ('transform', 'check')]
+            text, ids = _process_shard(path, steps)
+            _write_atomic(part_path, lambda f: f.write(text))
+            _write_atomic(ids_path, lambda f: json.dump(ids, f))
+            summary['processed'].append(name)
+        for meal_id in ids:
+            if meal_id in seen_ids:
+                raise BuildError(f"Meal {meal_id}: duplicate id in {seen_ids[meal_id]} and {name}")
+            seen_ids[meal_id] = name
+    summary['meals'] = len(seen_ids)
+
+    def write(f):
+        f.write('{\n  "meals": [')
+        first = True
+        for _, _, key in shards:
+            with open(os.path.join(parts_dir, f"{key}.part"), encoding='utf-8') as part:
+                text = part.read()
+            if text:
+                f.write('\n' if first else ',\n')
+                f.write(text)
+                first = False
+        f.write(']' if first else '\n  ]')
+        for key, path, _ in fields:
+            f.write(f',\n  {json.dumps(key)}: {_indented(_load_json(path), 2)}')
+        f.write('\n}')
+
+    _write_atomic(output, write)
+    summary['written'] = True
+
+    # Drop cached shards nothing refers to any more
+    keep = {key for _, _, key in shards}
+    for entry in os.listdir(parts_dir):
+        if os.path.splitext(entry)[0] not in keep:
+            os.remove(os.path.join(parts_dir, entry))
+
+    stat = os.stat(output)
+    state = {
+        'version': STATE_VERSION,
+        'files': files.seen,
+        'output': {'key': output_key, 'stat': [stat.st_size, stat.st_mtime_ns], 'meals': summary['meals']},
+    }
+    _write_atomic(state_path, lambda f: json.dump(state, f))
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build mealsData.json from src/data/meals')
+    parser.add_argument('--sources', default=MEALS_SOURCES_DIR)
+    parser.add_argument('--output', default=MEALS_DATA_PATH)
+    parser.add_argument('--build-dir', default=MEALS_BUILD_DIR)
+    parser.add_argument('--force', action='store_true', help='rebuild every shard')
+    parser.add_argument('--mealbin', action='store_true', help='also compile the binary catalog (meal_catalog.py)')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    try:
+        summary = build(args.sources, args.output, args.build_dir, force=args.force)
+    except BuildError as e:
+        raise SystemExit(f"❌ {e}")
+    elapsed = (time.perf_counter() - start) * 1000
+
+    if summary['written']:
+        print(f"✅ Built {args.output}: {summary['meals']} meals in {elapsed:.0f} ms"
+              f" ({len(summary['processed'])} shards processed, {len(summary['reused'])} reused)")
+    else:
+        print(f"✅ {args.output} is up to date ({summary['meals']} meals, checked in {elapsed:.0f} ms)")
+
+    if args.mealbin:
+        import meal_catalog
+        if summary['written'] or not os.path.exists(meal_catalog.MEALS_CATALOG_PATH):
+            print(f"✅ Compiled {meal_catalog.build(args.output)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Fit Fusion AI Coach - Meal recommendations
+Python port of src/services/mealRecommendationService.ts that indexes the catalog once instead
+of scanning every meal's ingredient list for every query:
+  - an inverted index from ingredient to the meals that use it, so a query only touches meals
+    sharing at least one pantry item
+  - a bitmask per meal over its tags, weather categories and diet type, so filters are an AND
+Scores, ordering and the missing/available lists match the TypeScript service.
+"""
+
+import heapq
+import json
+import os
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from functools import lru_cache
+from itertools import compress, repeat
+from operator import add, and_, mul
+
+MEALS_DATA_PATH = os.getenv(
+    'MEALS_DATA_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'data', 'mealsData.json')
+)
+
+# Result groups of suggest(), keyed like MealSuggestions in the app, with the tag each one holds
+SUGGESTION_GROUPS = (
+    ('breakfast', 'breakfast'),
+    ('lunch', 'lunch'),
+    ('dinner', 'dinner'),
+    ('snacks', 'snack'),
+    ('baby', 'baby'),
+)
+
+# Filter dimensions: query keyword -> meal field
+DIMENSIONS = (('tag', 'tags'), ('weather', 'weatherCategories'), ('diet', 'type'))
+
+# Per-meal flags live in an array('Q'), so all dimensions together get 64 bits
+MAX_FLAGS = 64
+
+# Distinct tag/weather/diet combinations whose matching meals are kept as sets
+MAX_CACHED_FILTERS = 256
+
+
+def normalize(value):
+    """Lookup form of an ingredient, tag, weather category or diet"""
+    return value.strip().lower()
+
+
+def match_score(matched, total):
+    """round(matched / total * 100) with JavaScript's Math.round (halves round up)"""
+    return (200 * matched + total) // (2 * total) if total else 0
+
+
+class Match:
+    """One recommended meal with its score and the pantry items it uses / still needs"""
+
+    __slots__ = ('meal', 'score', 'available', 'missing')
+
+    def __init__(self, meal, score, available, missing):
+        self.meal = meal
+        self.score = score
+        self.available = available
+        self.missing = missing
+
+    def to_dict(self):
+        """The meal as the app's Meal interface, with matchScore / missing / available filled in"""
+        return {
+            **self.meal,
+            'matchScore': self.score,
+            'missingIngredients': self.missing,
+            'availableIngredients': self.available
+        }
+
+
+class MealIndex:
+    """Read-only index over a meal catalog (the `meals` list of mealsData.json)"""
+
+    def __init__(self, meals):
+        self.meals = list(meals)
+        # ingredient name <-> dense id
+        self.ingredient_ids = {}
+        self.ingredient_names = []
+        # meal position -> ingredient ids in recipe order
+        self.meal_ingredients = []
+        # ingredient id -> meal positions (one entry per use, ascending)
+        self.postings = []
+        # dimension -> {value: bit}; a meal's flags OR together the bits of all its values
+        self.bits = {dimension: {} for dimension, _ in DIMENSIONS}
+        self.flags = array('Q')
+        # meal position -> recipe length
+        self.lengths = array('H')
+        # filter masks -> frozenset of the positions passing them
+        self._allowed = {}
+
+        next_bit = 0
+        for position, meal in enumerate(self.meals):
+            ingredient_ids = []
+            for name in meal.get('ingredients', ()):
+                name = normalize(name)
+                ingredient_id = self.ingredient_ids.get(name)
+                if ingredient_id is None:
+                    ingredient_id = self.ingredient_ids[name] = len(self.ingredient_names)
+                    self.ingredient_names.append(name)
+                    self.postings.append(array('I'))
+                self.postings[ingredient_id].append(position)
+                ingredient_ids.append(ingredient_id)
+            self.meal_ingredients.append(tuple(ingredient_ids))
+            self.lengths.append(len(ingredient_ids))
+
+            flags = 0
+            for dimension, field in DIMENSIONS:
+                values = meal.get(field) or ()
+                bits = self.bits[dimension]
+                for value in (values,) if isinstance(values, str) else values:
+                    value = normalize(value)
+                    bit = bits.get(value)
+                    if bit is None:
+                        if next_bit == MAX_FLAGS:
+                            raise ValueError(f"More than {MAX_FLAGS} distinct tags, weather categories and diets")
+                        bit = bits[value] = 1 << next_bit
+                        next_bit += 1
+                    flags |= bit
+            self.flags.append(flags)
+
+        # 100 - score for every (matched, recipe length) pair, at matched * stride + length
+        self.stride = max(self.lengths, default=0) + 1
+        self.penalties = [100 - match_score(matched, total)
+                          for matched in range(self.stride) for total in range(self.stride)]
+
+    @classmethod
+    def from_file(cls, path=MEALS_DATA_PATH):
+        with open(path, encoding='utf-8') as f:
+            return cls(json.load(f)['meals'])
+
+    def __len__(self):
+        return len(self.meals)
+
+    def mask(self, dimension, values):
+        """Bits for any of `values` (a string or several) in one dimension; None means no filter"""
+        if values is None:
+            return None
+        if isinstance(values, str):
+            values = (values,)
+        bits = self.bits[dimension]
+        mask = 0
+        for value in values:
+            mask |= bits.get(normalize(value), 0)
+        return mask
+
+    def pantry_ids(self, pantry):
+        """Ingredient ids of the pantry items the catalog knows"""
+        ids = set()
+        for name in pantry:
+            ingredient_id = self.ingredient_ids.get(normalize(name))
+            if ingredient_id is not None:
+                ids.add(ingredient_id)
+        return ids
+
+    def _masks(self, tag, weather, diet):
+        """Masks a meal must intersect, or None when a filter value is unknown (nothing can match)"""
+        masks = []
+        for dimension, values in (('tag', tag), ('weather', weather), ('diet', diet)):
+            mask = self.mask(dimension, values)
+            if mask == 0:
+                return None
+            if mask is not None:
+                masks.append(mask)
+        return masks
+
+    def allowed(self, masks):
+        """Positions of the meals passing every mask, cached per filter combination"""
+        key = tuple(masks)
+        positions = self._allowed.get(key)
+        if positions is None:
+            flags = self.flags
+            positions = range(len(self.meals))
+            for mask in masks:
+                positions = list(compress(positions, map(and_, map(flags.__getitem__, positions), repeat(mask))))
+            if len(self._allowed) >= MAX_CACHED_FILTERS:
+                self._allowed.clear()
+            positions = self._allowed[key] = frozenset(positions)
+        return positions
+
+    def counts(self, pantry_ids, allowed=None):
+        """
+        Meal position -> how many of the pantry's ingredients it uses, for every meal using any
+        (and in `allowed`, when given)
+        """
+        counts = Counter()
+        for ingredient_id in pantry_ids:
+            postings = self.postings[ingredient_id]
+            # A set lookup is cheaper than counting a meal the filters drop anyway
+            counts.update(postings if allowed is None else filter(allowed.__contains__, postings))
+        return counts
+
+    def _filtered(self, masks, limit):
+        """Positions passing the masks in catalog order (the no-pantry listing)"""
+        flags = self.flags
+        positions = range(len(self.meals))
+        for mask in masks:
+            positions = list(compress(positions, map(and_, map(flags.__getitem__, positions), repeat(mask))))
+        return list(positions[:limit])
+
+    def _top(self, counts, masks, limit):
+        """Positions of the best scoring meals among `counts` that pass the masks"""
+        # Every step is a C-level set operation or map over the candidates: at 100k meals a
+        # common pantry item touches tens of thousands of them
+        positions = list(counts.keys() & self.allowed(masks) if masks else counts)
+
+        # 100 - score, looked up by matched * stride + recipe length
+        penalties = map(self.penalties.__getitem__, map(
+            add,
+            map(mul, map(counts.__getitem__, positions), repeat(self.stride)),
+            map(self.lengths.__getitem__, positions)
+        ))
+        # One int per meal sorts by score, then catalog order like the app's stable sort
+        size = len(self.meals)
+        keys = map(add, map(mul, penalties, repeat(size)), positions)
+        best = heapq.nsmallest(limit, keys) if limit is not None else sorted(keys)
+        # The app drops meals whose rounded score is 0; they sort last
+        del best[bisect_left(best, 100 * size):]
+        return [key % size for key in best]
+
+    def ranked(self, pantry=(), tag=None, weather=None, diet=None, limit=None):
+        """
+        Meal positions best first. With a pantry only meals using at least one of its items are
+        returned; without one every meal passing the filters is, in catalog order.
+        """
+        masks = self._masks(tag, weather, diet)
+        if masks is None:
+            return []
+        if not pantry:
+            return self._filtered(masks, limit)
+        counts = self.counts(self.pantry_ids(pantry), self.allowed(masks) if masks else None)
+        return self._top(counts, (), limit)
+
+    def match(self, position, pantry_ids):
+        """Match for one meal given the pantry's ingredient ids"""
+        names = self.ingredient_names
+        ingredient_ids = self.meal_ingredients[position]
+        available = [names[i] for i in ingredient_ids if i in pantry_ids]
+        missing = [names[i] for i in ingredient_ids if i not in pantry_ids]
+        return Match(self.meals[position], match_score(len(available), len(ingredient_ids)), available, missing)
+
+    def recommend(self, pantry=(), tag=None, weather=None, diet=None, limit=None):
+        """
+        Ranked Matches for a query such as
+        recommend(['egg', 'bread', ...], tag='breakfast', weather='rainy', diet='veg', limit=10)
+        """
+        pantry_ids = self.pantry_ids(pantry)
+        return [self.match(position, pantry_ids)
+                for position in self.ranked(pantry, tag, weather, diet, limit)]
+
+    def suggest(self, weather, pantry=(), diet=None, limit=None):
+        """getMealSuggestions: {breakfast, lunch, dinner, snacks, baby} -> Matches for the weather"""
+        pantry_ids = self.pantry_ids(pantry)
+        masks = self._masks(None, weather, diet)
+        # Counted once for the weather and diet, ranked per group
+        if masks is not None and pantry:
+            counts = self.counts(pantry_ids, self.allowed(masks) if masks else None)
+        groups = {}
+        for group, tag in SUGGESTION_GROUPS:
+            tag_masks = self._masks(tag, None, None)
+            if masks is None or tag_masks is None:
+                positions = []
+            elif not pantry:
+                positions = self._filtered(masks + tag_masks, limit)
+            else:
+                positions = self._top(counts, tag_masks, limit)
+            groups[group] = [self.match(position, pantry_ids) for position in positions]
+        return groups
+
+    def stats(self):
+        return {
+            'meals': len(self.meals),
+            'ingredients': len(self.ingredient_names),
+            'postings': sum(len(postings) for postings in self.postings),
+            'tags': sorted(self.bits['tag']),
+            'weatherCategories': sorted(self.bits['weather']),
+            'diets': sorted(self.bits['diet'])
+        }
+
+
+@lru_cache(maxsize=None)
+def load(path=MEALS_DATA_PATH):
+    """The catalog index for a meals JSON file, built once per process"""
+    return MealIndex.from_file(path)
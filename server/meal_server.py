@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Fit Fusion AI Coach - Meal recommendation server
+Serves meal_recommender over HTTP: the same suggestions the app computes on-device in
+mealRecommendationService.ts, from a catalog indexed once at startup.
+"""
+
+from flask import Flask, request, jsonify
+from flask_cors import CORS
+import os
+from dotenv import load_dotenv
+
+import fast_json
+import meal_recommender
+import metrics
+
+# Load environment variables
+load_dotenv()
+
+# Initialize Flask app
+app = Flask(__name__)
+CORS(app)  # Enable CORS for frontend
+
+# jsonify / get_json through orjson when available
+fast_json.install(app)
+
+# Request counts and latency at /metrics
+metrics.install(app)
+
+# Catalog from MEALS_DATA_PATH, indexed once per process
+meals = meal_recommender.load()
+
+# Upper bound on meals returned per list
+MEALS_MAX_RESULTS = int(os.getenv('MEALS_MAX_RESULTS', 500))
+
+
+@app.route('/api/health', methods=['GET'])
+def health_check():
+    """Health check endpoint"""
+    return jsonify({
+        'status': 'ok',
+        'message': 'Meal recommendation server is running',
+        'version': '1.0.0',
+        'catalog': meals.stats()
+    })
+
+
+def read_query():
+    """Request body with validated ingredient list and result limit"""
+    data = request.get_json(silent=True) or {}
+    ingredients = data.get('ingredients') or []
+    if not isinstance(ingredients, list) or not all(isinstance(item, str) for item in ingredients):
+        raise ValueError('ingredients must be a list of strings')
+    limit = data.get('limit')
+    if limit is not None and (not isinstance(limit, int) or limit < 1):
+        raise ValueError('limit must be a positive integer')
+    data['ingredients'] = ingredients
+    data['limit'] = min(limit or MEALS_MAX_RESULTS, MEALS_MAX_RESULTS)
+    return data
+
+
+def weather_category(data):
+    """`weather` may be the category itself or the app's WeatherData object"""
+    weather = data.get('weather')
+    if isinstance(weather, dict):
+        weather = weather.get('category')
+    return weather
+
+
+@app.route('/api/meals/suggestions', methods=['POST'])
+def meal_suggestions():
+    """getMealSuggestions: meals for the weather grouped by breakfast/lunch/dinner/snacks/baby"""
+    try:
+        data = read_query()
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    weather = weather_category(data)
+    if not weather:
+        return jsonify({'success': False, 'error': 'weather is required'}), 400
+
+    with metrics.stage('recommend'):
+        groups = meals.suggest(weather, data['ingredients'], diet=data.get('diet'), limit=data['limit'])
+    with metrics.stage('serialize'):
+        return jsonify({
+            'success': True,
+            'data': {group: [match.to_dict() for match in matches] for group, matches in groups.items()}
+        })
+
+
+@app.route('/api/meals/recommend', methods=['POST'])
+def recommend():
+    """One ranked list, optionally filtered by tag, weather and diet"""
+    try:
+        data = read_query()
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+    with metrics.stage('recommend'):
+        matches = meals.recommend(data['ingredients'], tag=data.get('tag'), weather=weather_category(data),
+                                  diet=data.get('diet'), limit=data['limit'])
+    with metrics.stage('serialize'):
+        return jsonify({
+            'success': True,
+            'data': [match.to_dict() for match in matches]
+        })
+
+
+if __name__ == '__main__':
+    port = int(os.getenv('PORT', 5003))
+
+    print("=" * 60)
+    print("🥗 Fit Fusion - Meal Recommendation Server")
+    print("=" * 60)
+    print(f"✅ Catalog: {len(meals)} meals, {len(meals.ingredient_names)} ingredients")
+    print(f"📡 Server starting on http://localhost:{port}")
+    print(f"📡 Suggestions: http://localhost:{port}/api/meals/suggestions")
+    print(f"📡 Recommend: http://localhost:{port}/api/meals/recommend")
+    print(f"✅ Health check: http://localhost:{port}/api/health")
+    print("=" * 60)
+
+    print("💡 Development server - for production use: python serve.py --backend meals")
+
+    # Run Flask app (debugger/reloader only when FLASK_DEBUG=1)
+    app.run(host='0.0.0.0', port=port, debug=os.getenv('FLASK_DEBUG') == '1')
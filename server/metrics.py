@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Fit Fusion AI Coach - Metrics
+Counters and latency histograms for the chat path, exported at /metrics in the Prometheus text
+format. Values are per process: under gunicorn each worker keeps its own, so scrape every worker
+(or run one worker per container).
+"""
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+
+from flask import Response, g, request
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Seconds; spans in-process stages (sub-millisecond) through upstream calls (tens of seconds)
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=None):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic count per label combination"""
+
+    kind = 'counter'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            return self._values.get(key, 0)
+
+    def render(self):
+        with self._lock:
+            values = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+                for key, value in values]
+
+
+class Gauge:
+    """Current value per label combination"""
+
+    kind = 'gauge'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def set(self, value, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def value(self, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            return self._values.get(key, 0)
+
+    def render(self):
+        with self._lock:
+            values = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+                for key, value in values]
+
+
+class Histogram:
+    """Cumulative-bucket histogram per label combination"""
+
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts (+Inf last), sum, count]
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of a with-block (also when it raises)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def render(self):
+        with self._lock:
+            series = sorted((key, (list(counts), total, count)) for key, (counts, total, count)
+                            in self._series.items())
+        lines = []
+        for key, (counts, total, count) in series:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class Registry:
+    """Metrics exported together"""
+
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+REQUESTS = REGISTRY.register(Counter(
+    'coach_requests_total', 'HTTP requests by endpoint and status code', ('endpoint', 'status')))
+ERRORS = REGISTRY.register(Counter(
+    'coach_errors_total', 'Failed chat requests by endpoint and error class', ('endpoint', 'error')))
+REQUEST_SECONDS = REGISTRY.register(Histogram(
+    'coach_request_duration_seconds', 'Handler time by endpoint (a streamed body is sent after this)',
+    ('endpoint',)))
+STAGE_SECONDS = REGISTRY.register(Histogram(
+    'coach_stage_duration_seconds',
+    'Time per chat stage (parse, prompt_build, image_decode, upstream_ttfb, upstream_total, serialize)',
+    ('stage', 'provider')))
+UPSTREAM_TOKENS = REGISTRY.register(Counter(
+    'coach_upstream_tokens_total',
+    'Tokens reported by the upstream model (kind=prompt includes the cached_prompt tokens)',
+    ('provider', 'kind')))
+JOB_QUEUE_DEPTH = REGISTRY.register(Gauge(
+    'coach_job_queue_depth', 'Background jobs waiting for a worker'))
+JOBS_RUNNING = REGISTRY.register(Gauge(
+    'coach_jobs_running', 'Background jobs being generated'))
+JOBS = REGISTRY.register(Counter(
+    'coach_jobs_total', 'Background jobs by outcome (rejected, done, failed)', ('status',)))
+JOB_WAIT_SECONDS = REGISTRY.register(Histogram(
+    'coach_job_wait_seconds', 'Time a background job waited in the queue before a worker took it'))
+JOB_RUN_SECONDS = REGISTRY.register(Histogram(
+    'coach_job_run_seconds', 'Time a worker spent generating a background job'))
+
+
+def stage(name, provider=''):
+    """Time one stage of the chat path: `with metrics.stage('parse'): ...`"""
+    return STAGE_SECONDS.time(stage=name, provider=provider)
+
+
+def record_usage(provider, prompt_tokens, completion_tokens, cached_prompt_tokens=None):
+    """Count upstream token usage (missing counts are skipped)"""
+    if prompt_tokens:
+        UPSTREAM_TOKENS.inc(prompt_tokens, provider=provider, kind='prompt')
+    if cached_prompt_tokens:
+        UPSTREAM_TOKENS.inc(cached_prompt_tokens, provider=provider, kind='cached_prompt')
+    if completion_tokens:
+        UPSTREAM_TOKENS.inc(completion_tokens, provider=provider, kind='completion')
+
+
+def record_error(error):
+    """Count a failed chat request by exception class"""
+    ERRORS.inc(endpoint=request.endpoint or 'unknown', error=type(error).__name__)
+
+
+def install(app, registry=REGISTRY):
+    """Add /metrics and per-request counts/latency to a Flask app"""
+
+    @app.before_request
+    def start_timer():
+        g.metrics_started = time.perf_counter()
+
+    @app.after_request
+    def record_request(response):
+        started = g.pop('metrics_started', None)
+        endpoint = request.endpoint or 'unknown'
+        if endpoint != 'metrics_endpoint':
+            REQUESTS.inc(endpoint=endpoint, status=response.status_code)
+            if started is not None:
+                REQUEST_SECONDS.observe(time.perf_counter() - started, endpoint=endpoint)
+        return response
+
+    @app.route('/metrics', methods=['GET'])
+    def metrics_endpoint():
+        """Prometheus scrape endpoint"""
+        return Response(registry.render(), content_type=CONTENT_TYPE)
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Fit Fusion AI Coach - Model registry
+Builds configured model objects once per (model name, config) and shares them across requests
+"""
+
+import copy
+import threading
+
+
+class ModelRegistry:
+    """
+    Thread-safe cache of model instances.
+    `factory(model_name, **options)` is only called the first time a configuration is seen.
+    """
+
+    def __init__(self, factory):
+        self.factory = factory
+        # model name -> [(options, model)]; a handful of configs per model, so a
+        # dict-equality scan is cheaper than hashing nested configs on every request
+        self._models = {}
+        self._lock = threading.Lock()
+        self.builds = 0
+
+    def _find(self, model_name, options):
+        for known_options, model in self._models.get(model_name, ()):
+            if known_options == options:
+                return model
+        return None
+
+    def get(self, model_name, **options):
+        model = self._find(model_name, options)
+        if model is not None:
+            return model
+
+        with self._lock:
+            # Another thread may have built it while we waited for the lock
+            model = self._find(model_name, options)
+            if model is None:
+                model = self.factory(model_name, **options)
+                entries = list(self._models.get(model_name, ()))
+                entries.append((copy.deepcopy(options), model))
+                # Swap in a new list so lock-free readers never see a partial update
+                self._models[model_name] = entries
+                self.builds += 1
+            return model
+
+    def clear(self):
+        with self._lock:
+            self._models = {}
+
+    def stats(self):
+        return {
+            'models': sum(len(entries) for entries in self._models.values()),
+            'builds': self.builds
+        }
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Fit Fusion AI Coach - Streaming helpers
+Async OpenAI streaming client that relays tokens as server-sent events
+"""
+
+import asyncio
+import os
+import queue
+import threading
+import time
+
+import aiohttp
+from aiohttp import web
+
+import fast_json
+import metrics
+
+# Upstream connection limits for the shared async session
+STREAM_MAX_CONNECTIONS = int(os.getenv('STREAM_MAX_CONNECTIONS', 500))
+STREAM_TIMEOUT = float(os.getenv('STREAM_TIMEOUT', 60))
+
+SSE_HEADERS = {
+    'Content-Type': 'text/event-stream',
+    'Cache-Control': 'no-cache',
+    'X-Accel-Buffering': 'no'
+}
+
+# Sentinel pushed onto the bridge queue once the upstream stream ends
+_END = object()
+
+
+def format_sse(data, event=None):
+    """Format a JSON-serializable payload as a server-sent event frame"""
+    frame = f"data: {fast_json.dumps(data)}\n\n"
+    if event:
+        frame = f"event: {event}\n{frame}"
+    return frame
+
+
+def new_session():
+    """Create an aiohttp session sized for many concurrent generations"""
+    connector = aiohttp.TCPConnector(limit=STREAM_MAX_CONNECTIONS, keepalive_timeout=30)
+    timeout = aiohttp.ClientTimeout(total=None, sock_connect=10, sock_read=STREAM_TIMEOUT)
+    return aiohttp.ClientSession(connector=connector, timeout=timeout, json_serialize=fast_json.dumps)
+
+
+async def iter_completion_tokens(session, url, headers, payload):
+    """Yield content deltas from an OpenAI chat completions stream"""
+    started = time.perf_counter()
+    first_byte = False
+    async with session.post(url, headers=headers, json=payload) as response:
+        if response.status >= 400:
+            body = await response.text()
+            raise RuntimeError(f"Upstream error {response.status}: {body[:200]}")
+
+        # The body is a sequence of "data: {...}" lines terminated by "data: [DONE]"
+        async for raw_line in response.content:
+            if not first_byte:
+                first_byte = True
+                metrics.STAGE_SECONDS.observe(time.perf_counter() - started, stage='upstream_ttfb', provider='openai')
+            line = raw_line.decode('utf-8').strip()
+            if not line.startswith('data:'):
+                continue
+            chunk = line[5:].strip()
+            if chunk == '[DONE]':
+                break
+
+            data = fast_json.loads(chunk)
+            usage = data.get('usage')
+            if usage:
+                cached = (usage.get('prompt_tokens_details') or {}).get('cached_tokens')
+                metrics.record_usage('openai', usage.get('prompt_tokens'), usage.get('completion_tokens'), cached)
+            choices = data.get('choices') or []
+            if not choices:
+                continue
+            token = (choices[0].get('delta') or {}).get('content')
+            if token:
+                yield token
+    metrics.STAGE_SECONDS.observe(time.perf_counter() - started, stage='upstream_total', provider='openai')
+
+
+async def iter_sse(session, url, headers, payload, suggestions):
+    """Yield SSE frames for one generation: tokens, then a final done/error event"""
+    try:
+        async for token in iter_completion_tokens(session, url, headers, payload):
+            yield format_sse({'token': token})
+        yield format_sse({'suggestions': suggestions}, event='done')
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        print(f"Stream error: {str(e)}")
+        yield format_sse({'error': str(e)}, event='error')
+
+
+class StreamBridge:
+    """Runs one asyncio loop in a background thread so WSGI handlers can share its session"""
+
+    def __init__(self):
+        self._loop = None
+        self._session = None
+        self._lock = threading.Lock()
+
+    def _ensure_loop(self):
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name='openai-stream', daemon=True)
+                thread.start()
+                self._loop = loop
+        return self._loop
+
+    async def _get_session(self):
+        # Only ever touched from the loop thread, so no lock is needed here
+        if self._session is None or self._session.closed:
+            self._session = new_session()
+        return self._session
+
+    async def _pump(self, url, headers, payload, suggestions, out):
+        try:
+            session = await self._get_session()
+            async for frame in iter_sse(session, url, headers, payload, suggestions):
+                out.put(frame)
+        finally:
+            out.put(_END)
+
+    def stream(self, url, headers, payload, suggestions):
+        """Synchronous generator of SSE frames backed by the shared event loop"""
+        out = queue.Queue()
+        future = asyncio.run_coroutine_threadsafe(
+            self._pump(url, headers, payload, suggestions, out),
+            self._ensure_loop()
+        )
+        try:
+            while True:
+                frame = out.get()
+                if frame is _END:
+                    break
+                yield frame
+        finally:
+            # Client went away (or we finished) - stop the upstream read
+            future.cancel()
+
+
+_bridge = StreamBridge()
+
+
+def stream_sse(url, headers, payload, suggestions):
+    """Stream SSE frames for a chat completion from a synchronous (WSGI) handler"""
+    return _bridge.stream(url, headers, payload, suggestions)
+
+
+def create_stream_app(prepare):
+    """
+    Native asyncio app serving /api/chatbot/stream.
+    `prepare(data)` returns (url, headers, payload, suggestions) for a request body.
+    """
+
+    async def on_startup(app):
+        app['session'] = new_session()
+
+    async def on_cleanup(app):
+        await app['session'].close()
+
+    async def handle_stream(request):
+        try:
+            data = await request.json(loads=fast_json.loads)
+        except ValueError:
+            data = None
+
+        if not data or 'message' not in data:
+            return web.json_response({
+                'success': False,
+                'error': 'Message is required'
+            }, status=400)
+
+        url, headers, payload, suggestions = prepare(data)
+
+        response = web.StreamResponse(headers=SSE_HEADERS)
+        await response.prepare(request)
+        async for frame in iter_sse(request.app['session'], url, headers, payload, suggestions):
+            await response.write(frame.encode('utf-8'))
+        await response.write_eof()
+        return response
+
+    app = web.Application()
+    app.on_startup.append(on_startup)
+    app.on_cleanup.append(on_cleanup)
+    app.router.add_post('/api/chatbot/stream', handle_stream)
+    return app
+
+
+if __name__ == '__main__':
+    import python_ai_server
+
+    port = int(os.getenv('STREAM_PORT', 5003))
+    print(f"📡 Async streaming server on http://localhost:{port}/api/chatbot/stream")
+    web.run_app(create_stream_app(python_ai_server.prepare_stream), host='0.0.0.0', port=port)
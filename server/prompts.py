@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Fit Fusion AI Coach - Prompt templates
+System prompts live in prompts/<name>.v<N>.txt and are read once per process. A server pins
+a version with PROMPT_VERSION_<NAME> (e.g. PROMPT_VERSION_COACH_OPENAI=2), otherwise the
+newest file wins. The version is part of the response cache key, and keeping the text
+byte-identical between requests is what lets the providers reuse their cached prefix.
+"""
+
+import hashlib
+import os
+import re
+from functools import lru_cache
+
+PROMPTS_DIR = os.getenv('PROMPTS_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'prompts'))
+
+_FILENAME = re.compile(r'^(?P<name>[a-z0-9_]+)\.v(?P<version>\d+)\.txt$')
+
+
+class PromptNotFound(LookupError):
+    """No template file for the requested name/version"""
+
+
+class Prompt:
+    """One loaded template; `id` (name.vN) identifies it in cache keys and logs"""
+
+    __slots__ = ('name', 'version', 'text', 'digest')
+
+    def __init__(self, name, version, text):
+        self.name = name
+        self.version = version
+        self.text = text
+        self.digest = hashlib.sha256(text.encode('utf-8')).hexdigest()[:12]
+
+    @property
+    def id(self):
+        return f"{self.name}.v{self.version}"
+
+    def stats(self):
+        return {'id': self.id, 'digest': self.digest, 'chars': len(self.text)}
+
+
+def versions(name, directory=PROMPTS_DIR):
+    """Available versions of a template, ascending"""
+    found = []
+    for filename in os.listdir(directory):
+        match = _FILENAME.match(filename)
+        if match and match.group('name') == name:
+            found.append(int(match.group('version')))
+    return sorted(found)
+
+
+@lru_cache(maxsize=None)
+def load(name, version=None, directory=PROMPTS_DIR):
+    """The template `name` at `version` (env override, else newest), read from disk once"""
+    if version is None:
+        version = os.getenv(f'PROMPT_VERSION_{name.upper()}')
+    if version is None:
+        available = versions(name, directory)
+        if not available:
+            raise PromptNotFound(f"No prompt template named {name!r} in {directory}")
+        version = available[-1]
+    version = int(version)
+
+    path = os.path.join(directory, f"{name}.v{version}.txt")
+    try:
+        with open(path, encoding='utf-8') as f:
+            # Editors add a final newline; drop it so the prefix doesn't change with the editor
+            text = f.read().rstrip('\n')
+    except FileNotFoundError:
+        raise PromptNotFound(f"No prompt template {name}.v{version} in {directory}") from None
+    return Prompt(name, version, text)
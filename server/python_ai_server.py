@@ -4,12 +4,27 @@ Fit Fusion AI Coach - Python Backend
 Real-time ChatGPT-level fitness coaching using OpenAI API
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
 import requests
 import os
 from dotenv import load_dotenv
-import json
+import base64
+
+import admission
+import context_window
+import fast_json
+import job_queue
+import metrics
+import openai_stream
+import prompts
+import response_cache
+import semantic_cache
+import session_store
+import single_flight
+import upstream_pool
+from chat_history import clean_history
+from suggestions import generate_suggestions
 
 # Load environment variables
 load_dotenv()
@@ -18,247 +33,62 @@ load_dotenv()
 app = Flask(__name__)
 CORS(app)  # Enable CORS for frontend
 
+# jsonify / get_json through orjson when available
+fast_json.install(app)
+
 # Get OpenAI API key
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
-OPENAI_API_URL = "https://api.openai.com/v1/chat/completions"
-
-# Comprehensive fitness training system prompt
-SYSTEM_PROMPT = """You are Fit Fusion AI Coach - an elite fitness and nutrition expert with the conversational intelligence of ChatGPT. You have deep expertise in exercise science, sports nutrition, behavioral psychology, and personalized coaching.
-
-CORE IDENTITY:
-You are warm, empathetic, knowledgeable, and genuinely invested in helping users achieve their fitness goals. You understand that fitness is a personal journey with unique challenges for each individual. You meet users where they are with compassion, expertise, and practical guidance.
-
-YOUR MISSION:
-Answer ANY fitness, nutrition, wellness, or health-related question with intelligence, empathy, and expertise. You can handle:
-- Workout plans and exercise techniques
-- Nutrition advice and meal planning (ALL diets: keto, vegan, paleo, IF, mediterranean, etc.)
-- Progress tracking and analytics
-- Goal setting and achievement strategies
-- Motivation and mental coaching
-- Recovery and injury prevention
-- Lifestyle and habit formation
-- General fitness questions
-- Health and wellness topics
-
-RESPONSE FRAMEWORK:
-1. UNDERSTAND: Carefully analyze what the user is truly asking
-2. ACKNOWLEDGE: Show you understand their situation/concern
-3. EDUCATE: Explain the science and reasoning behind your advice
-4. PERSONALIZE: Tailor recommendations to their specific context
-5. ACTIONABLE: Provide clear, specific, implementable steps
-6. MOTIVATE: Encourage and inspire without being preachy
-7. FOLLOW-UP: Invite questions or offer related guidance
-
-COMMUNICATION STYLE (Like ChatGPT):
-✓ Natural, conversational, friendly tone
-✓ Clear and easy to understand
-✓ Break complex topics into digestible pieces
-✓ Use analogies and real-world examples
-✓ Acknowledge when you're uncertain
-✓ Ask clarifying questions when needed
-✓ Adapt language to match user's style
-✓ Use emojis purposefully (not excessively)
-✓ Format for readability: headers, bullets, spacing, numbered lists
-✓ Be concise yet comprehensive
-✓ Show personality and warmth
-
-DIET EXPERTISE - Recognize and provide specific meals for:
-🥑 KETO: High-fat (70-75%), low-carb (<5%) - Avocado, eggs, fatty fish, nuts, olive oil
-🌱 VEGAN: No animal products - Tofu, tempeh, lentils, chickpeas, quinoa
-🥛 VEGETARIAN: No meat, includes dairy/eggs
-🥩 PALEO: Whole foods, no grains/dairy - Grass-fed meat, fish, vegetables, fruits
-⏰ INTERMITTENT FASTING: Time-restricted eating (16:8, 18:6, OMAD)
-🍽️ MEDITERRANEAN: Olive oil, fish, vegetables, whole grains
-🥤 LOW-CARB: Reduced carbs (50-150g/day)
-🍖 CARNIVORE: Animal products only
-🌾 WHOLE30: 30-day elimination, whole foods
-🥗 DASH: Low sodium, heart-healthy
-🍚 IIFYM: Flexible macro tracking
-🥜 GLUTEN-FREE: No wheat/gluten
-🥛 DAIRY-FREE: No milk products
-🍽️ ZONE: 40/30/30 macro split
-
-WORKOUT EXPERTISE:
-- Strength training (hypertrophy, powerlifting, bodybuilding)
-- Cardio (HIIT, LISS, MISS, running, cycling)
-- Flexibility and mobility
-- Sport-specific training
-- Home workouts vs gym workouts
-- Progressive overload strategies
-- Periodization and programming
-
-RESPONSE QUALITY STANDARDS:
-✓ Answer the ACTUAL question asked (stay on topic)
-✓ Provide specific numbers (reps, sets, calories, grams, timing)
-✓ Explain WHY behind recommendations (science/reasoning)
-✓ Be realistic about timelines and expectations
-✓ Prioritize safety and sustainable practices
-✓ If you need more info, ask specific questions
-✓ Offer multiple options when appropriate
-✓ Include practical tips and pro advice
-✓ Make it actionable - they should know what to do next
-
-CRITICAL RULES:
-✓ Handle ANY fitness-related question intelligently
-✓ Be conversational and engaging like ChatGPT
-✓ Explain reasoning and science
-✓ Give specific, actionable advice
-✓ Be encouraging and supportive
-✓ Format responses clearly
-✓ Adapt to question complexity
-
-NEVER:
-✗ Give generic, one-size-fits-all responses
-✗ Ignore user's specific context
-✗ Recommend unsafe or extreme practices
-✗ Make unrealistic promises or guarantees
-✗ Be condescending, judgmental, or dismissive
-✗ Provide medical diagnoses (always suggest consulting doctors)
-✗ Use overly technical jargon without explanation
-✗ Go off-topic or ramble
-
-REMEMBER: You're not just answering questions - you're coaching, educating, motivating, and empowering users to achieve their fitness goals. Be the AI coach they can trust and rely on for ANY fitness question!
-
-FEW-SHOT EXAMPLES:
-
-Example 1:
-User: "create a 4 day workout plan for me"
-Assistant: "Perfect! I'll create a comprehensive 4-day workout plan for you.
-
-**DAY 1 - UPPER BODY (PUSH)**
-Warm-up (5 min): Arm circles, light cardio
-1. Bench Press: 4 sets × 8-10 reps (3 min rest)
-2. Overhead Press: 3 sets × 10 reps (2 min rest)
-3. Incline Dumbbell Press: 3 sets × 12 reps
-4. Lateral Raises: 3 sets × 15 reps
-5. Tricep Dips: 3 sets × 12 reps
-6. Tricep Pushdowns: 3 sets × 15 reps
-Cool-down: 5 min stretching
-
-**DAY 2 - LOWER BODY (QUADS FOCUS)**
-Warm-up (5 min): Leg swings, bodyweight squats
-1. Back Squats: 4 sets × 8-10 reps (3 min rest)
-2. Leg Press: 3 sets × 12 reps (2 min rest)
-3. Walking Lunges: 3 sets × 12 reps each leg
-4. Leg Extensions: 3 sets × 15 reps
-5. Calf Raises: 4 sets × 20 reps
-6. Plank: 3 sets × 60 seconds
-Cool-down: 5 min stretching
-
-**DAY 3 - REST OR ACTIVE RECOVERY**
-Light cardio, yoga, or stretching
-
-**DAY 4 - UPPER BODY (PULL)**
-Warm-up (5 min): Band pull-aparts, light cardio
-1. Deadlifts: 4 sets × 6-8 reps (3 min rest)
-2. Pull-ups/Lat Pulldowns: 4 sets × 8-10 reps
-3. Barbell Rows: 3 sets × 10 reps
-4. Face Pulls: 3 sets × 15 reps
-5. Bicep Curls: 3 sets × 12 reps
-6. Hammer Curls: 3 sets × 12 reps
-Cool-down: 5 min stretching
-
-**DAY 5 - LOWER BODY (HAMSTRINGS/GLUTES FOCUS)**
-Warm-up (5 min): Hip circles, glute bridges
-1. Romanian Deadlifts: 4 sets × 10 reps (2 min rest)
-2. Hip Thrusts: 4 sets × 12 reps
-3. Leg Curls: 3 sets × 12 reps
-4. Bulgarian Split Squats: 3 sets × 10 reps each leg
-5. Cable Pull-Throughs: 3 sets × 15 reps
-6. Abs Circuit: 3 rounds
-Cool-down: 5 min stretching
-
-**DAYS 6-7 - REST**
-
-**PROGRESSION:**
-Add 2.5-5 lbs each week or add 1-2 reps when you can complete all sets.
-
-This plan targets all major muscle groups with adequate recovery!"
-
-Example 2:
-User: "I'm on keto, what should I eat?"
-Assistant: "Great! I'll create a keto meal plan for you.
-
-Keto focuses on high fat (70-75%), moderate protein (20-25%), and very low carbs (<5% or <20g net carbs per day).
-
-**BREAKFAST:**
-• Scrambled eggs (3) with avocado and bacon
-• Bulletproof coffee (coffee + butter + MCT oil)
-• Macros: 35g fat, 20g protein, 3g net carbs
-
-**LUNCH:**
-• Grilled salmon (6oz) with asparagus sautéed in olive oil
-• Side salad with full-fat ranch dressing
-• Macros: 40g fat, 30g protein, 5g net carbs
-
-**DINNER:**
-• Ribeye steak (8oz) with butter
-• Cauliflower rice
-• Sautéed spinach in olive oil
-• Macros: 45g fat, 35g protein, 4g net carbs
-
-**SNACKS:**
-• Macadamia nuts (1oz)
-• Cheese cubes
-• Pork rinds
-• Celery with cream cheese
-
-**KEY NUTRIENTS:** Sodium, potassium, magnesium (electrolytes)
-
-**PRO TIPS:**
-✓ Track net carbs (total carbs - fiber)
-✓ Stay hydrated (add salt to water)
-✓ Focus on healthy fats (avocado, olive oil, nuts)
-✓ Avoid hidden carbs in sauces
-
-You're on the right track! Keto is very effective for fat loss."
-
-Example 3:
-User: "give me vegan meal ideas"
-Assistant: "Absolutely! Here's a plant-based meal plan.
-
-**BREAKFAST:**
-• Tofu scramble with turmeric, vegetables, and nutritional yeast
-• Oatmeal with almond milk, berries, chia seeds, and hemp hearts
-• Green smoothie with spinach, banana, plant protein, and flax seeds
-
-**LUNCH:**
-• Lentil curry with brown rice and coconut milk
-• Chickpea Buddha bowl with quinoa, tahini, and roasted vegetables
-• Black bean burrito bowl with guacamole and salsa
-
-**DINNER:**
-• Tempeh stir-fry with vegetables, sesame oil, and brown rice
-• Pasta with marinara, nutritional yeast, and white beans
-• Veggie burger with sweet potato fries and cashew mayo
-
-**SNACKS:**
-• Hummus with carrots and bell peppers
-• Mixed nuts and seeds
-• Apple with almond butter
-• Protein shake with plant-based protein
-
-**PROTEIN SOURCES:**
-• Tofu, tempeh, seitan (20-25g per serving)
-• Lentils, chickpeas, black beans (15-18g per cup)
-• Quinoa, hemp seeds, chia seeds (8-10g per serving)
-
-**KEY NUTRIENTS:**
-• B12: Supplement (2.4 mcg daily)
-• Iron: Lentils, spinach, tofu (pair with vitamin C)
-• Omega-3: Flax, chia, walnuts (2 tbsp ground flax daily)
-• Protein: 1.6-2.2g per kg body weight
-• Calcium: Fortified plant milk, tofu, leafy greens
-
-**PRO TIPS:**
-✓ Combine different protein sources for complete amino acids
-✓ Take B12 supplement (non-negotiable)
-✓ Eat iron-rich foods with vitamin C for better absorption
-✓ Include omega-3 sources daily
-
-Plant-based eating is excellent for health and the environment!"
-
-APPLY THESE PATTERNS TO ALL RESPONSES!"""
+OPENAI_API_URL = os.getenv('OPENAI_API_URL', "https://api.openai.com/v1/chat/completions")
+OPENAI_MODEL = os.getenv('OPENAI_MODEL', "gpt-4o-mini")
+
+# Generation settings sent with every completion request
+GENERATION_PARAMS = {
+    "max_tokens": 2000,
+    "temperature": 0.8,
+    "top_p": 0.95,
+    "frequency_penalty": 0.3,
+    "presence_penalty": 0.3
+}
+
+# Routing hint so requests sharing the system prompt land where its prefix is already cached
+# (set to false for OpenAI-compatible APIs that reject unknown fields)
+OPENAI_PROMPT_CACHE_KEY = os.getenv('OPENAI_PROMPT_CACHE_KEY', 'true').lower() != 'false'
+
+# Cache for repeated questions
+cache = response_cache.create_cache()
+semantic = semantic_cache.SemanticCache()
+
+# Server-side conversation history for clients that opt in with sessionId/session
+sessions = session_store.SessionStore()
+
+# Identical prompts arriving together share one upstream call
+flights = single_flight.SingleFlight()
+
+# Request counts and per-stage latency at /metrics (installed first so rejected requests are counted too)
+metrics.install(app)
+
+# Overload is shed with a fast 429 instead of queueing upstream calls without bound
+admission_control = admission.AdmissionController()
+admission.install(app, admission_control)
+
+# Long generations can run in the background and be polled for (/api/chatbot/jobs)
+jobs = job_queue.JobQueue(job_queue.endpoint_runner(app, 'chat'))
+job_queue.install(app, jobs)
+
+# Versioned coach prompt (prompts/coach_openai.vN.txt), read once at startup
+PROMPT = prompts.load('coach_openai')
+SYSTEM_PROMPT = PROMPT.text
+
+# Cached answers are only valid for the prompt version that produced them
+CACHE_PARAMS = {**GENERATION_PARAMS, "prompt": PROMPT.id}
+
+# The system message always goes first and never changes, so OpenAI's automatic prompt caching
+# can reuse it; anything per-request (summary, history) comes after it
+SYSTEM_MESSAGE = {"role": "system", "content": SYSTEM_PROMPT}
+SYSTEM_TOKENS = context_window.count_tokens(SYSTEM_PROMPT)
+
+# Older turns beyond the history token budget are folded into a summary
+context = context_window.ContextWindow()
 
 
 @app.route('/api/health', methods=['GET'])
@@ -267,16 +97,111 @@ def health_check():
     return jsonify({
         'status': 'ok',
         'message': 'AI Coach Python server is running',
-        'model': 'gpt-4o-mini',
-        'version': '1.0.0'
+        'model': OPENAI_MODEL,
+        'version': '1.0.0',
+        'prompt': PROMPT.stats(),
+        'upstream': upstream_pool.all_stats(),
+        'cache': cache.stats(),
+        'semanticCache': semantic.stats(),
+        'sessions': sessions.stats(),
+        'singleFlight': flights.stats(),
+        'admission': admission_control.stats(),
+        'jobs': jobs.stats()
     })
 
 
+def build_messages(user_message, history, summary=None):
+    """Build the OpenAI messages list from the system prompt, cleaned history and new message"""
+    if summary:
+        summary_message = {"role": "system", "content": f"Summary of the earlier conversation:\n{summary}"}
+        return [SYSTEM_MESSAGE, summary_message, *history, {"role": "user", "content": user_message}]
+    return [SYSTEM_MESSAGE, *history, {"role": "user", "content": user_message}]
+
+
+def fit_context(user_message, conversation_history):
+    """Messages for the API with history trimmed to the token budget, plus token counts"""
+    summary, history, stats = context.fit(conversation_history)
+    stats['systemTokens'] = SYSTEM_TOKENS
+    stats['messageTokens'] = context_window.count_tokens(user_message)
+    stats['promptTokens'] = (
+        SYSTEM_TOKENS + stats['summaryTokens'] + stats['historyTokens'] + stats['messageTokens']
+    )
+    return build_messages(user_message, history, summary), stats
+
+
+def build_payload(messages, stream=False):
+    """Build the chat completions request body"""
+    payload = {
+        "model": OPENAI_MODEL,
+        "messages": messages,
+        **GENERATION_PARAMS
+    }
+    if OPENAI_PROMPT_CACHE_KEY:
+        payload["prompt_cache_key"] = PROMPT.id
+    if stream:
+        payload["stream"] = True
+        # Final chunk carries token usage, including cached prompt tokens
+        payload["stream_options"] = {"include_usage": True}
+    return payload
+
+
+def build_headers():
+    """Authorization headers for the OpenAI API"""
+    return {
+        "Authorization": f"Bearer {OPENAI_API_KEY}",
+        "Content-Type": "application/json"
+    }
+
+
+def complete(user_message, conversation_history, image=None):
+    """
+    One OpenAI completion for a cleaned history; returns the reply text.
+    `image` is an optional image_pipeline.ProcessedImage sent with the new message.
+    """
+    # Build messages for OpenAI API
+    with metrics.stage('prompt_build', 'openai'):
+        messages, token_stats = fit_context(user_message, conversation_history)
+        if image is not None:
+            encoded = base64.b64encode(image.data).decode('ascii')
+            messages[-1] = {"role": "user", "content": [
+                {"type": "text", "text": f"{user_message}\n\nAnalyze the image and provide fitness advice."},
+                {"type": "image_url", "image_url": {"url": f"data:{image.mime_type};base64,{encoded}"}}
+            ]}
+        payload = build_payload(messages)
+    
+    # Call OpenAI API
+    with metrics.stage('upstream_total', 'openai'):
+        response = upstream_pool.get_pool(OPENAI_API_URL).post(
+            OPENAI_API_URL, headers=build_headers(), data=fast_json.dumps_bytes(payload), timeout=60
+        )
+        # elapsed runs from sending the request to parsing the response headers
+        metrics.STAGE_SECONDS.observe(response.elapsed.total_seconds(), stage='upstream_ttfb', provider='openai')
+        response.raise_for_status()
+        
+        # Extract response
+        response_data = fast_json.loads(response.content)
+    ai_message = response_data['choices'][0]['message']['content']
+    
+    usage = response_data.get('usage') or {}
+    cached_tokens = (usage.get('prompt_tokens_details') or {}).get('cached_tokens')
+    metrics.record_usage('openai', usage.get('prompt_tokens'), usage.get('completion_tokens'), cached_tokens)
+    print(
+        f"📊 Tokens: prompt≈{token_stats['promptTokens']} "
+        f"(system {token_stats['systemTokens']}, summary {token_stats['summaryTokens']}, "
+        f"history {token_stats['historyTokens']}, message {token_stats['messageTokens']}) "
+        f"kept {token_stats['keptTurns']}/{token_stats['turns']} turns, "
+        f"upstream prompt={usage.get('prompt_tokens')} (cached {cached_tokens or 0}) "
+        f"completion={usage.get('completion_tokens')}"
+    )
+    return ai_message
+
+
 @app.route('/api/chatbot/message', methods=['POST'])
 def chat():
     """Main chatbot endpoint - handles all fitness questions"""
     try:
-        data = request.get_json()
+        with metrics.stage('parse'):
+            data = request.get_json()
         
         if not data or 'message' not in data:
             return jsonify({
@@ -285,78 +210,120 @@ def chat():
             }), 400
         
         user_message = data['message']
-        conversation_history = data.get('conversationHistory', [])
         
-        # Build messages for OpenAI API
-        messages = [
-            {"role": "system", "content": SYSTEM_PROMPT}
-        ]
+        # Session mode: history lives on the server, the client only sends the new message
+        session = None
+        if data.get('sessionId'):
+            session = sessions.get(data['sessionId'])
+            if session is None:
+                return jsonify({
+                    'success': False,
+                    'error': 'Session not found or expired',
+                    'sessionExpired': True
+                }), 404
+            conversation_history = session.messages
+        elif data.get('session'):
+            session = sessions.create(clean_history(data.get('conversationHistory', [])))
+            conversation_history = session.messages
+        else:
+            conversation_history = clean_history(data.get('conversationHistory', []))
         
-        # Add conversation history
-        for msg in conversation_history:
-            if msg.get('role') in ['user', 'assistant']:
-                messages.append({
-                    "role": msg['role'],
-                    "content": msg['content']
-                })
+        # Serve repeated questions from the cache
+        cache_key = response_cache.make_key(OPENAI_MODEL, CACHE_PARAMS, user_message, conversation_history)
+        ai_message = cache.get(cache_key)
         
-        # Add current user message
-        messages.append({
-            "role": "user",
-            "content": user_message
-        })
+        # First-turn paraphrases can reuse an earlier answer
+        first_turn = not conversation_history
+        if ai_message is None and first_turn:
+            ai_message = semantic.get(user_message)
         
-        # Call OpenAI API
-        headers = {
-            "Authorization": f"Bearer {OPENAI_API_KEY}",
-            "Content-Type": "application/json"
-        }
-        
-        payload = {
-            "model": "gpt-4o-mini",
-            "messages": messages,
-            "max_tokens": 2000,
-            "temperature": 0.8,
-            "top_p": 0.95,
-            "frequency_penalty": 0.3,
-            "presence_penalty": 0.3
-        }
-        
-        response = requests.post(OPENAI_API_URL, headers=headers, json=payload, timeout=60)
-        response.raise_for_status()
+        if ai_message is None:
+            ai_message, shared = flights.do(cache_key, lambda: complete(user_message, conversation_history))
+            if not shared:
+                cache.set(cache_key, ai_message)
+                if first_turn:
+                    semantic.add(user_message, ai_message)
         
-        # Extract response
-        response_data = response.json()
-        ai_message = response_data['choices'][0]['message']['content']
-        
-        return jsonify({
+        response_body = {
             'success': True,
             'data': {
                 'message': ai_message,
                 'suggestions': generate_suggestions(user_message)
             }
-        })
+        }
+        if session is not None:
+            sessions.append(
+                session,
+                {"role": "user", "content": user_message},
+                {"role": "assistant", "content": ai_message}
+            )
+            response_body['data']['sessionId'] = session.id
+        
+        with metrics.stage('serialize'):
+            return jsonify(response_body)
         
+    except upstream_pool.UpstreamBusy as e:
+        metrics.record_error(e)
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 503
+    except requests.HTTPError as e:
+        # Upstream still failing after retries - pass rate limits through, report the rest as a bad gateway
+        print(f"Upstream error: {str(e)}")
+        metrics.record_error(e)
+        status = e.response.status_code
+        headers = {}
+        if status == 429 and e.response.headers.get('Retry-After'):
+            headers['Retry-After'] = e.response.headers['Retry-After']
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 429 if status == 429 else 502, headers
     except Exception as e:
         print(f"Error: {str(e)}")
+        metrics.record_error(e)
         return jsonify({
             'success': False,
             'error': str(e)
         }), 500
 
 
-def generate_suggestions(message):
-    """Generate contextual suggestions based on user message"""
-    message_lower = message.lower()
+@app.route('/api/chatbot/session/<session_id>', methods=['DELETE'])
+def end_session(session_id):
+    """Drop a server-side conversation"""
+    sessions.delete(session_id)
+    return jsonify({'success': True})
+
+
+def prepare_stream(data):
+    """Upstream request details for a streaming chat request body"""
+    user_message = data['message']
+    with metrics.stage('prompt_build', 'openai'):
+        messages, _ = fit_context(user_message, clean_history(data.get('conversationHistory', [])))
+        payload = build_payload(messages, stream=True)
+    return (
+        OPENAI_API_URL,
+        build_headers(),
+        payload,
+        generate_suggestions(user_message)
+    )
+
+
+@app.route('/api/chatbot/stream', methods=['POST'])
+def chat_stream():
+    """Streaming chatbot endpoint - sends tokens as server-sent events"""
+    with metrics.stage('parse'):
+        data = request.get_json(silent=True)
     
-    if any(word in message_lower for word in ['workout', 'exercise', 'training']):
-        return ['Track workout', 'View progress', 'Nutrition advice']
-    elif any(word in message_lower for word in ['meal', 'diet', 'food', 'eat', 'nutrition']):
-        return ['Log meal', 'Track calories', 'Workout plan']
-    elif any(word in message_lower for word in ['progress', 'stats', 'track']):
-        return ['View analytics', 'Set new goal', 'Get motivation']
-    else:
-        return ['Create workout', 'Meal plan', 'Check progress']
+    if not data or 'message' not in data:
+        return jsonify({
+            'success': False,
+            'error': 'Message is required'
+        }), 400
+    
+    events = openai_stream.stream_sse(*prepare_stream(data))
+    return Response(stream_with_context(events), headers=openai_stream.SSE_HEADERS)
 
 
 if __name__ == '__main__':
@@ -372,12 +339,17 @@ if __name__ == '__main__':
     print("🤖 Fit Fusion AI Coach - Python Server")
     print("=" * 60)
     print(f"✅ OpenAI API Key: Configured")
-    print(f"✅ Model: gpt-4o-mini")
+    print(f"✅ Model: {OPENAI_MODEL}")
+    print(f"✅ Prompt: {PROMPT.id}")
     print(f"✅ Training: Complete (all diets, workouts, etc.)")
     print(f"📡 Server starting on http://localhost:{port}")
     print(f"📡 API endpoint: http://localhost:{port}/api/chatbot/message")
+    print(f"📡 Background jobs: http://localhost:{port}/api/chatbot/jobs")
+    print(f"📡 Streaming endpoint: http://localhost:{port}/api/chatbot/stream")
     print(f"✅ Health check: http://localhost:{port}/api/health")
     print("=" * 60)
     
-    # Run Flask app
-    app.run(host='0.0.0.0', port=port, debug=True)
+    print("💡 Development server - for production use: python serve.py")
+    
+    # Run Flask app (debugger/reloader only when FLASK_DEBUG=1)
+    app.run(host='0.0.0.0', port=port, debug=os.getenv('FLASK_DEBUG') == '1')
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Fit Fusion AI Coach - Response cache
+Exact-match cache for repeated coach questions, shared by both AI servers
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+COACH_CACHE_ENABLED = os.getenv('COACH_CACHE_ENABLED', 'true').lower() != 'false'
+COACH_CACHE_MAX_ENTRIES = int(os.getenv('COACH_CACHE_MAX_ENTRIES', 2048))
+COACH_CACHE_MAX_BYTES = int(os.getenv('COACH_CACHE_MAX_BYTES', 32 * 1024 * 1024))
+COACH_CACHE_TTL = float(os.getenv('COACH_CACHE_TTL', 6 * 60 * 60))
+COACH_CACHE_URL = os.getenv('COACH_CACHE_URL')
+
+_WHITESPACE = re.compile(r'\s+')
+_TRAILING_PUNCTUATION = re.compile(r'[\s.!?]+$')
+
+
+def normalize_message(message):
+    """Case/whitespace-insensitive form of a user message"""
+    message = _WHITESPACE.sub(' ', message.strip().lower())
+    return _TRAILING_PUNCTUATION.sub('', message)
+
+
+def history_digest(conversation_history):
+    """Stable hash of the turns in a conversation history (OpenAI or Gemini shaped)"""
+    turns = [
+        [msg.get('role'), msg['content'] if 'content' in msg else msg.get('parts')]
+        for msg in conversation_history or []
+        if msg.get('role') in ('user', 'assistant', 'model')
+    ]
+    if not turns:
+        return ''
+    encoded = json.dumps(turns, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def make_key(model, params, message, conversation_history):
+    """Cache key covering model, generation parameters, message and history"""
+    material = json.dumps({
+        'model': model,
+        'params': params,
+        'message': normalize_message(message),
+        'history': history_digest(conversation_history)
+    }, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return 'coach:' + hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+
+class MemoryBackend:
+    """In-process LRU bounded by entry count and total bytes, with per-entry TTL"""
+
+    def __init__(self, max_entries=COACH_CACHE_MAX_ENTRIES, max_bytes=COACH_CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, size, expires_at = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        size = len(value.encode('utf-8'))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, size, time.monotonic() + ttl)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def _remove(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'evictions': self.evictions
+            }
+
+
+class RedisBackend:
+    """
+    Shared backend so several workers see each other's hits.
+    Works with any client exposing redis-py's get(key) / set(key, value, ex=seconds).
+    """
+
+    def __init__(self, client):
+        self.client = client
+
+    @classmethod
+    def from_url(cls, url):
+        import redis
+        return cls(redis.Redis.from_url(url, socket_timeout=0.25))
+
+    def get(self, key):
+        value = self.client.get(key)
+        if isinstance(value, bytes):
+            value = value.decode('utf-8')
+        return value
+
+    def set(self, key, value, ttl):
+        self.client.set(key, value, ex=max(1, int(ttl)))
+
+
+class ResponseCache:
+    """Two-tier cache: local LRU in front of an optional shared backend"""
+
+    def __init__(self, local=None, shared=None, ttl=COACH_CACHE_TTL, enabled=COACH_CACHE_ENABLED):
+        self.local = local if local is not None else MemoryBackend()
+        self.shared = shared
+        self.ttl = ttl
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.shared_errors = 0
+
+    def get(self, key):
+        if not self.enabled:
+            return None
+
+        value = self.local.get(key)
+        if value is None and self.shared is not None:
+            try:
+                value = self.shared.get(key)
+            except Exception as e:
+                print(f"Cache error: {str(e)}")
+                with self._lock:
+                    self.shared_errors += 1
+                value = None
+            if value is not None:
+                self.local.set(key, value, self.ttl)
+                with self._lock:
+                    self.shared_hits += 1
+
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key, value):
+        if not self.enabled or not value:
+            return
+        self.local.set(key, value, self.ttl)
+        if self.shared is not None:
+            try:
+                self.shared.set(key, value, self.ttl)
+            except Exception as e:
+                print(f"Cache error: {str(e)}")
+                with self._lock:
+                    self.shared_errors += 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            stats = {
+                'enabled': self.enabled,
+                'backend': 'memory+shared' if self.shared is not None else 'memory',
+                'hits': self.hits,
+                'sharedHits': self.shared_hits,
+                'misses': self.misses,
+                'hitRatio': round(self.hits / lookups, 4) if lookups else 0.0,
+                'sharedErrors': self.shared_errors
+            }
+        stats.update(self.local.stats())
+        return stats
+
+
+def create_cache():
+    """Cache configured from the environment (COACH_CACHE_URL enables the shared tier)"""
+    shared = RedisBackend.from_url(COACH_CACHE_URL) if COACH_CACHE_URL else None
+    return ResponseCache(shared=shared)
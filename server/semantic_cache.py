@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Fit Fusion AI Coach - Semantic cache
+Serves stored answers for paraphrased first-turn questions using cosine similarity
+over cheap local embeddings.
+"""
+
+import os
+import re
+import threading
+import zlib
+
+import numpy as np
+
+SEMANTIC_CACHE_ENABLED = os.getenv('SEMANTIC_CACHE_ENABLED', 'false').lower() == 'true'
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv('SEMANTIC_CACHE_THRESHOLD', 0.85))
+SEMANTIC_CACHE_MAX_ENTRIES = int(os.getenv('SEMANTIC_CACHE_MAX_ENTRIES', 50000))
+SEMANTIC_CACHE_DIM = int(os.getenv('SEMANTIC_CACHE_DIM', 128))
+
+_WORD = re.compile(r'[a-z0-9]+')
+_NUMBER = re.compile(r'\d+(?:[.,]\d+)*')
+# Words that flip a request's meaning; "no equipment" and "without equipment" count the same
+_NEGATION = re.compile(r"\b(?:not|no|never|without|none|nor|cannot|non)\b|n't\b")
+
+STOPWORDS = frozenset("""
+a an the and or but if of to in on for with at by from as is are was were be been am
+i me my we our you your he she it they them this that these those what which who whom
+do does did can could should would will shall may might must please give tell show
+some any about into how much many just get got want need like also so very really
+""".split())
+
+
+def stem(word):
+    """Very small suffix stripper - enough to fold plurals and -ing forms together"""
+    for suffix in ('ing', 'es', 's'):
+        if len(word) > len(suffix) + 3 and word.endswith(suffix):
+            return word[:-len(suffix)]
+    return word
+
+
+def tokenize(text):
+    """Content words of a message, lowercased and stemmed"""
+    return [stem(word) for word in _WORD.findall(text.lower()) if word not in STOPWORDS]
+
+
+def guard(text):
+    """
+    Numbers and negations of a message, which must match exactly for a hit: "4 day plan" and
+    "5 day plan", or "on keto" and "not on keto", embed almost the same. A crc32 so entries can
+    keep it in an integer column.
+    """
+    text = text.lower()
+    numbers = sorted(number.replace(',', '') for number in _NUMBER.findall(text))
+    return zlib.crc32(f"{len(_NEGATION.findall(text))}|{' '.join(numbers)}".encode('utf-8'))
+
+
+def embed(text, dim=SEMANTIC_CACHE_DIM):
+    """
+    Signed feature-hashing embedding of words and character trigrams, L2-normalized.
+    crc32 keeps the hashing stable across processes (unlike hash()).
+    """
+    vector = np.zeros(dim, dtype=np.float32)
+    for word in tokenize(text):
+        features = [(word, 1.0)]
+        padded = f"#{word}#"
+        features.extend((padded[i:i + 3], 0.35) for i in range(len(padded) - 2))
+        for feature, weight in features:
+            h = zlib.crc32(feature.encode('utf-8'))
+            vector[h % dim] += weight if (h >> 31) & 1 else -weight
+
+    norm = np.linalg.norm(vector)
+    if norm:
+        vector /= norm
+    return vector
+
+
+class SemanticCache:
+    """
+    Fixed-capacity matrix of normalized question vectors with their answers and guards.
+    Once full, the oldest entries are overwritten in ring order.
+    """
+
+    def __init__(self, threshold=SEMANTIC_CACHE_THRESHOLD, max_entries=SEMANTIC_CACHE_MAX_ENTRIES,
+                 dim=SEMANTIC_CACHE_DIM, enabled=SEMANTIC_CACHE_ENABLED):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.dim = dim
+        self.enabled = enabled
+        self._vectors = np.zeros((min(max_entries, 1024), dim), dtype=np.float32)
+        self._guards = np.zeros(self._vectors.shape[0], dtype=np.uint32)
+        self._answers = []
+        self._next = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._answers)
+
+    def _grow(self):
+        capacity = min(self.max_entries, self._vectors.shape[0] * 2)
+        grown = np.zeros((capacity, self.dim), dtype=np.float32)
+        grown[:self._vectors.shape[0]] = self._vectors
+        self._vectors = grown
+        self._guards = np.resize(self._guards, capacity)
+
+    def search(self, vector, guard=None):
+        """
+        (similarity, answer) of the nearest stored question, or (0.0, None); with a guard, only
+        among questions with the same numbers and negations
+        """
+        with self._lock:
+            count = len(self._answers)
+            if not count:
+                return 0.0, None
+            scores = self._vectors[:count] @ vector
+            if guard is not None:
+                scores[self._guards[:count] != guard] = -np.inf
+            best = int(np.argmax(scores))
+            if scores[best] == -np.inf:
+                return 0.0, None
+            return float(scores[best]), self._answers[best]
+
+    def get(self, message):
+        """Stored answer for a close enough question, else None"""
+        if not self.enabled:
+            return None
+        similarity, answer = self.search(embed(message, self.dim), guard(message))
+        hit = answer is not None and similarity >= self.threshold
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return answer if hit else None
+
+    def add_vector(self, vector, answer, guard=0):
+        with self._lock:
+            slot = self._next
+            if slot == len(self._answers):
+                if slot == self._vectors.shape[0]:
+                    self._grow()
+                self._answers.append(answer)
+            else:
+                self._answers[slot] = answer
+            self._vectors[slot] = vector
+            self._guards[slot] = guard
+            self._next = (slot + 1) % self.max_entries
+
+    def add(self, message, answer):
+        if not self.enabled or not answer:
+            return
+        vector = embed(message, self.dim)
+        if not vector.any():
+            # Nothing but stopwords - too vague to match against
+            return
+        self.add_vector(vector, answer, guard(message))
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'enabled': self.enabled,
+                'entries': len(self._answers),
+                'threshold': self.threshold,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hitRatio': round(self.hits / lookups, 4) if lookups else 0.0
+            }
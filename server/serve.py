@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Fit Fusion AI Coach - Production server
+Serves an AI backend, the multi-provider gateway or the meal recommender under gunicorn
+with configurable workers, threads, keep-alive and graceful shutdown.
+
+Usage:
+    python serve.py --backend openai --workers 4 --threads 16
+    GATEWAY_STRATEGY=latency python serve.py --backend gateway
+    gunicorn 'serve:create_app("gemini")' --workers 4 --threads 16 --worker-class gthread
+"""
+
+import argparse
+import importlib
+import multiprocessing
+import os
+import tempfile
+
+from gunicorn.app.base import BaseApplication
+
+BACKENDS = {
+    'openai': 'python_ai_server',
+    'gemini': 'gemini_ai_server',
+    'gateway': 'gateway_server',
+    'meals': 'meal_server',
+}
+
+# Job results store when several workers must share it and JOB_STORE_PATH isn't set
+DEFAULT_JOB_STORE_PATH = os.path.join(tempfile.gettempdir(), 'fit-fusion-jobs.sqlite3')
+
+
+def create_app(backend=None, workers=None):
+    """
+    Flask app for a backend ('openai', 'gemini', 'gateway' or 'meals'), with debug features off.
+    `workers` is the gunicorn worker count, None when unknown (the gunicorn command line).
+    """
+    backend = backend or os.getenv('AI_BACKEND', 'openai')
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}' (expected one of: {', '.join(BACKENDS)})")
+
+    shared = workers is None or workers > 1
+    if shared and not os.getenv('JOB_STORE_PATH'):
+        # A job poll can reach any worker, so results must live where they all see them
+        os.environ['JOB_STORE_PATH'] = DEFAULT_JOB_STORE_PATH
+
+    app = importlib.import_module(BACKENDS[backend]).app
+    # Only now: job_queue reads JOB_STORE_PATH when it's first imported
+    import job_queue
+    jobs = app.extensions.get('job_queue')
+    if shared and jobs is not None and isinstance(jobs.store, job_queue.MemoryJobStore):
+        raise RuntimeError(f"{BACKENDS[backend]} was imported with an in-memory job store; "
+                           "set JOB_STORE_PATH or run a single worker")
+    app.debug = False
+    app.config['PROPAGATE_EXCEPTIONS'] = False
+    return app
+
+
+class CoachServer(BaseApplication):
+    """Embedded gunicorn so the server can be started with one python command"""
+
+    def __init__(self, app, options):
+        self.application = app
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            if value is not None and key in self.cfg.settings:
+                self.cfg.set(key, value)
+
+    def load(self):
+        return self.application
+
+
+def default_workers():
+    # Workers mostly wait on upstream I/O, so threads do the heavy lifting
+    return min(multiprocessing.cpu_count() * 2 + 1, 8)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run an AI coach backend under gunicorn')
+    parser.add_argument('--backend', choices=sorted(BACKENDS), default=os.getenv('AI_BACKEND', 'openai'))
+    parser.add_argument('--host', default=os.getenv('HOST', '0.0.0.0'))
+    parser.add_argument('--port', type=int, default=int(os.getenv('PORT', 5002)))
+    parser.add_argument('--workers', type=int, default=int(os.getenv('WEB_WORKERS', default_workers())))
+    parser.add_argument('--threads', type=int, default=int(os.getenv('WEB_THREADS', 16)),
+                        help='threads per worker (concurrent requests per process)')
+    parser.add_argument('--keepalive', type=int, default=int(os.getenv('WEB_KEEPALIVE', 5)),
+                        help='seconds to hold idle client connections open')
+    parser.add_argument('--timeout', type=int, default=int(os.getenv('WEB_TIMEOUT', 120)),
+                        help='seconds before a silent worker is restarted (above the 60s upstream timeout)')
+    parser.add_argument('--graceful-timeout', type=int, default=int(os.getenv('WEB_GRACEFUL_TIMEOUT', 30)),
+                        help='seconds in-flight requests get to finish on shutdown/reload')
+    parser.add_argument('--max-requests', type=int, default=int(os.getenv('WEB_MAX_REQUESTS', 0)),
+                        help='recycle a worker after this many requests (0 = never)')
+    args = parser.parse_args()
+
+    options = {
+        'bind': f"{args.host}:{args.port}",
+        'workers': args.workers,
+        'threads': args.threads,
+        'worker_class': 'gthread',
+        'keepalive': args.keepalive,
+        'timeout': args.timeout,
+        'graceful_timeout': args.graceful_timeout,
+        'max_requests': args.max_requests,
+        'max_requests_jitter': args.max_requests // 10 if args.max_requests else 0,
+        'accesslog': os.getenv('WEB_ACCESS_LOG'),
+        'errorlog': '-',
+    }
+
+    print("=" * 60)
+    print(f"🤖 Fit Fusion AI Coach - {args.backend} backend (production)")
+    print("=" * 60)
+    print(f"📡 Listening on http://{args.host}:{args.port}")
+    print(f"✅ Workers: {args.workers} × {args.threads} threads")
+    print(f"✅ Keep-alive: {args.keepalive}s, graceful shutdown: {args.graceful_timeout}s")
+    app = create_app(args.backend, args.workers)
+    if 'job_queue' in app.extensions:
+        print(f"✅ Job store: {os.getenv('JOB_STORE_PATH') or 'in memory (single worker)'}")
+    print("=" * 60)
+
+    CoachServer(app, options).run()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Fit Fusion AI Coach - Conversation session store
+Keeps conversation turns server-side so clients only send the new message
+"""
+
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+
+SESSION_MAX_SESSIONS = int(os.getenv('SESSION_MAX_SESSIONS', 10000))
+SESSION_MAX_BYTES = int(os.getenv('SESSION_MAX_BYTES', 64 * 1024 * 1024))
+SESSION_MAX_TURNS = int(os.getenv('SESSION_MAX_TURNS', 200))
+SESSION_IDLE_TTL = float(os.getenv('SESSION_IDLE_TTL', 30 * 60))
+
+
+def message_size(message):
+    """Approximate memory held by one stored turn"""
+    content = message.get('content')
+    if content is None:
+        content = ''.join(part for part in message.get('parts', []) if isinstance(part, str))
+    return len(content) + 64
+
+
+class Session:
+    """One conversation: provider-formatted turns plus bookkeeping"""
+
+    __slots__ = ('id', 'messages', 'size', 'last_access')
+
+    def __init__(self, session_id, messages):
+        self.id = session_id
+        self.messages = list(messages)
+        self.size = sum(message_size(message) for message in self.messages)
+        self.last_access = time.monotonic()
+
+
+class SessionStore:
+    """LRU of sessions with idle expiry, a session count limit and a total memory cap"""
+
+    def __init__(self, max_sessions=SESSION_MAX_SESSIONS, max_bytes=SESSION_MAX_BYTES,
+                 max_turns=SESSION_MAX_TURNS, idle_ttl=SESSION_IDLE_TTL):
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+        self.max_turns = max_turns
+        self.idle_ttl = idle_ttl
+        self._sessions = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.expired = 0
+        self.evicted = 0
+
+    def create(self, messages=()):
+        """Start a session (optionally seeded with earlier turns) and return it"""
+        session = Session(secrets.token_urlsafe(16), messages[-self.max_turns:] if messages else ())
+        with self._lock:
+            self._sessions[session.id] = session
+            self._bytes += session.size
+            self._enforce_limits()
+        return session
+
+    def get(self, session_id):
+        """Live session for an id, or None if unknown/expired"""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return None
+            if time.monotonic() - session.last_access > self.idle_ttl:
+                self._drop(session_id)
+                self.expired += 1
+                return None
+            session.last_access = time.monotonic()
+            self._sessions.move_to_end(session_id)
+            return session
+
+    def append(self, session, *messages):
+        """Record new turns, trimming the oldest once the session hits max_turns"""
+        with self._lock:
+            if self._sessions.get(session.id) is not session:
+                # Evicted while the request was in flight
+                return
+            for message in messages:
+                session.messages.append(message)
+                added = message_size(message)
+                session.size += added
+                self._bytes += added
+            overflow = len(session.messages) - self.max_turns
+            if overflow > 0:
+                removed = sum(message_size(message) for message in session.messages[:overflow])
+                del session.messages[:overflow]
+                session.size -= removed
+                self._bytes -= removed
+            session.last_access = time.monotonic()
+            self._sessions.move_to_end(session.id)
+            self._enforce_limits()
+
+    def delete(self, session_id):
+        with self._lock:
+            if session_id in self._sessions:
+                self._drop(session_id)
+
+    def _drop(self, session_id):
+        session = self._sessions.pop(session_id)
+        self._bytes -= session.size
+
+    def _enforce_limits(self):
+        now = time.monotonic()
+        # Least recently used first, so idle sessions sit at the front
+        while self._sessions:
+            oldest_id, oldest = next(iter(self._sessions.items()))
+            if now - oldest.last_access > self.idle_ttl:
+                self._drop(oldest_id)
+                self.expired += 1
+            elif len(self._sessions) > self.max_sessions or self._bytes > self.max_bytes:
+                self._drop(oldest_id)
+                self.evicted += 1
+            else:
+                break
+
+    def stats(self):
+        with self._lock:
+            return {
+                'sessions': len(self._sessions),
+                'bytes': self._bytes,
+                'maxBytes': self.max_bytes,
+                'expired': self.expired,
+                'evicted': self.evicted
+            }
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Fit Fusion AI Coach - Request coalescing
+Concurrent identical prompts (same response cache key) share one upstream call instead of each
+starting their own; every waiter gets the leader's answer, or its error.
+"""
+
+import os
+import threading
+
+SINGLE_FLIGHT_ENABLED = os.getenv('SINGLE_FLIGHT_ENABLED', 'true').lower() != 'false'
+
+
+class _Call:
+    """One in-flight upstream call and the requests waiting on it"""
+
+    __slots__ = ('done', 'result', 'error', 'waiters')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Deduplicates concurrent calls by key"""
+
+    def __init__(self, enabled=SINGLE_FLIGHT_ENABLED):
+        self.enabled = enabled
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.coalesced = 0
+        self.shared_errors = 0
+
+    def do(self, key, fn):
+        """
+        (result, shared): runs fn() unless a call for `key` is already in flight, in which case
+        this waits for that call. `shared` is True when the result came from another request.
+        """
+        if not self.enabled or key is None:
+            return fn(), False
+
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.leaders += 1
+            else:
+                call.waiters += 1
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                with self._lock:
+                    self.shared_errors += 1
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            # Unregister before waking waiters so a later request starts a fresh call
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+    def stats(self):
+        with self._lock:
+            calls = self.leaders + self.coalesced
+            return {
+                'enabled': self.enabled,
+                'inFlight': len(self._calls),
+                'upstreamCalls': self.leaders,
+                'savedCalls': self.coalesced,
+                'savedRatio': round(self.coalesced / calls, 4) if calls else 0.0,
+                'sharedErrors': self.shared_errors
+            }
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Fit Fusion AI Coach - Suggestion chips
+Shared by every AI backend. Keyword rules are loaded once from data/suggestion_rules.json
+(or SUGGESTION_RULES_PATH) and matched on whole words in a single pass over the message.
+"""
+
+import json
+import os
+
+SUGGESTION_RULES_PATH = os.getenv(
+    'SUGGESTION_RULES_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'suggestion_rules.json')
+)
+
+# Lowercase ASCII letters and digits stay, everything else becomes a word break
+_WORD_BYTES = bytes(c if 97 <= c <= 122 or 48 <= c <= 57 else 32 for c in range(256))
+
+
+class SuggestionEngine:
+    """
+    Ranks rules by the weight of the distinct keywords a message contains.
+    Ties keep the rules' file order, so earlier rules win as they always have.
+    """
+
+    def __init__(self, rules, default, limit=3):
+        self.rules = rules
+        self.default = list(default)
+        self.limit = limit
+        # word -> [(rule index, weight)]; phrases are keyed by their first word
+        self._words = {}
+        self._phrases = {}
+        for index, rule in enumerate(rules):
+            weight = rule.get('weight', 1.0)
+            for keyword in rule['keywords']:
+                words = tuple(word.encode('ascii') for word in keyword.lower().split())
+                if len(words) == 1:
+                    self._words.setdefault(words[0], []).append((index, weight))
+                else:
+                    self._phrases.setdefault(words[0], []).append((words, index, weight))
+        self._word_set = frozenset(self._words)
+        self._phrase_heads = frozenset(self._phrases)
+
+    @classmethod
+    def from_file(cls, path=SUGGESTION_RULES_PATH):
+        with open(path, encoding='utf-8') as f:
+            config = json.load(f)
+        return cls(config['rules'], config['default'], config.get('limit', 3))
+
+    def scores(self, message):
+        """Rule index -> score for the keywords found in the message"""
+        words = message.lower().encode('utf-8').translate(_WORD_BYTES).split()
+        matched = self._word_set.intersection(words)
+        scores = {}
+        for word in matched:
+            for index, weight in self._words[word]:
+                scores[index] = scores.get(index, 0.0) + weight
+
+        # Multi-word keywords only cost a scan when one of their first words is present
+        if self._phrase_heads.intersection(words):
+            found = set()
+            for position, word in enumerate(words):
+                for phrase, index, weight in self._phrases.get(word, ()):
+                    if phrase not in found and tuple(words[position:position + len(phrase)]) == phrase:
+                        found.add(phrase)
+                        scores[index] = scores.get(index, 0.0) + weight
+        return scores
+
+    def rank(self, message):
+        """Matching rule names, best first"""
+        scores = self.scores(message)
+        ordered = sorted(scores, key=lambda index: (-scores[index], index))
+        return [self.rules[index]['name'] for index in ordered]
+
+    def suggest(self, message, limit=None):
+        """Suggestions from the best-ranked rules, topped up from the next ones"""
+        limit = limit or self.limit
+        scores = self.scores(message)
+        if not scores:
+            return self.default[:limit]
+
+        suggestions = []
+        for index in sorted(scores, key=lambda index: (-scores[index], index)):
+            for suggestion in self.rules[index]['suggestions']:
+                if suggestion not in suggestions:
+                    suggestions.append(suggestion)
+                    if len(suggestions) == limit:
+                        return suggestions
+        return suggestions
+
+
+engine = SuggestionEngine.from_file()
+
+
+def generate_suggestions(message):
+    """Generate contextual suggestions based on user message"""
+    return engine.suggest(message)
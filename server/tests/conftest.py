@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Server modules import each other as top-level modules, like the servers run them
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
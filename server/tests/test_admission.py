@@ -0,0 +1,86 @@
+import os
+import time
+
+import pytest
+from flask import Flask
+
+import admission
+from admission import AdmissionController, client_id, parse_networks
+
+PROXIES = parse_networks('127.0.0.1, 10.0.0.0/8')
+
+
+@pytest.fixture
+def app():
+    return Flask(__name__)
+
+
+def caller(app, remote_addr, forwarded=None, proxies=PROXIES):
+    headers = {'X-Forwarded-For': forwarded} if forwarded else {}
+    with app.test_request_context(headers=headers, environ_base={'REMOTE_ADDR': remote_addr}):
+        return client_id(proxies)
+
+
+def test_forwarded_header_ignored_from_untrusted_callers(app):
+    assert caller(app, '203.0.113.7', forwarded='198.51.100.1') == '203.0.113.7'
+    assert caller(app, '127.0.0.1', forwarded='198.51.100.1', proxies=()) == '127.0.0.1'
+
+
+def test_nearest_untrusted_hop_is_the_client(app):
+    # The client wrote 1.2.3.4 itself; the proxy appended the address it really came from
+    assert caller(app, '127.0.0.1', forwarded='1.2.3.4, 198.51.100.1') == '198.51.100.1'
+    assert caller(app, '127.0.0.1', forwarded='198.51.100.1, 10.0.0.5') == '198.51.100.1'
+
+
+def test_client_id_header_is_not_an_identity(app):
+    with app.test_request_context(headers={'X-Client-Id': 'fresh-bucket'},
+                                  environ_base={'REMOTE_ADDR': '203.0.113.7'}):
+        assert client_id(PROXIES) == '203.0.113.7'
+
+
+@pytest.mark.skipif('ADMISSION_ENABLED' in os.environ, reason='ADMISSION_ENABLED is set')
+def test_disabled_by_default():
+    assert AdmissionController().enabled is False
+
+
+def test_rotating_headers_share_one_bucket(app):
+    controller = AdmissionController(client_rate=0.001, client_burst=2, enabled=True)
+    admission.install(app, controller, endpoints={'chat'})
+
+    @app.route('/chat', methods=['POST'])
+    def chat():
+        return {'success': True}
+
+    client = app.test_client()
+    statuses = [client.post('/chat', headers={'X-Client-Id': f'id-{n}', 'X-Forwarded-For': f'192.0.2.{n}'},
+                            environ_base={'REMOTE_ADDR': '203.0.113.7'}).status_code
+                for n in range(4)]
+    assert statuses == [200, 200, 429, 429]
+
+
+@pytest.mark.parametrize('timeout', [float('nan'), float('inf'), -1.0])
+def test_unusable_timeouts_fall_back_to_the_queue_timeout(timeout):
+    controller = AdmissionController(max_concurrent=1, queue_timeout=0.2, enabled=True)
+    held = controller.acquire('203.0.113.7')
+    started = time.monotonic()
+    with pytest.raises(admission.Rejected) as rejected:
+        controller.acquire('203.0.113.8', timeout)
+    assert rejected.value.reason == 'deadline'
+    assert 0.15 <= time.monotonic() - started < 2
+    controller.release(held)
+
+
+def test_nan_request_timeout_header_is_ignored(app):
+    controller = AdmissionController(max_concurrent=1, queue_timeout=0.2, enabled=True)
+    admission.install(app, controller, endpoints={'chat'})
+
+    @app.route('/chat', methods=['POST'])
+    def chat():
+        return {'success': True}
+
+    held = controller.acquire('198.51.100.1')
+    started = time.monotonic()
+    response = app.test_client().post('/chat', headers={'X-Request-Timeout': 'nan'})
+    assert response.status_code == 429
+    assert time.monotonic() - started < 2
+    controller.release(held)
@@ -0,0 +1,53 @@
+from datetime import timedelta
+
+import gemini_context_cache
+from gemini_context_cache import ContextCache
+
+
+class FakeCachedContent:
+    """Takes ttl the way the SDK does: timedelta only"""
+
+    def __init__(self, ttl):
+        self.updates = []
+        self._check(ttl)
+
+    def _check(self, ttl):
+        if not isinstance(ttl, timedelta):
+            raise TypeError(f"Could not convert input to `ttl`: {type(ttl)}")
+
+    def update(self, ttl):
+        self._check(ttl)
+        self.updates.append(ttl)
+
+
+def make_cache(ttl=100.0):
+    created = []
+
+    def create(model_name, system_instruction, ttl):
+        created.append(FakeCachedContent(timedelta(seconds=ttl)))
+        return created[-1]
+
+    cache = ContextCache('gemini-test-001', 'coach prompt', {}, ttl=ttl, retry=10.0, enabled=True,
+                         create=create, bind=lambda cached, config: ('model', cached))
+    return cache, created
+
+
+def test_renewal_passes_ttl_as_timedelta(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(gemini_context_cache.time, 'monotonic', lambda: now[0])
+    cache, created = make_cache(ttl=100.0)
+
+    model = cache.model()
+    assert model == ('model', created[0])
+
+    now[0] += 90.0
+    assert cache.model() == model
+    assert cache.failures == 0
+    assert cache.renewals == 1
+    assert created[0].updates == [timedelta(seconds=100)]
+    assert len(created) == 1
+
+
+def test_disabled_cache_returns_no_model():
+    cache = ContextCache('gemini-test-001', 'coach prompt', {}, enabled=False)
+    assert cache.model() is None
@@ -0,0 +1,21 @@
+import io
+
+import pytest
+
+import gemini_ai_server
+
+
+@pytest.fixture
+def client():
+    return gemini_ai_server.app.test_client()
+
+
+@pytest.mark.parametrize('history', ['invalid', '{"role": "user"}', '[{"role": "user"'])
+def test_malformed_conversation_history_is_a_bad_request(client, history):
+    response = client.post('/api/chatbot/image', data={
+        'message': 'what is this meal?',
+        'conversationHistory': history,
+        'image': (io.BytesIO(b'not inspected'), 'meal.jpg', 'image/jpeg'),
+    })
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'conversationHistory must be a JSON array'
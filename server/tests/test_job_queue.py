@@ -0,0 +1,55 @@
+import threading
+import time
+
+import pytest
+from flask import Flask
+
+import job_queue
+from job_queue import JobQueue, MemoryJobStore
+
+
+@pytest.fixture
+def release():
+    event = threading.Event()
+    yield event
+    event.set()
+
+
+@pytest.fixture
+def client(release):
+    app = Flask(__name__)
+
+    def run(payload):
+        release.wait(5)
+        return {'message': payload['message']}
+
+    job_queue.install(app, JobQueue(run, workers=1, store=MemoryJobStore()))
+    return app.test_client()
+
+
+def submit(client):
+    response = client.post('/api/chatbot/jobs', json={'message': 'plan my week'})
+    assert response.status_code == 202
+    return response.get_json()['data']['jobId']
+
+
+@pytest.mark.parametrize('wait', ['nan', 'inf', '-5'])
+def test_unusable_wait_values_answer_at_once(client, wait):
+    job_id = submit(client)
+    started = time.monotonic()
+    response = client.get(f'/api/chatbot/jobs/{job_id}?wait={wait}')
+    assert time.monotonic() - started < 1
+    assert response.get_json()['data']['status'] in ('queued', 'running')
+
+
+def test_long_poll_returns_when_the_job_finishes(client, release):
+    job_id = submit(client)
+    threading.Timer(0.2, release.set).start()
+    response = client.get(f'/api/chatbot/jobs/{job_id}?wait=5')
+    data = response.get_json()['data']
+    assert data['status'] == 'done'
+    assert data['result'] == {'message': 'plan my week'}
+
+
+def test_unknown_job_is_not_found(client):
+    assert client.get('/api/chatbot/jobs/missing').status_code == 404
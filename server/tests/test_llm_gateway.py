@@ -0,0 +1,26 @@
+import pytest
+
+from llm_gateway import Gateway, Hedger, Provider
+
+
+class Down(Provider):
+    name = 'down'
+
+    def complete(self, message, history, image=None):
+        raise RuntimeError('provider down')
+
+
+class Up(Provider):
+    name = 'up'
+
+    def complete(self, message, history, image=None):
+        return f"re: {message}"
+
+
+@pytest.mark.parametrize('providers', [(Down(), Up()), (Up(), Down())])
+def test_hedger_counts_requests_not_failover_attempts(providers):
+    # A high threshold keeps the failing provider in the route so every call fails over
+    gateway = Gateway(providers, strategy='fallback', failure_threshold=100, hedger=Hedger(min_ms=1000))
+    for n in range(5):
+        assert gateway.complete(f"hi {n}", []) == (f"re: hi {n}", 'up')
+    assert gateway.hedger.stats()['requests'] == 5
@@ -0,0 +1,50 @@
+import json
+
+import pytest
+
+import meal_catalog
+from meal_catalog import Catalog, write_catalog
+
+
+@pytest.fixture
+def document():
+    with open(meal_catalog.MEALS_DATA_PATH, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_round_trips_the_real_catalog(document, tmp_path):
+    path = write_catalog(document, str(tmp_path / 'meals.mealbin'))
+    with Catalog(path) as catalog:
+        assert len(catalog) == len(document['meals'])
+        assert catalog.to_json() == document
+        kcal = catalog.column('calories.kcal')
+        assert [kcal[i] for i in range(3)] == [int(meal['calories']) for meal in document['meals'][:3]]
+
+
+def test_names_up_to_the_limit_round_trip(document, tmp_path):
+    # 24 characters + '.offsets' is exactly 32 bytes
+    field = 'x' * 24
+    document['meals'][0][field] = ['a', 'b']
+    path = write_catalog(document, str(tmp_path / 'meals.mealbin'))
+    with Catalog(path) as catalog:
+        assert catalog.meal(0)[field] == ['a', 'b']
+
+
+@pytest.mark.parametrize('change', [
+    lambda document: document['meals'][0].update({'x' * 25: ['a']}),
+    lambda document: document['meals'][0].update({'y' * 41: 'text'}),
+    lambda document: document.update({'z' * 30: ['a']}),
+])
+def test_names_over_the_limit_are_rejected(document, tmp_path, change):
+    change(document)
+    path = tmp_path / 'meals.mealbin'
+    with pytest.raises(ValueError, match='longer than 32 bytes'):
+        write_catalog(document, str(path))
+    assert not path.exists()
+
+
+def test_rejects_files_that_are_not_catalogs(tmp_path):
+    path = tmp_path / 'meals.mealbin'
+    path.write_bytes(b'{"meals": []}')
+    with pytest.raises(meal_catalog.CatalogFormatError):
+        Catalog(str(path))
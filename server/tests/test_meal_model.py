@@ -0,0 +1,61 @@
+import json
+
+import pytest
+
+import meal_model
+from meal_model import Meal, MealFormatError
+
+
+def make_entry(**changes):
+    entry = {
+        'id': 1,
+        'name': 'Masala Oats',
+        'ingredients': ['oats', 'onion', 'tomato'],
+        'tags': ['breakfast', 'vegetarian'],
+        'prepTime': '10 min',
+        'weatherCategories': ['cold', 'rainy'],
+        'image': '🥣',
+        'description': 'Savory oats with vegetables',
+        'type': 'veg',
+        'protein': '8g',
+        'calories': '280',
+    }
+    entry.update(changes)
+    return entry
+
+
+def test_parses_nutrition_fields():
+    meal = Meal.from_json(make_entry())
+    assert (meal.prep_minutes, meal.protein_g, meal.calories_kcal) == (10, 8, 280)
+    assert meal.diet == 'veg'
+
+
+@pytest.mark.parametrize('key, value', [
+    ('prepTime', '1 hr'),
+    ('prepTime', '10min'),
+    ('protein', '2.5 g'),
+    ('protein', '12 g'),
+    ('calories', '350 kcal'),
+    ('calories', 350),
+    ('protein', 'lots'),
+])
+def test_rejects_other_number_spellings(key, value):
+    with pytest.raises(MealFormatError, match=key):
+        Meal.from_json(make_entry(**{key: value}))
+
+
+def test_to_json_gives_back_the_entry():
+    entry = make_entry(imageUrl='https://example.com/oats.jpg', source='family recipe')
+    entry = {'name': entry.pop('name'), **entry}
+    assert json.dumps(Meal.from_json(entry).to_json()) == json.dumps(entry)
+
+
+def test_rejects_duplicate_ids():
+    with pytest.raises(MealFormatError, match='duplicate'):
+        meal_model.from_document({'meals': [make_entry(), make_entry(name='Other')]})
+
+
+def test_real_catalog_round_trips():
+    with open(meal_model.MEALS_DATA_PATH, encoding='utf-8') as f:
+        data = json.load(f)
+    assert [meal.to_json() for meal in meal_model.from_document(data)] == data['meals']
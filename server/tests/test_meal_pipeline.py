@@ -0,0 +1,51 @@
+import json
+import shutil
+
+import pytest
+
+import meal_pipeline
+
+
+@pytest.fixture
+def sources(tmp_path):
+    root = tmp_path / 'meals'
+    shutil.copytree(meal_pipeline.MEALS_SOURCES_DIR, root)
+    return root
+
+
+def build(sources, tmp_path, **kwargs):
+    return meal_pipeline.build(str(sources), str(tmp_path / 'mealsData.json'), str(tmp_path / 'build'), **kwargs)
+
+
+def test_builds_the_checked_in_catalog(sources, tmp_path):
+    summary = build(sources, tmp_path)
+    assert summary['written'] and summary['meals'] == 220
+    with open(meal_pipeline.MEALS_DATA_PATH, 'rb') as expected:
+        assert (tmp_path / 'mealsData.json').read_bytes() == expected.read()
+
+
+def test_rebuild_without_changes_is_a_no_op(sources, tmp_path):
+    build(sources, tmp_path)
+    summary = build(sources, tmp_path)
+    assert not summary['written'] and not summary['processed']
+
+
+def test_only_the_edited_shard_is_processed(sources, tmp_path):
+    build(sources, tmp_path)
+    path = sources / 'baby' / 'baby-meals.json'
+    data = json.loads(path.read_text(encoding='utf-8'))
+    data['meals'][0]['description'] = 'Edited'
+    path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding='utf-8')
+
+    summary = build(sources, tmp_path)
+    assert summary['processed'] == ['baby/baby-meals.json']
+    assert summary['reused'] == ['base/meals.json']
+    built = json.loads((tmp_path / 'mealsData.json').read_text(encoding='utf-8'))
+    assert built['meals'][200]['description'] == 'Edited'
+
+
+def test_duplicate_ids_across_shards_fail(sources, tmp_path):
+    shutil.copy(sources / 'baby' / 'baby-meals.json', sources / 'base' / 'copy.json')
+    with pytest.raises(meal_pipeline.BuildError, match='duplicate id'):
+        build(sources, tmp_path)
+    assert not (tmp_path / 'mealsData.json').exists()
@@ -0,0 +1,157 @@
+import pytest
+
+import response_cache
+from response_cache import MemoryBackend, RedisBackend, ResponseCache, make_key
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeRedis:
+    """dict-backed stand-in for redis-py: bytes values, `ex` expiry, and switchable failures"""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.data = {}
+        self.down = False
+
+    def _check(self):
+        if self.down:
+            raise ConnectionError('redis unavailable')
+
+    def get(self, key):
+        self._check()
+        entry = self.data.get(key)
+        if entry is None or entry[1] <= self.clock():
+            self.data.pop(key, None)
+            return None
+        return entry[0]
+
+    def set(self, key, value, ex=None):
+        self._check()
+        self.data[key] = (value.encode('utf-8'), self.clock() + ex if ex else float('inf'))
+        return True
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(response_cache.time, 'monotonic', clock)
+    return clock
+
+
+@pytest.fixture
+def redis(clock):
+    return FakeRedis(clock)
+
+
+def make_cache(redis=None, ttl=60, **local):
+    return ResponseCache(local=MemoryBackend(**local), shared=RedisBackend(redis) if redis else None,
+                         ttl=ttl, enabled=True)
+
+
+def test_key_ignores_case_whitespace_and_trailing_punctuation():
+    key = make_key('gpt-4o-mini', {'temperature': 0.8}, 'Vegan meal ideas?', [])
+    assert make_key('gpt-4o-mini', {'temperature': 0.8}, '  vegan   MEAL ideas ', None) == key
+    assert make_key('gpt-4o-mini', {'temperature': 0.2}, 'Vegan meal ideas?', []) != key
+    assert make_key('gpt-4o-mini', {'temperature': 0.8}, 'Vegan meal ideas?',
+                    [{'role': 'user', 'content': 'hi'}]) != key
+
+
+def test_hit_and_miss(clock):
+    cache = make_cache()
+    assert cache.get('coach:a') is None
+    cache.set('coach:a', 'answer')
+    assert cache.get('coach:a') == 'answer'
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['entries']) == (1, 1, 1)
+
+
+def test_empty_answers_and_disabled_cache_store_nothing(clock):
+    cache = make_cache()
+    cache.set('coach:a', '')
+    assert cache.get('coach:a') is None
+    disabled = ResponseCache(local=MemoryBackend(), enabled=False)
+    disabled.set('coach:a', 'answer')
+    assert disabled.get('coach:a') is None
+    assert len(disabled.local) == 0
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = make_cache(ttl=60)
+    cache.set('coach:a', 'answer')
+    clock.now += 59
+    assert cache.get('coach:a') == 'answer'
+    clock.now += 1
+    assert cache.get('coach:a') is None
+    assert len(cache.local) == 0
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    local = MemoryBackend(max_entries=2)
+    local.set('a', 'A', 60)
+    local.set('b', 'B', 60)
+    assert local.get('a') == 'A'
+    local.set('c', 'C', 60)
+    assert local.get('b') is None
+    assert (local.get('a'), local.get('c')) == ('A', 'C')
+    assert local.stats()['evictions'] == 1
+
+
+def test_byte_limit(clock):
+    local = MemoryBackend(max_bytes=10)
+    local.set('a', 'x' * 11, 60)
+    assert local.get('a') is None
+    local.set('b', 'é' * 3, 60)  # 6 bytes in UTF-8
+    local.set('c', 'y' * 4, 60)
+    assert local.stats()['bytes'] == 10
+    local.set('d', 'z', 60)
+    assert local.get('b') is None
+    assert local.stats() == {'entries': 2, 'bytes': 5, 'evictions': 1}
+
+
+def test_overwrite_replaces_size(clock):
+    local = MemoryBackend()
+    local.set('a', 'long answer', 60)
+    local.set('a', 'short', 60)
+    assert local.get('a') == 'short'
+    assert local.stats()['bytes'] == 5
+
+
+def test_shared_tier_serves_other_workers(clock, redis):
+    first, second = make_cache(redis), make_cache(redis)
+    first.set('coach:a', 'answer')
+    assert redis.get('coach:a') == b'answer'
+
+    assert second.get('coach:a') == 'answer'
+    # Promoted into the second worker's local tier
+    assert second.local.get('coach:a') == 'answer'
+    stats = second.stats()
+    assert (stats['hits'], stats['sharedHits'], stats['backend']) == (1, 1, 'memory+shared')
+
+    redis.data.clear()
+    assert second.get('coach:a') == 'answer'
+    assert second.stats()['sharedHits'] == 1
+
+
+def test_shared_entries_expire_with_the_cache_ttl(clock, redis):
+    make_cache(redis, ttl=30).set('coach:a', 'answer')
+    clock.now += 29
+    assert make_cache(redis).get('coach:a') == 'answer'
+    clock.now += 1
+    assert make_cache(redis).get('coach:a') is None
+
+
+def test_shared_errors_fall_back_to_local(clock, redis):
+    cache = make_cache(redis)
+    redis.down = True
+    cache.set('coach:a', 'answer')
+    assert cache.get('coach:a') == 'answer'
+    assert cache.get('coach:b') is None
+    stats = cache.stats()
+    assert (stats['sharedErrors'], stats['misses'], stats['hits']) == (2, 1, 1)
@@ -0,0 +1,48 @@
+import pytest
+
+from semantic_cache import SemanticCache
+
+
+@pytest.fixture
+def cache():
+    return SemanticCache(enabled=True)
+
+
+@pytest.mark.parametrize('stored, asked', [
+    ("create a 4 day workout plan", "create a 5 day workout plan"),
+    ("meal plan for 1500 calories", "meal plan for 3000 calories"),
+    ("I am on keto", "I am not on keto"),
+    ("vegan meals with tofu", "vegan meals without tofu"),
+    ("I don't eat eggs, what should I eat?", "I eat eggs, what should I eat?"),
+])
+def test_numbers_and_negations_must_match(cache, stored, asked):
+    cache.add(stored, 'stored answer')
+    assert cache.get(asked) is None
+    assert cache.get(stored) == 'stored answer'
+
+
+@pytest.mark.parametrize('stored, asked', [
+    ("create a 4 day workout plan", "4 day workout plan please"),
+    ("how do I lose belly fat", "lose belly fat tips"),
+    ("best protein sources for vegetarians", "best vegetarian protein sources"),
+])
+def test_paraphrases_hit(cache, stored, asked):
+    cache.add(stored, 'stored answer')
+    assert cache.get(asked) == 'stored answer'
+
+
+def test_disabled_cache_stores_nothing():
+    cache = SemanticCache(enabled=False)
+    cache.add("how do I lose belly fat", 'stored answer')
+    assert len(cache) == 0
+    assert cache.get("how do I lose belly fat") is None
+
+
+def test_oldest_entries_are_overwritten():
+    cache = SemanticCache(max_entries=2, enabled=True)
+    cache.add("how do I lose belly fat", 'fat')
+    cache.add("how to build muscle fast", 'muscle')
+    cache.add("how much water should I drink", 'water')
+    assert len(cache) == 2
+    assert cache.get("how do I lose belly fat") is None
+    assert cache.get("how much water should I drink") == 'water'
@@ -0,0 +1,38 @@
+import sys
+
+import pytest
+
+import serve
+
+
+@pytest.fixture
+def fresh_backend(monkeypatch, tmp_path):
+    """python_ai_server imported anew by create_app, with no JOB_STORE_PATH configured"""
+    # Empty counts as unset, and monkeypatch puts the old value back afterwards
+    monkeypatch.setenv('JOB_STORE_PATH', '')
+    monkeypatch.setattr(serve, 'DEFAULT_JOB_STORE_PATH', str(tmp_path / 'jobs.sqlite3'))
+    for name in ('python_ai_server', 'job_queue'):
+        monkeypatch.delitem(sys.modules, name, raising=False)
+
+
+def test_several_workers_share_a_sqlite_job_store(fresh_backend, tmp_path):
+    app = serve.create_app('openai', workers=4)
+    store = app.extensions['job_queue'].store
+    assert type(store).__name__ == 'SQLiteJobStore'
+    assert store.path == str(tmp_path / 'jobs.sqlite3')
+
+
+def test_unknown_worker_count_shares_the_job_store(fresh_backend):
+    app = serve.create_app('openai')
+    assert type(app.extensions['job_queue'].store).__name__ == 'SQLiteJobStore'
+
+
+def test_single_worker_keeps_jobs_in_memory(fresh_backend):
+    app = serve.create_app('openai', workers=1)
+    assert type(app.extensions['job_queue'].store).__name__ == 'MemoryJobStore'
+
+
+def test_refuses_an_in_memory_store_for_several_workers(fresh_backend):
+    serve.create_app('openai', workers=1)
+    with pytest.raises(RuntimeError, match='JOB_STORE_PATH'):
+        serve.create_app('openai', workers=4)
@@ -0,0 +1,120 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+import upstream_pool
+from upstream_pool import UpstreamPool
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    monkeypatch.setattr(upstream_pool.time, 'sleep', lambda seconds: None)
+
+
+def scripted(pool, outcomes):
+    """Make the pool's session answer with `outcomes` in turn (exceptions are raised)"""
+    calls = []
+
+    def post(url, **kwargs):
+        calls.append(url)
+        outcome = outcomes[len(calls) - 1]
+        if isinstance(outcome, Exception):
+            raise outcome
+        response = requests.Response()
+        response.status_code = outcome
+        response._content = b'{}'
+        return response
+
+    pool.session.post = post
+    return calls
+
+
+def test_read_timeout_is_not_retried():
+    pool = UpstreamPool('test', max_retries=3)
+    calls = scripted(pool, [requests.ReadTimeout('read timed out')])
+    with pytest.raises(requests.ReadTimeout):
+        pool.post('http://upstream/v1/chat/completions')
+    assert len(calls) == 1
+    assert pool.stats()['failures'] == 1
+
+
+def test_connection_failures_are_retried():
+    pool = UpstreamPool('test', max_retries=3)
+    calls = scripted(pool, [requests.ConnectTimeout('connect timed out'),
+                            requests.ConnectionError('connection refused'), 200])
+    assert pool.post('http://upstream/v1/chat/completions').status_code == 200
+    assert len(calls) == 3
+    assert pool.stats()['retriesByReason'] == {'ConnectTimeout': 1, 'ConnectionError': 1}
+
+
+def test_retry_statuses_give_up_after_max_retries():
+    pool = UpstreamPool('test', max_retries=2)
+    calls = scripted(pool, [503, 503, 503])
+    assert pool.post('http://upstream/v1/chat/completions').status_code == 503
+    assert len(calls) == 3
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    statuses = []
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        status = self.statuses.pop(0) if self.statuses else 200
+        body = b'{"error": "overloaded"}' if status != 200 else b'{"ok": true}'
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_connection_is_reused_after_a_retried_status():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        Handler.statuses = [503, 429]
+        url = f"http://127.0.0.1:{server.server_address[1]}/v1/chat/completions"
+        pool = UpstreamPool('test', max_retries=3)
+        for _ in range(2):
+            response = pool.post(url, data=b'{}', stream=True)
+            assert response.status_code == 200
+            response.content
+        stats = pool.stats()
+        assert stats['requests'] == 4
+        assert stats['connectionsOpened'] == 1
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_every_in_flight_request_gets_a_socket_without_waiting():
+    class Slow(Handler):
+        def do_POST(self):
+            # Not time.sleep: no_sleep stubs it out
+            threading.Event().wait(0.3)
+            super().do_POST()
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Slow)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/v1/chat/completions"
+        pool = UpstreamPool('test', max_in_flight=8)
+        started = time.monotonic()
+        threads = [threading.Thread(target=lambda: pool.post(url, data=b'{}')) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # All eight run at once: none queues behind the pool for a socket
+        assert time.monotonic() - started < 0.3 * 2
+        assert pool.stats()['connectionsOpened'] == 8
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Fit Fusion AI Coach - Upstream HTTP pool
+Shared keep-alive sessions per upstream with retry/backoff and an in-flight cap
+"""
+
+import email.utils
+import os
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+UPSTREAM_MAX_IN_FLIGHT = int(os.getenv('UPSTREAM_MAX_IN_FLIGHT', 64))
+UPSTREAM_MAX_RETRIES = int(os.getenv('UPSTREAM_MAX_RETRIES', 3))
+UPSTREAM_BACKOFF_BASE = float(os.getenv('UPSTREAM_BACKOFF_BASE', 0.5))
+UPSTREAM_BACKOFF_CAP = float(os.getenv('UPSTREAM_BACKOFF_CAP', 8))
+UPSTREAM_QUEUE_TIMEOUT = float(os.getenv('UPSTREAM_QUEUE_TIMEOUT', 10))
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class UpstreamBusy(Exception):
+    """Raised when the in-flight cap stays full for longer than the queue timeout"""
+
+
+def parse_retry_after(value):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+class UpstreamPool:
+    """Keep-alive session for one upstream host"""
+
+    def __init__(self, name, max_in_flight=UPSTREAM_MAX_IN_FLIGHT,
+                 max_retries=UPSTREAM_MAX_RETRIES, backoff_base=UPSTREAM_BACKOFF_BASE,
+                 backoff_cap=UPSTREAM_BACKOFF_CAP, queue_timeout=UPSTREAM_QUEUE_TIMEOUT):
+        self.name = name
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.queue_timeout = queue_timeout
+
+        self.session = requests.Session()
+        # One socket per in-flight slot: pool_block keeps us from opening throwaway ones, and since
+        # the pool is never short of sockets the semaphore below is the only place requests wait
+        # (urllib3's own wait for a pooled socket has no timeout)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_in_flight, pool_block=True)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self._adapter = adapter
+
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._max_in_flight = max_in_flight
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._requests = 0
+        self._retries = 0
+        self._retry_statuses = {}
+        self._rejected = 0
+        self._failures = 0
+
+    def backoff(self, attempt, retry_after=None):
+        """Full-jitter exponential backoff, never shorter than Retry-After"""
+        delay = random.uniform(0, min(self.backoff_cap, self.backoff_base * (2 ** attempt)))
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.backoff_cap * 4))
+        return delay
+
+    def _record_retry(self, reason):
+        with self._lock:
+            self._retries += 1
+            self._retry_statuses[reason] = self._retry_statuses.get(reason, 0) + 1
+
+    def post(self, url, **kwargs):
+        """
+        POST with retries on 429/5xx and on failures to connect. A read timeout is not retried:
+        the request may already be running upstream, and sending it again would pay for it twice.
+        """
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            with self._lock:
+                self._rejected += 1
+            raise UpstreamBusy(f"Too many in-flight requests to {self.name}")
+
+        with self._lock:
+            self._in_flight += 1
+        try:
+            attempt = 0
+            while True:
+                with self._lock:
+                    self._requests += 1
+                try:
+                    response = self.session.post(url, **kwargs)
+                except requests.RequestException as e:
+                    # ConnectionError includes ConnectTimeout, but not ReadTimeout
+                    if not isinstance(e, requests.ConnectionError) or attempt >= self.max_retries:
+                        with self._lock:
+                            self._failures += 1
+                        raise
+                    self._record_retry(type(e).__name__)
+                    time.sleep(self.backoff(attempt))
+                    attempt += 1
+                    continue
+
+                if response.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                    if response.status_code >= 400:
+                        with self._lock:
+                            self._failures += 1
+                    return response
+
+                self._record_retry(str(response.status_code))
+                delay = self.backoff(attempt, parse_retry_after(response.headers.get('Retry-After')))
+                # Read the body to the end so the connection goes back to the pool
+                response.content
+                time.sleep(delay)
+                attempt += 1
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+            self._slots.release()
+
+    def stats(self):
+        """Pool reuse and retry counters"""
+        connections = 0
+        pool_requests = 0
+        pools = self._adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools[key]
+            connections += pool.num_connections
+            pool_requests += pool.num_requests
+
+        with self._lock:
+            return {
+                'requests': self._requests,
+                'inFlight': self._in_flight,
+                'maxInFlight': self._max_in_flight,
+                'connectionsOpened': connections,
+                'poolHitRate': round(1 - connections / pool_requests, 4) if pool_requests else 0.0,
+                'retries': self._retries,
+                'retriesByReason': dict(self._retry_statuses),
+                'rejected': self._rejected,
+                'failures': self._failures
+            }
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(url):
+    """Shared pool for the upstream that serves `url`"""
+    parts = urlsplit(url)
+    name = f"{parts.scheme}://{parts.netloc}"
+    with _pools_lock:
+        pool = _pools.get(name)
+        if pool is None:
+            pool = _pools[name] = UpstreamPool(name)
+        return pool
+
+
+def all_stats():
+    """Stats for every upstream pool created so far"""
+    with _pools_lock:
+        pools = list(_pools.values())
+    return {pool.name: pool.stats() for pool in pools}